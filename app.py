@@ -6,6 +6,7 @@
 import sqlite3
 import json
 from collections import Counter
+from dataclasses import fields
 
 import pandas as pd
 import numpy as np
@@ -14,6 +15,21 @@ import plotly.express as px
 import plotly.graph_objects as go
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
+import yaml
+
+from work_show import Item
+from work_show.data_clean.city_normalizer import city_normalizer
+from work_show.storage.factory import build_storage
+from work_show.storage.stats import STATS_DIMENSIONS, STATS_MEASURES
+
+CONFIG_PATH = "config/settings.yaml"
+
+try:
+    import duckdb
+
+    QUERY_ERRORS = (sqlite3.DatabaseError, duckdb.Error)
+except ImportError:  # 只有 duckdb 后端需要
+    QUERY_ERRORS = (sqlite3.DatabaseError,)
 
 # ============================================================
 # 页面配置
@@ -29,89 +45,37 @@ st.title("📊 职位数据分析仪表板")
 st.markdown("---")
 
 # ============================================================
-# 中国主要城市经纬度映射（用于地图可视化）
+# 数据加载与预处理（带缓存）
 # ============================================================
-CITY_COORDINATES = {
-    "北京": (39.9042, 116.4074),
-    "上海": (31.2304, 121.4737),
-    "广州": (23.1291, 113.2644),
-    "深圳": (22.5431, 114.0579),
-    "成都": (30.5728, 104.0668),
-    "武汉": (30.5928, 114.3055),
-    "西安": (34.3416, 108.9398),
-    "杭州": (30.2741, 120.1551),
-    "重庆": (29.5630, 106.5516),
-    "南京": (32.0603, 118.7969),
-    "天津": (39.3434, 117.3616),
-    "苏州": (31.2990, 120.5853),
-    "郑州": (34.7466, 113.6254),
-    "长沙": (28.2282, 112.9388),
-    "东莞": (23.0430, 113.7633),
-    "沈阳": (41.8057, 123.4315),
-    "青岛": (36.0671, 120.3826),
-    "合肥": (31.8206, 117.2272),
-    "佛山": (23.0218, 113.1219),
-    "宁波": (29.8683, 121.5440),
-    "昆明": (25.0389, 102.7183),
-    "大连": (38.9140, 121.6147),
-    "福州": (26.0745, 119.2965),
-    "厦门": (24.4798, 118.0894),
-    "哈尔滨": (45.8038, 126.5350),
-    "济南": (36.6512, 117.1201),
-    "温州": (28.0006, 120.6721),
-    "南宁": (22.8170, 108.3665),
-    "长春": (43.8171, 125.3235),
-    "泉州": (24.8741, 118.6757),
-    "石家庄": (38.0428, 114.5149),
-    "贵阳": (26.6470, 106.6302),
-    "南昌": (28.6820, 115.8579),
-    "金华": (29.0792, 119.6474),
-    "常州": (31.8106, 119.9740),
-    "惠州": (23.1116, 114.4158),
-    "嘉兴": (30.7522, 120.7550),
-    "太原": (37.8706, 112.5489),
-    "徐州": (34.2044, 117.2860),
-    "南通": (31.9807, 120.8940),
-    "珠海": (22.2710, 113.5767),
-    "中山": (22.5176, 113.3926),
-    "保定": (38.8739, 115.4646),
-    "兰州": (36.0611, 103.8343),
-    "台州": (28.6563, 121.4205),
-    "绍兴": (30.0306, 120.5800),
-    "烟台": (37.4638, 121.4479),
-    "廊坊": (39.5186, 116.6831),
-    "洛阳": (34.6197, 112.4540),
-    "乌鲁木齐": (43.8256, 87.6168),
-    "无锡": (31.4912, 120.3119),
-    "海口": (20.0440, 110.1999),
-    "三亚": (18.2528, 109.5119),
-    "拉萨": (29.6500, 91.1000),
-    "银川": (38.4872, 106.2309),
-    "西宁": (36.6171, 101.7782),
-    "呼和浩特": (40.8424, 111.7490),
-    "香港": (22.3193, 114.1694),
-    "澳门": (22.1987, 113.5439),
-    "台北": (25.0330, 121.5654),
-}
+def query_storage(sql: str) -> list[tuple]:
+    """
+    在 settings.yaml 配置的存储上执行只读查询，sql 中使用 {table} 作为职位表名。
+    各后端都通过 query_rows 查询，分片存储会联合所有分片；表不存在时抛出 QUERY_ERRORS 中的异常。
+    """
+    with open(CONFIG_PATH, encoding="utf-8") as f:
+        db_config = yaml.safe_load(f)["database"]
+    storage = build_storage(db_config)
+    try:
+        return storage.query_rows(sql.format(table=db_config["table_name"]))
+    finally:
+        storage.close()
 
 
-# ============================================================
-# 数据加载与预处理（带缓存）
-# ============================================================
 @st.cache_data
 def load_data():
     """
     从 SQLite 数据库加载数据并进行预处理
     使用 @st.cache_data 缓存，避免重复查询数据库
     """
-    # 连接数据库
-    conn = sqlite3.connect("job_info.sqlite")
-    df = pd.read_sql_query("SELECT * FROM jobs", conn)
-    conn.close()
+    columns = [f.name for f in fields(Item)]
+    rows = query_storage(f"SELECT {', '.join(columns)} FROM {{table}}")
+    df = pd.DataFrame(rows, columns=columns)
 
     # JSON 解析辅助函数
     def parse_json_list(value):
-        """安全解析 JSON 数组字符串"""
+        """安全解析 JSON 数组字符串，DuckDB 的 LIST 列已经是列表"""
+        if isinstance(value, list):
+            return value
         if pd.isna(value) or value == "" or value is None:
             return []
         try:
@@ -122,15 +86,9 @@ def load_data():
         except (json.JSONDecodeError, TypeError):
             return []
 
-    def clean_city_name(city):
-        """清理城市名称，去除'市'、'省'后缀"""
-        if isinstance(city, str):
-            return city.replace("市", "").replace("省", "")
-        return city
-
     # 解析 JSON 字段
-    df["city"] = df["city"].apply(parse_json_list)
-    df["city"] = df["city"].apply(lambda cities: [clean_city_name(c) for c in cities])
+    # 入库时已经标准化过城市，这里只处理旧数据，相同的写法只解析一次
+    df["city"] = df["city"].apply(parse_json_list).apply(city_normalizer.normalize)
     df["description_keywords"] = df["description_keywords"].apply(parse_json_list)
     df["requirement_keywords"] = df["requirement_keywords"].apply(parse_json_list)
 
@@ -149,8 +107,32 @@ def load_data():
     return df
 
 
+@st.cache_data
+def load_stats():
+    """
+    读取存储层维护的预聚合统计表 job_stats，表不存在或为空时返回 None。
+    job_count 按职位计数（只计在第一个城市上），city_count 在每个城市各计一次。
+    """
+    columns = list(STATS_DIMENSIONS + STATS_MEASURES)
+    try:
+        rows = query_storage(f"SELECT {', '.join(columns)} FROM job_stats")
+    except QUERY_ERRORS:
+        return None
+    stats = pd.DataFrame(rows, columns=columns)
+    if stats.empty:
+        return None
+    stats["city"] = stats["city"].map(
+        {
+            city: (city_normalizer.normalize(city) or [city])[0] if city else city
+            for city in stats["city"].unique()
+        }
+    )
+    return stats
+
+
 # 加载数据
 df = load_data()
+stats = load_stats()
 
 # ============================================================
 # 侧边栏筛选器
@@ -264,6 +246,36 @@ filtered_df = filter_data(
     date_range,
 )
 
+# 城市和具体日期无法从按周、按首个城市汇总的统计表中精确筛选，只在未使用这两个筛选条件时读统计表
+full_date_range = date_range is None or (
+    len(date_range) == 2 and tuple(date_range) == (min_date.date(), max_date.date())
+)
+if stats is not None and not selected_cities and full_date_range:
+    filtered_stats = stats
+    for column, selected in [
+        ("source_platform", selected_platforms),
+        ("work_type", selected_work_types),
+        ("category", selected_categories),
+        ("education_req", selected_education),
+        ("experience_req", selected_experience),
+    ]:
+        if selected:
+            filtered_stats = filtered_stats[filtered_stats[column].isin(selected)]
+else:
+    filtered_stats = None
+
+
+def count_by(column, measure="job_count"):
+    """从统计表按某个维度汇总，返回按数量降序的 [column, count]，忽略空值"""
+    counts = (
+        filtered_stats[filtered_stats[column] != ""]
+        .groupby(column)[measure]
+        .sum()
+        .reset_index(name="count")
+    )
+    return counts[counts["count"] > 0].sort_values("count", ascending=False)
+
+
 # 薪资分析数据（剔除空值）
 salary_df = filtered_df.dropna(subset=["salary_min", "salary_max"])
 
@@ -275,7 +287,12 @@ st.subheader("📈 关键指标")
 col1, col2, col3, col4, col5 = st.columns(5)
 
 with col1:
-    st.metric("职位总数", f"{len(filtered_df):,}")
+    total_jobs = (
+        int(filtered_stats["job_count"].sum())
+        if filtered_stats is not None
+        else len(filtered_df)
+    )
+    st.metric("职位总数", f"{total_jobs:,}")
 
 with col2:
     avg_salary = salary_df["salary_avg"].mean() if len(salary_df) > 0 else 0
@@ -315,10 +332,13 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
 with tab1:
     st.subheader("🗺️ 职位地理分布 (Top 20 城市)")
 
-    # 炸裂城市字段统计
-    city_exploded = filtered_df.explode("city")
-    city_counts = city_exploded["city"].value_counts().head(20).reset_index()
-    city_counts.columns = ["city", "count"]
+    if filtered_stats is not None:
+        city_counts = count_by("city", "city_count").head(20).reset_index(drop=True)
+    else:
+        # 炸裂城市字段统计
+        city_exploded = filtered_df.explode("city")
+        city_counts = city_exploded["city"].value_counts().head(20).reset_index()
+        city_counts.columns = ["city", "count"]
 
     col1, col2 = st.columns(2)
 
@@ -340,12 +360,11 @@ with tab1:
     with col2:
         # 地图可视化
         # 添加经纬度
-        city_counts["lat"] = city_counts["city"].apply(
-            lambda x: CITY_COORDINATES.get(x, (None, None))[0]
-        )
-        city_counts["lon"] = city_counts["city"].apply(
-            lambda x: CITY_COORDINATES.get(x, (None, None))[1]
+        coordinates = city_counts["city"].apply(
+            lambda x: city_normalizer.coordinates(x) or (None, None)
         )
+        city_counts["lat"] = coordinates.str[0]
+        city_counts["lon"] = coordinates.str[1]
 
         # 过滤掉没有坐标的城市
         city_map_df = city_counts.dropna(subset=["lat", "lon"])
@@ -383,8 +402,11 @@ with tab2:
 
     with col1:
         # 职位分类饼图
-        category_counts = filtered_df["category"].value_counts().reset_index()
-        category_counts.columns = ["category", "count"]
+        if filtered_stats is not None:
+            category_counts = count_by("category")
+        else:
+            category_counts = filtered_df["category"].value_counts().reset_index()
+            category_counts.columns = ["category", "count"]
 
         fig_category = px.pie(
             category_counts.head(10),
@@ -398,7 +420,12 @@ with tab2:
 
     with col2:
         # 平台分布饼图
-        platform_counts = filtered_df["source_platform"].value_counts().reset_index()
+        if filtered_stats is not None:
+            platform_counts = count_by("source_platform")
+        else:
+            platform_counts = (
+                filtered_df["source_platform"].value_counts().reset_index()
+            )
         platform_counts.columns = ["platform", "count"]
 
         fig_platform = px.pie(
@@ -413,8 +440,11 @@ with tab2:
 
     with col3:
         # 工作类型分布饼图
-        work_type_counts = filtered_df["work_type"].value_counts().reset_index()
-        work_type_counts.columns = ["work_type", "count"]
+        if filtered_stats is not None:
+            work_type_counts = count_by("work_type")
+        else:
+            work_type_counts = filtered_df["work_type"].value_counts().reset_index()
+            work_type_counts.columns = ["work_type", "count"]
 
         fig_work_type = px.pie(
             work_type_counts,
@@ -503,6 +533,10 @@ with tab4:
             time_df["date"] = time_df["publish_date"].dt.date
             time_counts = time_df.groupby("date").size().reset_index(name="count")
             time_counts["date"] = pd.to_datetime(time_counts["date"])
+        elif filtered_stats is not None:
+            time_counts = count_by("publish_week").sort_values("publish_week")
+            time_counts.columns = ["date", "count"]
+            time_counts["date"] = pd.to_datetime(time_counts["date"])
         else:
             time_df["week"] = (
                 time_df["publish_date"].dt.to_period("W").apply(lambda x: x.start_time)
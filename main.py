@@ -2,7 +2,10 @@ import yaml
 import importlib
 import threading
 from work_show.engine.crawler import CrawlerEngine
-from work_show.storage.sql_storage import SqliteStorage
+from work_show.deduplicator.registry import DeduplicatorRegistry
+from work_show.storage.factory import build_storage
+from work_show.data_clean.code_dict import code_dicts
+from work_show.utils.call_llm import llm_cache, router
 from work_show.utils.logger import get_logger
 from DrissionPage import WebPage
 
@@ -19,6 +22,7 @@ def main():
     db_config = config["database"]
     crawler_config = config["crawler"]
     sources_config = config.get("sources", [])
+    code_dicts.configure(**config.get("code_dicts", {}))
 
     if not sources_config:
         logger.warning("No sources found in the configuration file. Exiting.")
@@ -26,10 +30,11 @@ def main():
 
     # 2. 创建线程安全的存储实例和线程锁
     db_lock = threading.Lock()
-    storage = SqliteStorage(
-        sqlite_path=db_config["url"],
-        table_name=db_config["table_name"],
-        lock=db_lock,  # 传入锁
+    storage = build_storage(db_config, lock=db_lock)  # 传入锁
+
+    # 已见过的 job_id 按 source_platform 分区共享，每个数据源有自己的连续重复计数
+    dedup_registry = DeduplicatorRegistry(
+        max_consecutive_duplicates=crawler_config.get("max_consecutive_duplicates", 7)
     )
 
     threads = []
@@ -48,7 +53,10 @@ def main():
 
             # 为每个源创建一个独立的引擎
             engine = CrawlerEngine(
-                source=source_instance, storage=storage, config=crawler_config
+                source=source_instance,
+                storage=storage,
+                config=crawler_config,
+                deduplicator=dedup_registry.new_deduplicator(),
             )
 
             # 创建并启动线程
@@ -67,6 +75,14 @@ def main():
         thread.join()
 
     logger.info("All crawling threads have finished.")
+    stats = llm_cache.stats()
+    logger.info(
+        f"LLM cache: {stats.hits} hits, {stats.misses} misses "
+        f"({stats.hit_rate:.1%}), {stats.entries} entries, "
+        f"{stats.size_bytes / 1024 / 1024:.1f} MB, {stats.evictions} evicted"
+    )
+    for name, provider in router.snapshot().items():
+        logger.info(f"LLM provider {name}: {provider}")
 
 
 if __name__ == "__main__":
@@ -17,9 +17,32 @@ CREATE TABLE IF NOT EXISTS jobs (
     requirement TEXT,                 -- 对应 requirement (str)
     requirement_keywords TEXT,        -- 对应 requirement_keywords (list[str]), 存为 JSON 字符串
     publish_date INTEGER,             -- 对应 publish_date (int), 时间戳
-    crawl_date INTEGER               -- 对应 crawl_date (int), 时间戳
+    crawl_date INTEGER,               -- 对应 crawl_date (int), 时间戳
+    extra_info TEXT,                  -- 对应 extra_info (dict), 存为 JSON 字符串
+    description_hash TEXT,            -- 压缩存储模式下 description 在 job_text 中的哈希
+    requirement_hash TEXT,            -- 压缩存储模式下 requirement 在 job_text 中的哈希
+    first_seen INTEGER,               -- 第一次爬到的时间戳
+    last_seen INTEGER,                -- 最后一次在列表中看到的时间戳
+    closed_at INTEGER                 -- 完整遍历列表时没有再看到的时间戳，NULL 表示仍在招聘
 );
 
 -- 可选：创建索引以加快常见查询速度（例如按发布时间或城市查询）
 CREATE INDEX IF NOT EXISTS idx_jobs_publish_date ON jobs (publish_date);
-CREATE INDEX IF NOT EXISTS idx_jobs_city ON jobs (city);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_jobs_city ON jobs (city);
+-- (source_platform, job_id) 唯一，支持 INSERT ... ON CONFLICT DO UPDATE，同时覆盖按平台加载指纹的查询
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_platform_job_id ON jobs (source_platform, job_id);
+-- 只包含在招职位的部分索引
+CREATE INDEX IF NOT EXISTS idx_jobs_open ON jobs (source_platform, job_id) WHERE closed_at IS NULL;
+-- 当前仍在招聘的职位
+CREATE VIEW IF NOT EXISTS open_jobs AS SELECT * FROM jobs WHERE closed_at IS NULL;
+
+-- 城市、关键字的规范化副表 job_city / job_keyword 由 SqliteStorage 在 database.side_tables 开启时创建并维护，
+-- DDL 只在 storage/sql_storage.py 中维护；已有数据可以用 python -m work_show.cli backfill-side-tables 回填
+
+-- 标题、描述、要求的全文索引 jobs_fts 由 SqliteStorage 在 database.full_text 开启时创建，
+-- DDL 见 storage/sql_storage.py 的 _fts_sql；已有数据可以用 python -m work_show.cli rebuild-fts 重建
+
+-- 仪表板使用的预聚合统计表 job_stats 由 SqliteStorage 在 database.stats 开启时创建并在写入的同一事务中维护，
+-- DDL 见 storage/stats.py；已有数据可以用 python -m work_show.cli rebuild-stats 回填
+
+-- jobs 表的变更日志 job_changes 及其触发器由 SqliteStorage 在 database.change_log 开启时创建，DDL 见 storage/change_log.py
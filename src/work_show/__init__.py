@@ -1,3 +1,4 @@
 from .core.models import Item
+from .core.batch import ItemBatch
 
-__all__ = ["Item"]
+__all__ = ["Item", "ItemBatch"]
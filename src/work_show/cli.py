@@ -0,0 +1,206 @@
+"""
+数据库维护命令行工具
+
+用法：python -m work_show.cli [--config config/settings.yaml] <command> [options]
+"""
+
+import argparse
+import sys
+from typing import Any, Callable
+
+import yaml
+
+from .storage.change_log import advance_cursor, format_cursor, parse_cursor
+from .storage.factory import build_storage
+from .utils.logger import get_logger
+
+logger = get_logger("cli")
+
+# 命令名 -> (处理函数, 帮助信息, 额外参数列表)
+_commands: dict[str, tuple[Callable, str, list[tuple[tuple, dict]]]] = {}
+
+
+def _register_command(
+    name: str, help: str, arguments: list[tuple[tuple, dict]] | None = None
+):
+    def inner_wrapper(func):
+        _commands[name] = (func, help, arguments or [])
+        return func
+
+    return inner_wrapper
+
+
+@_register_command(
+    "backfill-side-tables", help="根据 jobs 表中的 JSON 字段回填 job_city / job_keyword"
+)
+def backfill_side_tables(config: dict[str, Any], args: argparse.Namespace) -> None:
+    storage = build_storage(config["database"])
+    try:
+        total = storage.rebuild_side_tables()
+        logger.info(f"Backfilled side tables for {total} jobs")
+    finally:
+        storage.close()
+
+
+@_register_command("rebuild-fts", help="从 jobs 表重建 FTS5 全文索引")
+def rebuild_fts(config: dict[str, Any], args: argparse.Namespace) -> None:
+    storage = build_storage(config["database"])
+    try:
+        total = storage.rebuild_fts()
+        logger.info(f"Rebuilt full text index for {total} jobs")
+    finally:
+        storage.close()
+
+
+@_register_command("rebuild-stats", help="从 jobs 表重建预聚合统计表 job_stats")
+def rebuild_stats(config: dict[str, Any], args: argparse.Namespace) -> None:
+    storage = build_storage(config["database"])
+    try:
+        total = storage.rebuild_stats()
+        logger.info(f"Rebuilt job_stats from {total} jobs")
+    finally:
+        storage.close()
+
+
+@_register_command(
+    "compact-text",
+    help="把明文存储的描述和要求迁移到压缩的 job_text 表",
+    arguments=[
+        (("--train-dicts",), {"action": "store_true", "help": "按公司训练 zstd 字典"}),
+        (("--vacuum",), {"action": "store_true", "help": "完成后执行 VACUUM 回收空间"}),
+    ],
+)
+def compact_text(config: dict[str, Any], args: argparse.Namespace) -> None:
+    storage = build_storage(config["database"])
+    try:
+        storage.compact_texts()
+        if args.train_dicts:
+            storage.train_text_dictionaries()
+        if args.vacuum:
+            storage.vacuum()
+    finally:
+        storage.close()
+
+
+@_register_command(
+    "search",
+    help="全文检索职位",
+    arguments=[
+        (("query",), {"help": '空格分隔的检索词，如 "Rust Kubernetes"'}),
+        (("--limit",), {"type": int, "default": 20}),
+        (("--platform",), {"default": None, "help": "只检索某个来源平台"}),
+    ],
+)
+def search(config: dict[str, Any], args: argparse.Namespace) -> None:
+    storage = build_storage(config["database"])
+    try:
+        for item in storage.search(args.query, args.limit, args.platform):
+            print(
+                f"{item.source_platform}\t{item.job_id}\t{item.title}\t{item.job_url}"
+            )
+    finally:
+        storage.close()
+
+
+@_register_command(
+    "export-parquet",
+    help="把 jobs 表增量导出为按平台和发布月份分区的 Parquet 数据集",
+    arguments=[
+        (("output_dir",), {"help": "输出目录，导出进度也保存在该目录中"}),
+        (
+            ("--full",),
+            {"action": "store_true", "help": "忽略导出进度，重新导出全部数据"},
+        ),
+    ],
+)
+def export_parquet(config: dict[str, Any], args: argparse.Namespace) -> None:
+    from .storage.parquet_export import ParquetExporter
+
+    storage = build_storage(config["database"])
+    try:
+        ParquetExporter(storage, args.output_dir).export(full=args.full)
+    finally:
+        storage.close()
+
+
+@_register_command(
+    "changes",
+    help="输出 job_changes 中游标 --since 之后的变更，最后在标准错误输出下一次使用的游标",
+    arguments=[
+        (
+            ("--since",),
+            {
+                "type": parse_cursor,
+                "default": 0,
+                "help": '单库为 seq，分片存储为 "分片名:seq,分片名:seq"',
+            },
+        ),
+        (("--limit",), {"type": int, "default": 100}),
+    ],
+)
+def changes(config: dict[str, Any], args: argparse.Namespace) -> None:
+    storage = build_storage(config["database"])
+    try:
+        batch = storage.read_changes(args.since, args.limit)
+        for change in batch:
+            seq = f"{change.shard}:{change.seq}" if change.shard else change.seq
+            print(
+                f"{seq}\t{change.op}\t{change.source_platform}\t"
+                f"{change.job_id}\t{change.changed_at}"
+            )
+        print(format_cursor(advance_cursor(args.since, batch)), file=sys.stderr)
+    finally:
+        storage.close()
+
+
+@_register_command(
+    "import-jsonl",
+    help="批量导入历史 jsonl 数据（支持 .gz 和 glob），建议开启 database.upsert 以便重复导入",
+    arguments=[
+        (
+            ("patterns",),
+            {"nargs": "+", "help": '文件路径或 glob，如 "data/*.jsonl.gz"'},
+        ),
+        (
+            ("--workers",),
+            {"type": int, "default": None, "help": "解析进程数，默认为 CPU 核数"},
+        ),
+        (("--chunk-lines",), {"type": int, "default": 5000}),
+        (
+            ("--batch-size",),
+            {"type": int, "default": 20000, "help": "每个事务写入的条数"},
+        ),
+    ],
+)
+def import_jsonl(config: dict[str, Any], args: argparse.Namespace) -> None:
+    from .engine.bulk_import import BulkJsonlImporter
+
+    storage = build_storage(config["database"])
+    try:
+        importer = BulkJsonlImporter(
+            storage, chunk_lines=args.chunk_lines, batch_size=args.batch_size
+        )
+        if args.workers:
+            importer.workers = args.workers
+        importer.run(args.patterns)
+    finally:
+        storage.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="work_show.cli", description=__doc__)
+    parser.add_argument("--config", default="config/settings.yaml", help="配置文件路径")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (func, help, arguments) in _commands.items():
+        sub = subparsers.add_parser(name, help=help)
+        for flags, kwargs in arguments:
+            sub.add_argument(*flags, **kwargs)
+        sub.set_defaults(func=func)
+
+    args = parser.parse_args(argv)
+    config = yaml.safe_load(open(args.config, encoding="utf-8"))
+    args.func(config, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+按列保存的一批 Item
+
+大批量导入或回填时，逐个保存 Item 对象的开销主要在对象头、每个字段的引用以及重复的字符串。
+ItemBatch 每个字段一列：时间戳保存在 array('q')，薪资按第一个非空值的类型保存在 array('q') 或 array('d')，
+值的类型与列不一致时这一列退化为 list，取出的值与存入的类型相同。
+重复度高的字符串驻留后只保存一份，城市和 extra_info 保存为共享的元组，其余字段按列放在 list 中。
+ItemBatch 是 Item 的 Sequence，可以直接交给 save_batch，取出元素时才临时构造 Item。
+"""
+
+import math
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+from dataclasses import fields
+from typing import Any, Iterable, Iterator, overload
+
+from .models import INTERNED_FIELDS, Item
+
+FIELD_NAMES = tuple(f.name for f in fields(Item))
+# 整数列用这个值表示 None
+_INT_NULL = -(2**63)
+_INT_COLUMNS = ("publish_date", "crawl_date")
+_NULLS = {"q": _INT_NULL, "d": math.nan}
+# array 列只保存这个类型的值（bool 是 int 的子类，但不能存进 'q' 列）
+_ARRAY_TYPES = {"q": int, "d": float}
+_NUMBER_COLUMNS = ("salary_min", "salary_max")
+# 批次中职位名称的重复度也很高，一并驻留
+_INTERNED = frozenset(INTERNED_FIELDS) | {"title"}
+_TEXT_COLUMNS = ("description", "requirement")
+# 短于这个长度的文本压缩后反而更大
+_MIN_COMPRESS_LENGTH = 64
+
+
+def _new_column(name: str) -> array | list:
+    if name in _INT_COLUMNS:
+        return array("q")
+    if name in _NUMBER_COLUMNS:
+        return array("d")
+    return []
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Shape(tuple):
+    """extra_info 的 key 元组，同一来源的 extra_info 共享同一个 _Shape"""
+
+
+class _FrozenList(tuple):
+    """extra_info 中的列表值，保存为元组以便共享，取出时还原为列表"""
+
+
+def _freeze(value: Any) -> Any:
+    if type(value) is list:
+        return _FrozenList(_freeze(x) for x in value)
+    return _intern(value)
+
+
+def _thaw(value: Any) -> Any:
+    if value.__class__ is _FrozenList:
+        return [_thaw(x) for x in value]
+    return value
+
+
+def _signature(value: Any) -> Any:
+    """带上类型的比较 key，0 与 False、1 与 1.0 这类相等但类型不同的值不会被合并"""
+    if isinstance(value, tuple):
+        return type(value), tuple(_signature(x) for x in value)
+    return type(value), value
+
+
+def _share(shared: dict, kind: str, value: tuple) -> tuple:
+    """相同种类、相同类型的相等元组只保存一份"""
+    return shared.setdefault((kind, _signature(value)), value)
+
+
+def _encode(name: str, value: Any, shared: dict, compress_text: bool) -> Any:
+    """
+    把字段值转换为 list 列中保存的形式。
+    city 保存为元组，extra_info 保存为 (_Shape, 值元组)，相同的元组通过 shared 只保存一份；
+    compress_text 时长文本保存为 zlib 压缩后的 bytes。
+    """
+    if value is None:
+        return None
+    if name in _INTERNED:
+        return _intern(value)
+    if name == "city" and type(value) is list:
+        return _share(shared, "city", tuple(_intern(x) for x in value))
+    if name == "extra_info" and type(value) is dict:
+        shape = _Shape(_intern(k) for k in value)
+        values = tuple(_freeze(x) for x in value.values())
+        try:
+            values = _share(shared, "values", values)
+        except TypeError:  # 值中有 dict 等不可哈希的对象
+            pass
+        return _share(shared, "shape", shape), values
+    if (
+        compress_text
+        and name in _TEXT_COLUMNS
+        and type(value) is str
+        and len(value) >= _MIN_COMPRESS_LENGTH
+    ):
+        return zlib.compress(value.encode("utf-8"), 1)
+    return value
+
+
+def _decode(name: str, column: array | list, value: Any) -> Any:
+    if column.__class__ is list:
+        if value.__class__ is tuple:
+            if name == "city":
+                return list(value)
+            if name == "extra_info" and value and value[0].__class__ is _Shape:
+                return dict(zip(value[0], map(_thaw, value[1])))
+        elif value.__class__ is bytes and name in _TEXT_COLUMNS:
+            return zlib.decompress(value).decode("utf-8")
+        return value
+    if column.typecode == "q":
+        return None if value == _INT_NULL else value
+    return None if math.isnan(value) else value
+
+
+class ItemBatch(Sequence):
+    """
+    按列保存的一批 Item。
+    compress_text 为 True 时描述和要求以 zlib 压缩保存，内存更小，但取出 Item 时需要解压。
+    """
+
+    def __init__(self, items: Iterable[Item] = (), compress_text: bool = False):
+        self.compress_text = compress_text
+        self._columns: dict[str, array | list] = {
+            name: _new_column(name) for name in FIELD_NAMES
+        }
+        self._size = 0
+        # 批次内相同的城市元组、extra_info 的 key 和值只保存一份
+        self._shared: dict = {}
+        self.extend(items)
+
+    def append(self, item: Item) -> None:
+        for name, column in self._columns.items():
+            value = getattr(item, name)
+            if column.__class__ is list:
+                column.append(_encode(name, value, self._shared, self.compress_text))
+                continue
+            if value is None:
+                column.append(_NULLS[column.typecode])
+                continue
+            if type(value) is _ARRAY_TYPES[column.typecode]:
+                try:
+                    column.append(value)
+                    continue
+                except OverflowError:
+                    pass
+            column = self._retype(name, column, value)
+            column.append(value)
+        self._size += 1
+
+    def _retype(self, name: str, column: array, value: Any) -> array | list:
+        """
+        值的类型与 array 列不一致时换一种列：薪资列还没有非空值时换成与 value 匹配的 array，
+        其他情况（如来源没有转换成功的字符串、超出 64 位的整数）退化为 list。
+        """
+        typecode = {int: "q", float: "d"}.get(type(value))
+        null = _NULLS[column.typecode]
+        if (
+            name in _NUMBER_COLUMNS
+            and typecode is not None
+            and all(x == null or x != x for x in column)  # NaN 不等于自身
+            and (typecode == "d" or -(2**63) < value < 2**63)
+        ):
+            column = array(typecode, [_NULLS[typecode]] * len(column))
+        else:
+            column = [_decode(name, column, x) for x in column]
+        self._columns[name] = column
+        return column
+
+    def extend(self, items: Iterable[Item]) -> None:
+        for item in items:
+            self.append(item)
+
+    def clear(self) -> None:
+        self._columns = {name: _new_column(name) for name in FIELD_NAMES}
+        self._size = 0
+        self._shared = {}
+
+    def column(self, name: str) -> list:
+        """按列读取某个字段的所有值"""
+        column = self._columns[name]
+        return [_decode(name, column, x) for x in column]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _item(self, i: int) -> Item:
+        data = {}
+        for name, column in self._columns.items():
+            data[name] = _decode(name, column, column[i])
+        return Item(**data)
+
+    @overload
+    def __getitem__(self, i: int) -> Item: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[Item]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._item(k) for k in range(*i.indices(self._size))]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("ItemBatch index out of range")
+        return self._item(i)
+
+    def __iter__(self) -> Iterator[Item]:
+        for i in range(self._size):
+            yield self._item(i)
@@ -0,0 +1,14 @@
+class WorkShowError(Exception):
+    """本项目抛出的异常的基类"""
+
+
+class LLMUnavailableError(WorkShowError):
+    """
+    所有模型服务都请求失败。
+    errors 为 {服务名: 最后一次的异常}，调用方不应把未提取的职位当作提取成功保存。
+    """
+
+    def __init__(self, errors: dict[str, BaseException]):
+        self.errors = errors
+        detail = "; ".join(f"{name}: {e!r}" for name, e in errors.items())
+        super().__init__(f"All LLM providers failed: {detail or 'no provider'}")
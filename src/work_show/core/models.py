@@ -1,15 +1,31 @@
 from typing import Protocol, Iterator, Any, Iterable
 import hashlib
 import json
-from jsonpath_ng import parse
+import sys
 from dataclasses import dataclass
 from dataclasses import Field
 
+from .schema import CompiledSchema, compile_path, compile_schema
+
+# 取值重复度高的字符串字段，compact 时驻留，多个 Item 共享同一个字符串对象
+INTERNED_FIELDS = (
+    "company_name",
+    "source_platform",
+    "work_type",
+    "category",
+    "experience_req",
+    "education_req",
+    "job_level",
+)
+
 
 # --- 1. 数据模型 (Model) ---
-@dataclass
+@dataclass(slots=True)
 class Item:
-    """标准数据传输对象。所有来源的数据最终都要转换为此格式。"""
+    """
+    标准数据传输对象。所有来源的数据最终都要转换为此格式。
+    使用 __slots__ 而不是实例 __dict__，大批量数据时内存占用更小。
+    """
 
     job_id: str  # 原始数据的工作id，如果没有则手动使用uuid生成
     company_name: str | None = None  # 公司名字
@@ -37,60 +53,34 @@ class Item:
     @staticmethod
     def get_jsonpath_value(data, jsonpath_expr):
         """
-        使用 jsonpath-ng 从数据中提取值
-        """
-        try:
-            # 解析 JSONPath 表达式
-            jsonpath_expression = parse(jsonpath_expr)
-
-            # 在数据中查找匹配项
-            match = jsonpath_expression.find(data)
-
-            # 如果找到了匹配项
-            if match:
-                # match 是一个列表，通常我们要取第一个匹配到的值
-                # 如果路径指向一个具体的值（如int, str），value就是那个值
-                # 如果路径指向一个数组（如 workLocationsCode），value就是那个列表
-                return match[0].value
-            else:
-                return None
-        except Exception as e:
-            print(f"Error parsing {jsonpath_expr}: {e}")
-            return None
-
-    @staticmethod
-    def _process_schema(schema, source_data):
-        """
-        递归遍历映射表，如果遇到以 $ 开头的字符串，则使用 jsonpath 提取
-        Internal helper for recursive extraction.
+        从数据中提取 JSONPath 对应的值，表达式编译后会被缓存
         """
-        if isinstance(schema, dict):
-            # 如果是字典，递归处理每一个 key
-            return {k: Item._process_schema(v, source_data) for k, v in schema.items()}
-
-        elif isinstance(schema, list):
-            # 如果是列表，递归处理列表中的每一项
-            return [Item._process_schema(item, source_data) for item in schema]
-
-        elif isinstance(schema, str) and schema.startswith("$"):
-            # 核心逻辑：如果是 JSONPath 字符串，调用提取函数
-            return Item.get_jsonpath_value(source_data, schema)
-
-        else:
-            # 其他情况（固定值、null、数字等），直接返回原值
-            return schema
+        return compile_path(jsonpath_expr)(data)
 
     @classmethod
-    def transform_with_jsonpath(cls, schema, source_data) -> "Item":
+    def transform_with_jsonpath(
+        cls, schema: "dict | CompiledSchema", source_data
+    ) -> "Item":
         """
-        根据 schema 从 source_data 中提取数据并转化为 Item 对象
+        根据 schema 从 source_data 中提取数据并转化为 Item 对象。
+        schema 可以是 compile_schema 编译好的映射表，批量转换时在循环外编译一次即可。
         """
-        data = cls._process_schema(schema, source_data)
+        data = compile_schema(schema)(source_data)
         if not isinstance(data, dict):
             raise ValueError(
                 "The root schema must result in a dictionary to create an Item."
             )
         return cls(**data)
 
+    def compact(self) -> "Item":
+        """驻留公司、平台、城市、分类等重复度高的字符串，返回自身"""
+        for name in INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
+        if self.city:
+            self.city = [sys.intern(x) if type(x) is str else x for x in self.city]
+        return self
+
     def get_fingerprint(self) -> str:
         return str(self.job_id)
@@ -1,4 +1,4 @@
-from typing import Protocol, Iterator, Any, Iterable
+from typing import Protocol, Iterator, Any, Iterable, runtime_checkable
 from enum import Enum, auto
 from dataclasses import dataclass
 from pydantic import BaseModel
@@ -28,6 +28,10 @@ class DataStorage(Protocol):
 
     def save(self, item: Item) -> None: ...
 
+    def save_batch(self, items: list[Item]) -> None:
+        """在一个事务中批量保存"""
+        ...
+
     def close(self) -> None:
         """关闭连接等资源清理"""
         ...
@@ -37,6 +41,23 @@ class DataStorage(Protocol):
         ...
 
 
+@runtime_checkable
+class JobLifecycleStorage(Protocol):
+    """
+    记录职位生命周期（first_seen / last_seen / closed_at）的存储，引擎据此维护职位是否仍在招聘。
+    """
+
+    def touch(self, keys: Iterable[tuple[str, str]], seen_at: int | None = None) -> int:
+        """批量刷新再次看到的 (source_platform, job_id) 的 last_seen"""
+        ...
+
+    def mark_closed(
+        self, seen_ids: set[str], filters: dict[str, Any], closed_at: int | None = None
+    ) -> int:
+        """完整遍历后，把 filters 范围内这次没有看到的职位标记为已关闭"""
+        ...
+
+
 class DataSource(Protocol):
     """
     只负责从特定来源获取数据，并解析为 Item 对象。不关心去重，也不关心存储。
@@ -61,10 +82,27 @@ class DataSource(Protocol):
         ...
 
 
+@runtime_checkable
+class PagedDataSource(Protocol):
+    """
+    支持按页号直接跳转的数据源，引擎可以借此对增量爬取做边界查找。
+    """
+
+    start_page: int
+
+    def fetch_page(self, n: int) -> list[Item]:
+        """获取第 n 页的全部 Item，没有数据时返回空列表"""
+        ...
+
+
 class Deduplicator(Protocol):
     def check_status(self, item: Item) -> DedupResponse:
         """检查Item状态，决定如何处理"""
         ...
 
+    def is_seen(self, item: Item) -> bool:
+        """只读地判断 Item 是否已经见过，不改变去重器状态"""
+        ...
+
     def merge_set(self, st: set) -> None:
         """合并重复的item"""
@@ -0,0 +1,131 @@
+"""
+映射表（schema）编译
+
+映射表中以 $ 开头的字符串是 JSONPath。逐条数据调用 jsonpath_ng.parse 的开销远大于取值本身，
+这里把映射表一次编译为可复用的提取器：
+    - 形如 $.a.b 的简单路径直接按 key 逐层取字典中的值
+    - 其他表达式只解析一次，缓存解析后的 jsonpath 对象
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+from jsonpath_ng import parse
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 只由普通字段名组成的路径走快速路径，where / wherenot 是 jsonpath_ng 的关键字
+_SIMPLE_PATH = re.compile(r"^\$(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+_RESERVED_WORDS = {"where", "wherenot"}
+# 按对象身份和按内容缓存的已编译映射表个数
+_SCHEMA_CACHE_SIZE = 128
+
+Extractor = Callable[[Any], Any]
+
+
+def _missing(data: Any) -> None:
+    return None
+
+
+def _simple_getter(keys: tuple[str, ...]) -> Extractor:
+    def get(data: Any) -> Any:
+        for key in keys:
+            if not isinstance(data, dict):
+                return None
+            data = data.get(key)
+            if data is None:
+                return None
+        return data
+
+    return get
+
+
+@lru_cache(maxsize=4096)
+def compile_path(expr: str) -> Extractor:
+    """把一个 JSONPath 表达式编译为取值函数，取第一个匹配项的值，没有匹配时返回 None"""
+    if _SIMPLE_PATH.match(expr):
+        keys = tuple(expr.split(".")[1:])
+        if not _RESERVED_WORDS.intersection(keys):
+            return _simple_getter(keys)
+    try:
+        jsonpath_expression = parse(expr)
+    except Exception as e:
+        logger.error(f"Error parsing {expr}: {e}")
+        return _missing
+
+    def find(data: Any) -> Any:
+        try:
+            match = jsonpath_expression.find(data)
+        except Exception as e:
+            logger.error(f"Error evaluating {expr}: {e}")
+            return None
+        # 通常取第一个匹配到的值；路径指向数组时，值就是那个列表
+        return match[0].value if match else None
+
+    return find
+
+
+def _compile(schema: Any) -> Extractor:
+    if isinstance(schema, dict):
+        fields = [(k, _compile(v)) for k, v in schema.items()]
+        return lambda data: {k: extract(data) for k, extract in fields}
+    if isinstance(schema, list):
+        elements = [_compile(v) for v in schema]
+        return lambda data: [extract(data) for extract in elements]
+    if isinstance(schema, str) and schema.startswith("$"):
+        return compile_path(schema)
+    # 其他情况（固定值、null、数字等）直接返回原值
+    return lambda data: schema
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    """编译后的映射表，调用时返回与映射表结构相同、填入提取结果的数据"""
+
+    schema: Any
+
+    def __post_init__(self):
+        object.__setattr__(self, "_extract", _compile(self.schema))
+
+    def __call__(self, data: Any) -> Any:
+        return self._extract(data)
+
+
+def compile_schema(schema: Any) -> CompiledSchema:
+    """
+    编译映射表。同一个映射表对象只编译一次，按对象身份查找，逐条转换时调用也没有额外开销；
+    不同对象但内容相同的映射表共享同一个编译结果。映射表编译后不应再修改。
+    """
+    if isinstance(schema, CompiledSchema):
+        return schema
+    cached = _identity_cache.get(id(schema))
+    # 同时保存映射表对象本身，防止它被回收后 id 被其他对象复用
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+    key = json.dumps(schema, sort_keys=True, ensure_ascii=False, default=repr)
+    compiled = _compile_cached(key, schema)
+    _bounded_put(_identity_cache, id(schema), (schema, compiled))
+    return compiled
+
+
+_schema_cache: dict[str, CompiledSchema] = {}
+_identity_cache: dict[int, tuple[Any, CompiledSchema]] = {}
+
+
+def _bounded_put(cache: dict, key: Any, value: Any) -> None:
+    if len(cache) >= _SCHEMA_CACHE_SIZE:
+        cache.pop(next(iter(cache)), None)
+    cache[key] = value
+
+
+def _compile_cached(key: str, schema: Any) -> CompiledSchema:
+    compiled = _schema_cache.get(key)
+    if compiled is None:
+        compiled = CompiledSchema(schema)
+        _bounded_put(_schema_cache, key, compiled)
+    return compiled
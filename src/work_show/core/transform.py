@@ -0,0 +1,194 @@
+"""
+整页原始数据的批量转换
+
+各个来源拿到一页原始数据后，先按映射表提取字段，再做一些固定的修补：类型转换、毫秒转秒、
+查码表、填默认值等。这些修补用 TransformSpec 声明一次，transform_batch 一次转换整页数据，
+规则在构造时编译为函数列表，每条数据只执行真正需要处理的字段。
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterable, Mapping
+
+from .models import Item
+from .schema import compile_schema
+
+# 转换失败时保留原值，与各来源原先 try/except 后跳过的写法一致
+_CONVERSION_ERRORS = (TypeError, ValueError, OverflowError, KeyError)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _each(fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """对列表中的每个元素应用 fn，标量直接应用"""
+
+    def apply(value: Any) -> Any:
+        if isinstance(value, list):
+            return [fn(x) for x in value]
+        return fn(value)
+
+    return apply
+
+
+def _safe(fn: Callable[[Any], Any], keep_on_error: bool = True) -> Callable[[Any], Any]:
+    """转换失败时保留原值，keep_on_error 为 False 时返回 None"""
+
+    def apply(value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return fn(value)
+        except _CONVERSION_ERRORS:
+            return value if keep_on_error else None
+
+    return apply
+
+
+def _get_dotted(data: dict, path: str) -> Any:
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _date_parser(date_format: str) -> Callable[[Any], Any]:
+    if date_format == "iso":
+        return lambda v: int(datetime.fromisoformat(v).timestamp())
+    return lambda v: int(datetime.strptime(v, date_format).timestamp())
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    单个字段的后处理规则，按以下顺序执行：
+        source      改为从提取结果的另一个位置取值（如 "extra_info.city_list"），取不到时保留原值
+        pluck       列表中的字典元素只取某个 key（如 "name"）
+        lookup      查码表，查不到时使用 lookup_default；列表逐个元素查
+        divide      数值整除，如毫秒时间戳 // 1000
+        parse_date  时间字符串转换为秒级时间戳，"iso" 或 strptime 的格式，解析失败时为 None
+        cast        类型转换，如 str
+        as_list     非列表的值包装为列表
+        default     值为空时使用的默认值
+        template    值为空时用 str.format 生成，可以引用其他字段和 context
+    """
+
+    source: str | None = None
+    pluck: str | None = None
+    lookup: Mapping[Any, Any] | None = None
+    lookup_default: Any = None
+    divide: int | None = None
+    parse_date: str | None = None
+    cast: Callable[[Any], Any] | None = None
+    as_list: bool = False
+    default: Any = None
+    template: str | None = None
+
+    def compile(self) -> Callable[[dict], Any]:
+        """编译为 (提取结果) -> 新值 的函数，不包括 default 和 template"""
+        steps: list[Callable[[Any], Any]] = []
+        if self.pluck is not None:
+            key = self.pluck
+            steps.append(_each(_safe(lambda v: v[key])))
+        if self.lookup is not None:
+            table, fallback = self.lookup, self.lookup_default
+
+            def lookup(v: Any) -> Any:
+                try:
+                    return table.get(v, fallback)
+                except TypeError:  # 不可哈希的值
+                    return fallback
+
+            steps.append(_each(lookup))
+        if self.divide is not None:
+            n = self.divide
+            steps.append(_each(_safe(lambda v: v // n)))
+        if self.parse_date is not None:
+            # 时间戳字段不能留下原始字符串，解析失败时置空（之后可以由 default 填充）
+            steps.append(
+                _each(_safe(_date_parser(self.parse_date), keep_on_error=False))
+            )
+        if self.cast is not None:
+            steps.append(_each(_safe(self.cast)))
+        if self.as_list:
+            steps.append(lambda v: v if v is None or isinstance(v, list) else [v])
+        source = self.source
+
+        def apply(name: str, data: dict) -> Any:
+            value = data.get(name)
+            if source is not None:
+                sourced = _get_dotted(data, source)
+                if sourced is not None:
+                    value = sourced
+            for step in steps:
+                value = step(value)
+            return value
+
+        return apply
+
+
+@dataclass(frozen=True)
+class TransformSpec:
+    """
+    一个来源的完整转换声明。
+    schema     映射表，见 core.schema
+    rules      字段名 -> FieldRule
+    constants  固定写入的字段，如 source_platform、company_name
+    stamp_crawl_date  crawl_date 为空时填入本批数据的抓取时间
+    """
+
+    schema: Any
+    rules: Mapping[str, FieldRule] = field(default_factory=dict)
+    constants: Mapping[str, Any] = field(default_factory=dict)
+    stamp_crawl_date: bool = True
+
+    def __post_init__(self):
+        object.__setattr__(self, "_extract", compile_schema(self.schema))
+        object.__setattr__(
+            self,
+            "_steps",
+            [(name, rule.compile()) for name, rule in self.rules.items()],
+        )
+        object.__setattr__(
+            self,
+            "_fills",
+            [
+                (name, rule.default, rule.template)
+                for name, rule in self.rules.items()
+                if rule.default is not None or rule.template is not None
+            ],
+        )
+
+    def apply(self, record: Any, context: Mapping[str, Any], now: int) -> dict:
+        """把一条原始数据转换为 Item 的字段字典"""
+        data = self._extract(record)
+        for name, step in self._steps:
+            data[name] = step(name, data)
+        data.update(self.constants)
+        if self.stamp_crawl_date and _is_empty(data.get("crawl_date")):
+            data["crawl_date"] = now
+        for name, default, template in self._fills:
+            if _is_empty(data.get(name)):
+                if template is not None:
+                    data[name] = template.format_map({**data, **context})
+                else:
+                    # 列表默认值复制一份，避免多个 Item 共享同一个对象
+                    data[name] = list(default) if isinstance(default, list) else default
+        return data
+
+
+def transform_batch(
+    records: Iterable[Any] | None,
+    spec: TransformSpec,
+    context: Mapping[str, Any] | None = None,
+) -> list[Item]:
+    """
+    一次转换一整页原始数据。
+    context 提供页面级别的值（如当前的招聘类型），供 template 引用。
+    """
+    context = context or {}
+    now = int(time.time())
+    return [Item(**spec.apply(record, context, now)) for record in records or []]
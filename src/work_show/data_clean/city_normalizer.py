@@ -0,0 +1,231 @@
+"""
+城市标准化引擎
+
+各来源给出的城市写法不统一：["北京"]、"Beijing"、"110000"、"北京市海淀区"、"深圳总部"……
+CityNormalizer 基于 divisions 中的行政区划表建立别名索引（简称、全称、拼音、英文名、行政区划代码、
+平台城市代码），先整体精确匹配，匹配不到时用 Aho-Corasick 自动机在字符串中查找中文地名，
+一次扫描即可找出其中出现的所有城市。结果带有所属省份和坐标，同一个原始字符串只解析一次。
+"""
+
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .code_dict import CodeDictRegistry, code_dicts
+from .divisions import ALIASES, CITIES, FOREIGN, PROVINCES
+
+# 解析结果缓存的最大条数，不同的原始写法通常只有几千种
+_CACHE_SIZE = 100_000
+_SEPARATORS = re.compile(r"[\s\-_'’.·]+")
+_TOKEN_SPLIT = re.compile(r"[,，/、;；|()（）]+")
+
+
+@dataclass(frozen=True, slots=True)
+class Division:
+    name: str  # 标准名称，如 "北京"、"深圳"、"广东"
+    level: str  # province、city、county 或 foreign
+    province: str | None = None  # 所属省级行政区，海外为 None
+    adcode: str | None = None
+    lat: float | None = None
+    lon: float | None = None
+    country: str = "中国"
+
+    @property
+    def coordinates(self) -> tuple[float, float] | None:
+        if self.lat is None or self.lon is None:
+            return None
+        return self.lat, self.lon
+
+
+def _key(value: str) -> str:
+    return _SEPARATORS.sub("", value.strip().lower())
+
+
+def _is_ascii(value: str) -> bool:
+    return value.isascii()
+
+
+class _AhoCorasick:
+    """多模式串匹配自动机，find 返回 (起始位置, 模式串) 列表"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[str, ...]] = [()]
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = nxt
+        self._output[state] = (*self._output[state], pattern)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                if self._fail[nxt] == nxt:
+                    self._fail[nxt] = 0
+                self._output[nxt] = (*self._output[nxt], *self._output[self._fail[nxt]])
+
+    def find(self, text: str) -> list[tuple[int, str]]:
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for pattern in self._output[state]:
+                matches.append((i - len(pattern) + 1, pattern))
+        return matches
+
+
+class CityNormalizer:
+    def __init__(self, registry: CodeDictRegistry | None = code_dicts):
+        self._index: dict[str, Division] = {}
+        self.divisions: dict[str, Division] = {}
+        self._build()
+        if registry is not None:
+            self._add_platform_codes(registry)
+        self._matcher = _AhoCorasick(
+            alias for alias in self._index if not _is_ascii(alias)
+        )
+        self._cache: dict[str, tuple[Division, ...]] = {}
+        self._cache_lock = threading.Lock()
+
+    def _add(self, division: Division, *aliases: str | None) -> None:
+        self.divisions.setdefault(division.name, division)
+        for alias in aliases:
+            if alias:
+                # 排在前面的条目优先，如拼音相同的城市
+                self._index.setdefault(_key(alias), division)
+
+    def _build(self) -> None:
+        for adcode, name, full_name, pinyin, lat, lon in PROVINCES:
+            province = Division(name, "province", name, adcode, lat, lon)
+            self._add(province, name, full_name, adcode, pinyin, *ALIASES.get(name, ()))
+        for adcode, name, full_name, province, pinyin, lat, lon in CITIES:
+            level = "county" if adcode[4:] != "00" else "city"
+            city = Division(name, level, province, adcode, lat, lon)
+            self._add(city, name, full_name, adcode, pinyin, *ALIASES.get(name, ()))
+        for name, english, country, lat, lon in FOREIGN:
+            self._add(
+                Division(name, "foreign", None, None, lat, lon, country), name, english
+            )
+
+    def _add_platform_codes(self, registry: CodeDictRegistry) -> None:
+        """平台城市代码（如快手的 "Viet Nam"）指向其名称对应的条目"""
+        for platform in registry.platforms():
+            for code, name in registry.get(platform).table("city").items():
+                division = self._index.get(_key(name))
+                if division is not None:
+                    self._index.setdefault(_key(code), division)
+
+    def _scan(self, text: str) -> list[Division]:
+        """在字符串中查找所有中文地名，重叠时取最长的，省份被同一字符串中的城市覆盖时省略"""
+        matches = sorted(self._matcher.find(text), key=lambda m: (m[0], -len(m[1])))
+        found: list[Division] = []
+        end = 0
+        for start, alias in matches:
+            if start < end:
+                continue
+            end = start + len(alias)
+            division = self._index[alias]
+            if division not in found:
+                found.append(division)
+        cities = [x for x in found if x.level != "province"]
+        covered = {x.province for x in cities}
+        return cities + [
+            x for x in found if x.level == "province" and x.name not in covered
+        ]
+
+    def _resolve_uncached(self, raw: str) -> tuple[Division, ...]:
+        division = self._index.get(_key(raw))
+        if division is not None:
+            return (division,)
+        found: list[Division] = []
+        for token in _TOKEN_SPLIT.split(raw):
+            token = token.strip()
+            if not token:
+                continue
+            division = self._index.get(_key(token))
+            if division is not None:
+                candidates = [division]
+            elif _is_ascii(token):
+                candidates = []
+            else:
+                candidates = self._scan(_key(token))
+            found.extend(x for x in candidates if x not in found)
+        return tuple(found)
+
+    def resolve_all(self, raw: Any) -> tuple[Division, ...]:
+        """解析一个原始城市字符串中出现的所有城市"""
+        if raw is None:
+            return ()
+        raw = str(raw)
+        result = self._cache.get(raw)
+        if result is None:
+            result = self._resolve_uncached(raw)
+            with self._cache_lock:
+                if len(self._cache) >= _CACHE_SIZE:
+                    self._cache.clear()
+                self._cache[raw] = result
+        return result
+
+    def resolve(self, raw: Any) -> Division | None:
+        """解析一个原始城市字符串，返回第一个匹配到的城市，匹配不到时返回 None"""
+        result = self.resolve_all(raw)
+        return result[0] if result else None
+
+    def resolve_batch(self, raws: Iterable[Any]) -> list[Division | None]:
+        """一次解析一批原始城市字符串，重复的写法只解析一次"""
+        return [self.resolve(raw) for raw in raws]
+
+    def normalize(self, city: Any) -> list[str]:
+        """
+        把 Item.city（列表、单个字符串或 None）转换为标准名称列表，去重并保持顺序。
+        无法识别的写法去掉首尾空白后原样保留。
+        """
+        if city is None:
+            return []
+        values = city if isinstance(city, (list, tuple)) else [city]
+        names: list[str] = []
+        for value in values:
+            if value is None or (isinstance(value, str) and not value.strip()):
+                continue
+            divisions = self.resolve_all(value)
+            candidates = [x.name for x in divisions] or [str(value).strip()]
+            names.extend(x for x in candidates if x not in names)
+        return names
+
+    def normalize_batch(self, cities: Iterable[Any]) -> list[list[str]]:
+        return [self.normalize(city) for city in cities]
+
+    def coordinates(self, name: str) -> tuple[float, float] | None:
+        division = self.resolve(name)
+        return division.coordinates if division is not None else None
+
+    def province_of(self, name: str) -> str | None:
+        division = self.resolve(name)
+        return division.province if division is not None else None
+
+
+# 进程内共享的实例，建立索引之后只读
+city_normalizer = CityNormalizer()
@@ -0,0 +1,194 @@
+"""
+平台代码字典注册表
+
+招聘平台的接口只返回城市、职位类别、经验要求、职位性质等代码（如 "Beijing"、"J0004"），
+名称需要查平台自己的字典。注册表为每个平台保存一份不可变的字典快照，进程内只加载一次，
+多个爬虫线程共享读取，不需要加锁。
+
+快照的来源按优先级：
+    1. 平台字典接口（通过 register_fetcher 注册的函数获取），获取后写入磁盘缓存
+    2. 磁盘缓存 <cache_dir>/<platform>.json
+    3. code_tables 中的内置字典
+refresh 只在快照超过 ttl 时才重新请求接口，请求失败时继续使用原来的快照。
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+from ..utils.logger import get_logger
+from .code_tables import BUILTIN_CODE_DICTS
+
+logger = get_logger(__name__)
+
+# 字典种类
+CODE_KINDS = ("city", "category", "experience", "nature")
+
+# 返回 {字典种类: {代码: 名称}}，只需要包含获取到的种类
+Fetcher = Callable[[], dict[str, dict[str, str]]]
+
+_EMPTY_TABLE: Mapping[str, str] = MappingProxyType({})
+
+
+def _freeze(tables: Mapping[str, Mapping[str, str]]) -> Mapping[str, Mapping[str, str]]:
+    return MappingProxyType(
+        {kind: MappingProxyType(dict(table)) for kind, table in tables.items()}
+    )
+
+
+@dataclass(frozen=True)
+class CodeDict:
+    """一个平台的字典快照，创建后不再修改"""
+
+    platform: str
+    tables: Mapping[str, Mapping[str, str]]
+    # 从接口获取的时间，内置字典为 0
+    updated_at: float = 0
+    # builtin、cache 或 endpoint
+    origin: str = "builtin"
+
+    def table(self, kind: str) -> Mapping[str, str]:
+        return self.tables.get(kind, _EMPTY_TABLE)
+
+    def lookup(self, kind: str, code: Any, default: Any = None) -> Any:
+        try:
+            return self.table(kind).get(code, default)
+        except TypeError:  # 不可哈希的代码
+            return default
+
+
+class CodeDictRegistry:
+    def __init__(
+        self,
+        cache_dir: str | None = "./cache/code_dicts",
+        ttl: int = 7 * 24 * 3600,
+        builtins: Mapping[str, Mapping[str, Mapping[str, str]]] = BUILTIN_CODE_DICTS,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._builtins = builtins
+        self._dicts: dict[str, CodeDict] = {}
+        self._fetchers: dict[str, Fetcher] = {}
+        self._lock = threading.Lock()
+        # 同一时间只有一个线程请求平台接口
+        self._refresh_lock = threading.Lock()
+
+    def configure(self, cache_dir: str | None = None, ttl: int | None = None) -> None:
+        """按配置文件中的 code_dicts 段修改缓存目录和有效期，已加载的快照会在下次读取时重新加载"""
+        with self._lock:
+            if cache_dir is not None:
+                self.cache_dir = cache_dir
+            if ttl is not None:
+                self.ttl = ttl
+            self._dicts.clear()
+
+    def platforms(self) -> list[str]:
+        return sorted(set(self._builtins) | set(self._dicts) | set(self._fetchers))
+
+    def register_fetcher(self, platform: str, fetcher: Fetcher) -> None:
+        """注册从平台字典接口获取字典的函数，refresh 时调用"""
+        with self._lock:
+            self._fetchers[platform] = fetcher
+
+    def get(self, platform: str) -> CodeDict:
+        """获取平台的字典快照，首次读取时从磁盘缓存或内置字典加载"""
+        code_dict = self._dicts.get(platform)
+        if code_dict is not None:
+            return code_dict
+        with self._lock:
+            code_dict = self._dicts.get(platform)
+            if code_dict is None:
+                code_dict = self._load(platform)
+                self._dicts[platform] = code_dict
+            return code_dict
+
+    def is_stale(self, platform: str) -> bool:
+        return time.time() - self.get(platform).updated_at > self.ttl
+
+    def refresh(self, platform: str, force: bool = False) -> CodeDict:
+        """
+        快照过期（或 force）且注册了获取函数时，从平台接口重新获取字典并写入磁盘缓存。
+        接口只返回部分种类时，其余种类沿用原来的快照。获取失败时返回原来的快照。
+        """
+        fetcher = self._fetchers.get(platform)
+        if fetcher is None or not (force or self.is_stale(platform)):
+            return self.get(platform)
+        with self._refresh_lock:
+            # 等锁期间其他线程可能已经刷新过
+            current = self.get(platform)
+            if not force and not self.is_stale(platform):
+                return current
+            try:
+                fetched = fetcher()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to refresh code dictionaries of {platform}: {e}"
+                )
+                return current
+            if not fetched:
+                logger.warning(f"Empty code dictionaries fetched for {platform}")
+                return current
+            code_dict = CodeDict(
+                platform=platform,
+                tables=_freeze({**current.tables, **fetched}),
+                updated_at=time.time(),
+                origin="endpoint",
+            )
+            with self._lock:
+                self._dicts[platform] = code_dict
+                self._save_cache(code_dict)
+        logger.info(
+            f"Refreshed code dictionaries of {platform}: "
+            + ", ".join(f"{kind}={len(t)}" for kind, t in code_dict.tables.items())
+        )
+        return code_dict
+
+    def _cache_path(self, platform: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return Path(self.cache_dir) / f"{platform}.json"
+
+    def _load(self, platform: str) -> CodeDict:
+        path = self._cache_path(platform)
+        if path is not None and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                return CodeDict(
+                    platform=platform,
+                    tables=_freeze(data["tables"]),
+                    updated_at=data["updated_at"],
+                    origin="cache",
+                )
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignore broken code dictionary cache {path}: {e}")
+        if platform not in self._builtins and platform not in self._fetchers:
+            raise KeyError(f"Unknown code dictionary platform: {platform}")
+        return CodeDict(
+            platform=platform, tables=_freeze(self._builtins.get(platform, {}))
+        )
+
+    def _save_cache(self, code_dict: CodeDict) -> None:
+        path = self._cache_path(code_dict.platform)
+        if path is None:
+            return
+        data = {
+            "updated_at": code_dict.updated_at,
+            "tables": {kind: dict(t) for kind, t in code_dict.tables.items()},
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再替换，避免中断时留下不完整的缓存
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), "utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write code dictionary cache {path}: {e}")
+
+
+# 进程内共享的注册表
+code_dicts = CodeDictRegistry()
@@ -0,0 +1,215 @@
+"""
+内置的平台代码字典
+
+作为 CodeDictRegistry 的初始值，平台接口不可用、也没有磁盘缓存时使用。
+"""
+
+# --- 快手 ---
+# 社招和校招站点的城市、经验、性质代码相同，职位类别的名称不同
+
+KUAISHOU_CITY = {
+    "Beijing": "北京",
+    "Shanghai": "上海",
+    "Guangzhou": "广州",
+    "Shenzhen": "深圳",
+    "Tianjin": "天津",
+    "Hangzhou": "杭州",
+    "Chengdu": "成都",
+    "Wuhan": "武汉",
+    "Jinan": "济南",
+    "qingdao": "青岛",
+    "Yantai": "烟台",
+    "xiamen": "厦门",
+    "Taiyuan": "太原",
+    "Xian": "西安",
+    "Shenyang": "沈阳",
+    "Haerbin": "哈尔滨",
+    "changchun": "长春",
+    "shijiazhuang": "石家庄",
+    "kunming": "昆明",
+    "Dalian": "大连",
+    "Lanzhou": "兰州",
+    "Wuxi": "无锡",
+    "huaian": "淮安",
+    "tongren": "铜仁",
+    "jishou": "吉首",
+    "Changsha": "长沙",
+    "wulanchabu": "乌兰察布",
+    "hongkong": "香港",
+    "suzhou": "苏州",
+    "Los Angeles": "洛杉矶",
+    "chengmai": "澄迈",
+    "San Jose": "硅谷",
+    "New York": "纽约",
+    "Seattle": "西雅图",
+    "Washington, D.C.": "华盛顿特区",
+    "Yancheng": "盐城",
+    "San Diego": "圣地亚哥",
+    "bengaluru": "班加罗尔",
+    "saopaulo": "圣保罗",
+    "gurugram": "古尔冈",
+    "Jakarta": "雅加达",
+    "Kualalumpur": "吉隆坡",
+    "Egypt": "埃及",
+    "Mexico": "墨西哥",
+    "Argentina": "阿根廷",
+    "Viet Nam": "越南",
+    "Russia": "俄罗斯",
+    "Singapore": "新加坡",
+    "Seoul": "首尔",
+    "islamabad": "伊斯兰堡",
+    "zhengzhou": "郑州",
+    "chongqing": "重庆",
+    "Dongguan": "东莞",
+    "Tangshan": "唐山",
+    "Linyi": "临沂",
+    "baoding": "保定",
+    "Luoyang": "洛阳",
+    "Suining": "遂宁",
+    "Zhuhai": "珠海",
+    "huhehaote": "呼和浩特",
+    "yinchuan": "银川",
+    "nanjing": "南京",
+    "columbia": "哥伦比亚",
+    "peru": "秘鲁",
+    "Bangkok": "曼谷",
+    "London": "伦敦",
+    "Dubai": "迪拜",
+    "Karachi": "卡拉奇",
+    "Morocco": "摩洛哥",
+    "Dhaka": "达卡",
+    "Kathmandu": "加德满都",
+    "Colombo": "科伦坡",
+    "Moscow": "莫斯科",
+    "Istanbul": "伊斯坦布尔",
+    "Lahore": "拉合尔",
+    "hefei": "合肥",
+}
+
+KUAISHOU_EXPERIENCE = {
+    "1": "不限",
+    "2": "应届毕业生",
+    "3": "1年以下",
+    "4": "1-3年",
+    "5": "3-5年",
+    "6": "5-10年",
+    "7": "10年以上",
+}
+
+KUAISHOU_NATURE = {
+    "C001": "全职",
+    "C002": "实习",
+    "C003": "兼职",
+}
+
+KUAISHOU_SOCIAL_CATEGORY = {
+    "B012": "客服类",
+    "J0001": "技术类",
+    "B009": "工程类",
+    "B008": "算法类",
+    "B003": "产品类",
+    "B004": "职能类",
+    "B005": "运营类",
+    "B006": "市场类",
+    "B002": "设计类",
+    "B010": "战略支持类",
+    "J0012": "工程类",
+    "B011": "战略分析类",
+    "B001": "技术类",
+    "J0011": "算法类",
+    "J0005": "产品类",
+    "J0004": "运营类",
+    "J0003": "设计类",
+    "J0014": "分析类",
+    "J0013": "战略类",
+    "J0006": "市场类",
+    "J0002": "职能类",
+    "J0007": "客服类",
+    "J0008": "审核类",
+    "J0009": "内容评级类",
+    "J0015": "销售及支持类",
+    "J0010": "其它类",
+    "B007": "其他",
+}
+
+KUAISHOU_CAMPUS_CATEGORY = {
+    "B012": "客服",
+    "J0001": "技术",
+    "B009": "工程",
+    "B008": "算法",
+    "B003": "产品",
+    "B004": "职能",
+    "B005": "运营",
+    "B006": "市场",
+    "B002": "设计",
+    "B010": "战略支持",
+    "J0012": "工程",
+    "B011": "战略分析",
+    "B001": "技术",
+    "J0011": "算法",
+    "J1001": "算法",
+    "J1002": "算法",
+    "J1003": "算法",
+    "J1004": "算法",
+    "J1005": "算法",
+    "J1006": "算法",
+    "J1007": "算法",
+    "J1008": "算法",
+    "J1009": "算法",
+    "J1010": "算法",
+    "J1011": "算法",
+    "J1012": "算法",
+    "J1013": "算法",
+    "J1014": "工程",
+    "J1015": "工程",
+    "J1016": "工程",
+    "J1017": "工程",
+    "J1018": "工程",
+    "J1019": "工程",
+    "J1020": "工程",
+    "J1021": "产品",
+    "J1026": "产品",
+    "J1022": "产品",
+    "J1023": "产品",
+    "J1024": "产品",
+    "J1025": "产品",
+    "J1027": "运营",
+    "J1028": "运营",
+    "J1029": "运营",
+    "J1030": "运营",
+    "J1031": "运营",
+    "J1032": "运营",
+    "J1033": "运营",
+    "J1034": "运营",
+    "J1035": "运营",
+    "J1036": "运营",
+    "J0005": "产品",
+    "J0004": "运营",
+    "J0003": "设计",
+    "J0014": "分析",
+    "J0013": "战略",
+    "J0006": "市场",
+    "J0002": "职能",
+    "J0007": "客服",
+    "J0008": "审核",
+    "J0009": "内容评级",
+    "J0015": "销售及支持",
+    "J0010": "其它",
+    "B007": "其他",
+}
+
+# 平台 -> 字典种类 -> 代码 -> 名称
+BUILTIN_CODE_DICTS = {
+    "kuaishou_social": {
+        "city": KUAISHOU_CITY,
+        "category": KUAISHOU_SOCIAL_CATEGORY,
+        "experience": KUAISHOU_EXPERIENCE,
+        "nature": KUAISHOU_NATURE,
+    },
+    "kuaishou_campus": {
+        "city": KUAISHOU_CITY,
+        "category": KUAISHOU_CAMPUS_CATEGORY,
+        "experience": KUAISHOU_EXPERIENCE,
+        "nature": KUAISHOU_NATURE,
+    },
+}
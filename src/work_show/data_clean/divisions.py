@@ -0,0 +1,242 @@
+"""
+行政区划表
+
+省级行政区、地级市（以及常见的县级市、县）和海外办公地点，供 CityNormalizer 建立索引。
+坐标为市政府所在地的近似经纬度，省级行政区使用省会的坐标。
+"""
+
+# (行政区划代码, 简称, 全称, 拼音, 纬度, 经度)
+PROVINCES = (
+    ("130000", "河北", "河北省", "hebei", 38.0428, 114.5149),
+    ("140000", "山西", "山西省", "shanxi", 37.8706, 112.5489),
+    ("150000", "内蒙古", "内蒙古自治区", "neimenggu", 40.8424, 111.7490),
+    ("210000", "辽宁", "辽宁省", "liaoning", 41.8057, 123.4315),
+    ("220000", "吉林", "吉林省", "jilin", 43.8171, 125.3235),
+    ("230000", "黑龙江", "黑龙江省", "heilongjiang", 45.8038, 126.5350),
+    ("320000", "江苏", "江苏省", "jiangsu", 32.0603, 118.7969),
+    ("330000", "浙江", "浙江省", "zhejiang", 30.2741, 120.1551),
+    ("340000", "安徽", "安徽省", "anhui", 31.8206, 117.2272),
+    ("350000", "福建", "福建省", "fujian", 26.0745, 119.2965),
+    ("360000", "江西", "江西省", "jiangxi", 28.6820, 115.8579),
+    ("370000", "山东", "山东省", "shandong", 36.6512, 117.1201),
+    ("410000", "河南", "河南省", "henan", 34.7466, 113.6254),
+    ("420000", "湖北", "湖北省", "hubei", 30.5928, 114.3055),
+    ("430000", "湖南", "湖南省", "hunan", 28.2282, 112.9388),
+    ("440000", "广东", "广东省", "guangdong", 23.1291, 113.2644),
+    ("450000", "广西", "广西壮族自治区", "guangxi", 22.8170, 108.3665),
+    ("460000", "海南", "海南省", "hainan", 20.0440, 110.1999),
+    ("510000", "四川", "四川省", "sichuan", 30.5728, 104.0668),
+    ("520000", "贵州", "贵州省", "guizhou", 26.6470, 106.6302),
+    ("530000", "云南", "云南省", "yunnan", 25.0389, 102.7183),
+    ("540000", "西藏", "西藏自治区", "xizang", 29.6500, 91.1000),
+    ("610000", "陕西", "陕西省", "shaanxi", 34.3416, 108.9398),
+    ("620000", "甘肃", "甘肃省", "gansu", 36.0611, 103.8343),
+    ("630000", "青海", "青海省", "qinghai", 36.6171, 101.7782),
+    ("640000", "宁夏", "宁夏回族自治区", "ningxia", 38.4872, 106.2309),
+    ("650000", "新疆", "新疆维吾尔自治区", "xinjiang", 43.8256, 87.6168),
+    ("710000", "台湾", "台湾省", "taiwan", 25.0330, 121.5654),
+)
+
+# (行政区划代码, 简称, 全称, 所属省级行政区, 拼音, 纬度, 经度)
+# 直辖市和特别行政区同时作为省级和市级，所属省级行政区为自身。
+# 拼音相同的城市（如苏州、宿州）只有排在前面的能通过拼音匹配。
+CITIES = (
+    ("110000", "北京", "北京市", "北京", "beijing", 39.9042, 116.4074),
+    ("310000", "上海", "上海市", "上海", "shanghai", 31.2304, 121.4737),
+    ("120000", "天津", "天津市", "天津", "tianjin", 39.3434, 117.3616),
+    ("500000", "重庆", "重庆市", "重庆", "chongqing", 29.5630, 106.5516),
+    ("810000", "香港", "香港特别行政区", "香港", "xianggang", 22.3193, 114.1694),
+    ("820000", "澳门", "澳门特别行政区", "澳门", "aomen", 22.1987, 113.5439),
+    # 河北
+    ("130100", "石家庄", "石家庄市", "河北", "shijiazhuang", 38.0428, 114.5149),
+    ("130200", "唐山", "唐山市", "河北", "tangshan", 39.6309, 118.1802),
+    ("130300", "秦皇岛", "秦皇岛市", "河北", "qinhuangdao", 39.9354, 119.6005),
+    ("130400", "邯郸", "邯郸市", "河北", "handan", 36.6256, 114.5391),
+    ("130600", "保定", "保定市", "河北", "baoding", 38.8739, 115.4646),
+    ("131000", "廊坊", "廊坊市", "河北", "langfang", 39.5186, 116.6831),
+    # 山西
+    ("140100", "太原", "太原市", "山西", "taiyuan", 37.8706, 112.5489),
+    ("140200", "大同", "大同市", "山西", "datong", 40.0769, 113.3001),
+    # 内蒙古
+    ("150100", "呼和浩特", "呼和浩特市", "内蒙古", "huhehaote", 40.8424, 111.7490),
+    ("150200", "包头", "包头市", "内蒙古", "baotou", 40.6574, 109.8403),
+    ("150600", "鄂尔多斯", "鄂尔多斯市", "内蒙古", "eerduosi", 39.6086, 109.7813),
+    ("150900", "乌兰察布", "乌兰察布市", "内蒙古", "wulanchabu", 41.0345, 113.1328),
+    # 辽宁
+    ("210100", "沈阳", "沈阳市", "辽宁", "shenyang", 41.8057, 123.4315),
+    ("210200", "大连", "大连市", "辽宁", "dalian", 38.9140, 121.6147),
+    ("210300", "鞍山", "鞍山市", "辽宁", "anshan", 41.1087, 122.9946),
+    # 吉林
+    ("220100", "长春", "长春市", "吉林", "changchun", 43.8171, 125.3235),
+    # 黑龙江
+    ("230100", "哈尔滨", "哈尔滨市", "黑龙江", "haerbin", 45.8038, 126.5350),
+    ("230600", "大庆", "大庆市", "黑龙江", "daqing", 46.5879, 125.1031),
+    # 江苏
+    ("320100", "南京", "南京市", "江苏", "nanjing", 32.0603, 118.7969),
+    ("320200", "无锡", "无锡市", "江苏", "wuxi", 31.4912, 120.3119),
+    ("320300", "徐州", "徐州市", "江苏", "xuzhou", 34.2044, 117.2860),
+    ("320400", "常州", "常州市", "江苏", "changzhou", 31.8106, 119.9740),
+    ("320500", "苏州", "苏州市", "江苏", "suzhou", 31.2990, 120.5853),
+    ("320583", "昆山", "昆山市", "江苏", "kunshan", 31.3856, 120.9807),
+    ("320600", "南通", "南通市", "江苏", "nantong", 31.9807, 120.8940),
+    ("320700", "连云港", "连云港市", "江苏", "lianyungang", 34.5967, 119.2216),
+    ("320800", "淮安", "淮安市", "江苏", "huaian", 33.6104, 119.0153),
+    ("320900", "盐城", "盐城市", "江苏", "yancheng", 33.3475, 120.1633),
+    ("321000", "扬州", "扬州市", "江苏", "yangzhou", 32.3942, 119.4129),
+    ("321100", "镇江", "镇江市", "江苏", "zhenjiang", 32.1877, 119.4250),
+    ("321200", "泰州", "泰州市", "江苏", "taizhou", 32.4558, 119.9229),
+    ("321300", "宿迁", "宿迁市", "江苏", "suqian", 33.9630, 118.2752),
+    # 浙江
+    ("330100", "杭州", "杭州市", "浙江", "hangzhou", 30.2741, 120.1551),
+    ("330200", "宁波", "宁波市", "浙江", "ningbo", 29.8683, 121.5440),
+    ("330300", "温州", "温州市", "浙江", "wenzhou", 28.0006, 120.6721),
+    ("330400", "嘉兴", "嘉兴市", "浙江", "jiaxing", 30.7522, 120.7550),
+    ("330500", "湖州", "湖州市", "浙江", "huzhou", 30.8930, 120.0868),
+    ("330600", "绍兴", "绍兴市", "浙江", "shaoxing", 30.0306, 120.5800),
+    ("330700", "金华", "金华市", "浙江", "jinhua", 29.0792, 119.6474),
+    ("330782", "义乌", "义乌市", "浙江", "yiwu", 29.3069, 120.0751),
+    ("331000", "台州", "台州市", "浙江", "taizhou", 28.6563, 121.4205),
+    # 安徽
+    ("340100", "合肥", "合肥市", "安徽", "hefei", 31.8206, 117.2272),
+    ("340200", "芜湖", "芜湖市", "安徽", "wuhu", 31.3526, 118.4331),
+    # 福建
+    ("350100", "福州", "福州市", "福建", "fuzhou", 26.0745, 119.2965),
+    ("350200", "厦门", "厦门市", "福建", "xiamen", 24.4798, 118.0894),
+    ("350300", "莆田", "莆田市", "福建", "putian", 25.4540, 119.0078),
+    ("350500", "泉州", "泉州市", "福建", "quanzhou", 24.8741, 118.6757),
+    ("350600", "漳州", "漳州市", "福建", "zhangzhou", 24.5130, 117.6475),
+    # 江西
+    ("360100", "南昌", "南昌市", "江西", "nanchang", 28.6820, 115.8579),
+    ("360400", "九江", "九江市", "江西", "jiujiang", 29.7051, 116.0019),
+    ("360700", "赣州", "赣州市", "江西", "ganzhou", 25.8312, 114.9348),
+    # 山东
+    ("370100", "济南", "济南市", "山东", "jinan", 36.6512, 117.1201),
+    ("370200", "青岛", "青岛市", "山东", "qingdao", 36.0671, 120.3826),
+    ("370300", "淄博", "淄博市", "山东", "zibo", 36.8131, 118.0548),
+    ("370600", "烟台", "烟台市", "山东", "yantai", 37.4638, 121.4479),
+    ("370700", "潍坊", "潍坊市", "山东", "weifang", 36.7069, 119.1618),
+    ("370800", "济宁", "济宁市", "山东", "jining", 35.4149, 116.5871),
+    ("371000", "威海", "威海市", "山东", "weihai", 37.5131, 122.1204),
+    ("371300", "临沂", "临沂市", "山东", "linyi", 35.1046, 118.3564),
+    # 河南
+    ("410100", "郑州", "郑州市", "河南", "zhengzhou", 34.7466, 113.6254),
+    ("410200", "开封", "开封市", "河南", "kaifeng", 34.7971, 114.3076),
+    ("410300", "洛阳", "洛阳市", "河南", "luoyang", 34.6197, 112.4540),
+    ("410700", "新乡", "新乡市", "河南", "xinxiang", 35.3030, 113.9268),
+    ("411300", "南阳", "南阳市", "河南", "nanyang", 32.9907, 112.5283),
+    # 湖北
+    ("420100", "武汉", "武汉市", "湖北", "wuhan", 30.5928, 114.3055),
+    ("420500", "宜昌", "宜昌市", "湖北", "yichang", 30.6918, 111.2865),
+    ("420600", "襄阳", "襄阳市", "湖北", "xiangyang", 32.0090, 112.1224),
+    # 湖南
+    ("430100", "长沙", "长沙市", "湖南", "changsha", 28.2282, 112.9388),
+    ("430200", "株洲", "株洲市", "湖南", "zhuzhou", 27.8274, 113.1340),
+    ("430300", "湘潭", "湘潭市", "湖南", "xiangtan", 27.8297, 112.9441),
+    ("430600", "岳阳", "岳阳市", "湖南", "yueyang", 29.3570, 113.1289),
+    ("433101", "吉首", "吉首市", "湖南", "jishou", 28.3142, 109.6981),
+    # 广东
+    ("440100", "广州", "广州市", "广东", "guangzhou", 23.1291, 113.2644),
+    ("440300", "深圳", "深圳市", "广东", "shenzhen", 22.5431, 114.0579),
+    ("440400", "珠海", "珠海市", "广东", "zhuhai", 22.2710, 113.5767),
+    ("440500", "汕头", "汕头市", "广东", "shantou", 23.3540, 116.6820),
+    ("440600", "佛山", "佛山市", "广东", "foshan", 23.0218, 113.1219),
+    ("440700", "江门", "江门市", "广东", "jiangmen", 22.5787, 113.0815),
+    ("440800", "湛江", "湛江市", "广东", "zhanjiang", 21.2707, 110.3594),
+    ("441200", "肇庆", "肇庆市", "广东", "zhaoqing", 23.0472, 112.4651),
+    ("441300", "惠州", "惠州市", "广东", "huizhou", 23.1116, 114.4158),
+    ("441800", "清远", "清远市", "广东", "qingyuan", 23.6820, 113.0560),
+    ("441900", "东莞", "东莞市", "广东", "dongguan", 23.0430, 113.7633),
+    ("442000", "中山", "中山市", "广东", "zhongshan", 22.5176, 113.3926),
+    ("445200", "揭阳", "揭阳市", "广东", "jieyang", 23.5497, 116.3728),
+    # 广西
+    ("450100", "南宁", "南宁市", "广西", "nanning", 22.8170, 108.3665),
+    ("450200", "柳州", "柳州市", "广西", "liuzhou", 24.3255, 109.4155),
+    ("450300", "桂林", "桂林市", "广西", "guilin", 25.2736, 110.2900),
+    # 海南
+    ("460100", "海口", "海口市", "海南", "haikou", 20.0440, 110.1999),
+    ("460200", "三亚", "三亚市", "海南", "sanya", 18.2528, 109.5119),
+    ("469023", "澄迈", "澄迈县", "海南", "chengmai", 19.7380, 110.0071),
+    # 四川
+    ("510100", "成都", "成都市", "四川", "chengdu", 30.5728, 104.0668),
+    ("510700", "绵阳", "绵阳市", "四川", "mianyang", 31.4675, 104.6796),
+    ("510900", "遂宁", "遂宁市", "四川", "suining", 30.5328, 105.5929),
+    ("511500", "宜宾", "宜宾市", "四川", "yibin", 28.7513, 104.6417),
+    # 贵州
+    ("520100", "贵阳", "贵阳市", "贵州", "guiyang", 26.6470, 106.6302),
+    ("520300", "遵义", "遵义市", "贵州", "zunyi", 27.7254, 106.9272),
+    ("520600", "铜仁", "铜仁市", "贵州", "tongren", 27.7183, 109.1896),
+    # 云南
+    ("530100", "昆明", "昆明市", "云南", "kunming", 25.0389, 102.7183),
+    # 西藏
+    ("540100", "拉萨", "拉萨市", "西藏", "lasa", 29.6500, 91.1000),
+    # 陕西
+    ("610100", "西安", "西安市", "陕西", "xian", 34.3416, 108.9398),
+    ("610300", "宝鸡", "宝鸡市", "陕西", "baoji", 34.3619, 107.2376),
+    ("610400", "咸阳", "咸阳市", "陕西", "xianyang", 34.3296, 108.7093),
+    # 甘肃
+    ("620100", "兰州", "兰州市", "甘肃", "lanzhou", 36.0611, 103.8343),
+    # 青海
+    ("630100", "西宁", "西宁市", "青海", "xining", 36.6171, 101.7782),
+    # 宁夏
+    ("640100", "银川", "银川市", "宁夏", "yinchuan", 38.4872, 106.2309),
+    # 新疆
+    ("650100", "乌鲁木齐", "乌鲁木齐市", "新疆", "wulumuqi", 43.8256, 87.6168),
+    # 台湾
+    ("710100", "台北", "台北市", "台湾", "taibei", 25.0330, 121.5654),
+)
+
+# 常见的英文名、缩写等别名：简称 -> 别名
+ALIASES = {
+    "北京": ("peking", "bj"),
+    "上海": ("sh",),
+    "广州": ("canton", "gz"),
+    "深圳": ("sz",),
+    "杭州": ("hz",),
+    "成都": ("cd",),
+    "香港": ("hongkong", "hk"),
+    "澳门": ("macau", "macao"),
+    "台北": ("taipei",),
+    "乌鲁木齐": ("urumqi",),
+    "呼和浩特": ("hohhot",),
+    "哈尔滨": ("harbin",),
+    "拉萨": ("lhasa",),
+    "内蒙古": ("innermongolia",),
+    "西藏": ("tibet",),
+}
+
+# (中文名, 英文名, 国家, 纬度, 经度)，国家一级的条目没有坐标
+FOREIGN = (
+    ("硅谷", "San Jose", "美国", 37.3382, -121.8863),
+    ("洛杉矶", "Los Angeles", "美国", 34.0522, -118.2437),
+    ("纽约", "New York", "美国", 40.7128, -74.0060),
+    ("西雅图", "Seattle", "美国", 47.6062, -122.3321),
+    ("华盛顿特区", "Washington DC", "美国", 38.9072, -77.0369),
+    ("圣地亚哥", "San Diego", "美国", 32.7157, -117.1611),
+    ("伦敦", "London", "英国", 51.5074, -0.1278),
+    ("莫斯科", "Moscow", "俄罗斯", 55.7558, 37.6173),
+    ("伊斯坦布尔", "Istanbul", "土耳其", 41.0082, 28.9784),
+    ("迪拜", "Dubai", "阿联酋", 25.2048, 55.2708),
+    ("新加坡", "Singapore", "新加坡", 1.3521, 103.8198),
+    ("东京", "Tokyo", "日本", 35.6762, 139.6503),
+    ("首尔", "Seoul", "韩国", 37.5665, 126.9780),
+    ("曼谷", "Bangkok", "泰国", 13.7563, 100.5018),
+    ("雅加达", "Jakarta", "印度尼西亚", -6.2088, 106.8456),
+    ("吉隆坡", "Kuala Lumpur", "马来西亚", 3.1390, 101.6869),
+    ("班加罗尔", "Bengaluru", "印度", 12.9716, 77.5946),
+    ("古尔冈", "Gurugram", "印度", 28.4595, 77.0266),
+    ("伊斯兰堡", "Islamabad", "巴基斯坦", 33.6844, 73.0479),
+    ("卡拉奇", "Karachi", "巴基斯坦", 24.8607, 67.0011),
+    ("拉合尔", "Lahore", "巴基斯坦", 31.5204, 74.3587),
+    ("达卡", "Dhaka", "孟加拉国", 23.8103, 90.4125),
+    ("加德满都", "Kathmandu", "尼泊尔", 27.7172, 85.3240),
+    ("科伦坡", "Colombo", "斯里兰卡", 6.9271, 79.8612),
+    ("圣保罗", "Sao Paulo", "巴西", -23.5505, -46.6333),
+    ("越南", "Viet Nam", "越南", None, None),
+    ("俄罗斯", "Russia", "俄罗斯", None, None),
+    ("埃及", "Egypt", "埃及", None, None),
+    ("墨西哥", "Mexico", "墨西哥", None, None),
+    ("阿根廷", "Argentina", "阿根廷", None, None),
+    ("哥伦比亚", "Colombia", "哥伦比亚", None, None),
+    ("秘鲁", "Peru", "秘鲁", None, None),
+    ("摩洛哥", "Morocco", "摩洛哥", None, None),
+)
@@ -1,8 +1,12 @@
 import json
 
+from .city_normalizer import city_normalizer
+from .code_dict import CodeDictRegistry, code_dicts
+
 
 class CityStandardizer:
-    def __init__(self):
+    def __init__(self, registry: CodeDictRegistry = code_dicts):
+        self.registry = registry
         self._raw_data = {
             "北京": ["beijing", "peking", "110000", "bj", "北京市"],
             "上海": ["shanghai", "310000", "sh", "上海市"],
@@ -24,6 +28,11 @@ class CityStandardizer:
             for variant in variants:
                 key = str(variant).lower().strip()
                 mapping[key] = standard_name
+        # 各平台城市字典中的代码（如快手的 "Wuxi"）作为补充，不覆盖上面的写法
+        for platform in self.registry.platforms():
+            for code, name in self.registry.get(platform).table("city").items():
+                mapping.setdefault(str(code).lower().strip(), name)
+                mapping.setdefault(name, name)
         return mapping
 
     def convert(self, input_val):
@@ -35,6 +44,11 @@ class CityStandardizer:
         if input_val is None:
             return None
 
+        # 优先使用完整的行政区划表，识别不了时再查下面的写法
+        division = city_normalizer.resolve(input_val)
+        if division is not None:
+            return division.name
+
         query_key = str(input_val).strip().lower()
 
         return self.lookup_map.get(query_key, input_val)  # 如果找不到返回 None
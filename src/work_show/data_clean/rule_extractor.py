@@ -0,0 +1,368 @@
+"""
+基于规则的职位信息提取
+
+经验要求和学历要求大多写得很规范（"3年以上相关工作经验"、"本科及以上学历"），关键词也大多是
+固定的技术名词，用正则和词表就能提取，不需要调用 LLM。RuleExtractor 对每个字段给出一个置信度，
+调用方只在置信度低于阈值时才请求 LLM。
+"""
+
+import re
+from dataclasses import dataclass, field
+
+# 与 LLM 提示词中的取值保持一致
+EXPERIENCE_LEVELS = (
+    "应届毕业生",
+    "0-1年",
+    "1-3年",
+    "3-5年",
+    "5-10年",
+    "10年以上",
+    "不限",
+)
+EDUCATION_LEVELS = ("专科", "本科", "硕士", "博士", "不限")
+
+# 来源给出的这些值等同于没有给出
+_UNKNOWN_VALUES = frozenset({"", "未知", "unknown", "None"})
+
+_CN_DIGITS = {"零": 0, "一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5}
+_CN_DIGITS.update({"六": 6, "七": 7, "八": 8, "九": 9, "十": 10})
+_NUMBER = r"(?<!\d)(\d{1,2}|[一二两三四五六七八九十]{1,2})"
+
+# 按句子切分，含有"优先"、"加分"的句子描述的是加分项而不是要求
+_CLAUSE_SPLIT = re.compile(r"[，,；;。！!\n]+")
+_BONUS = re.compile(r"优先|加分|更佳|为佳|plus|preferred", re.I)
+
+_EXP_UNLIMITED = re.compile(r"经验不限|不限经验|工作年限不限|无经验要求|接受无经验")
+_EXP_GRADUATE = re.compile(r"应届|\d{2,4}届|毕业生|在校生|校招|校园招聘")
+_EXP_RANGE = re.compile(_NUMBER + r"\s*(?:年\s*)?[-~～至到]\s*" + _NUMBER + r"\s*年")
+_EXP_MIN = re.compile(
+    _NUMBER + r"\s*(?:\+\s*年|年\s*\+|年以上|年及以上|年或以上|年(?=.{0,12}经验))"
+)
+_EXP_BELOW = re.compile(r"[1一]\s*年以[下内]")
+_EXP_ENGLISH = re.compile(r"(\d{1,2})\s*\+?\s*years?", re.I)
+# 经验年限附近出现这些词时才认为是对候选人的要求，排除"公司成立10年以上"之类
+_EXP_CONTEXT = re.compile(r"经验|工作|开发|从业|相关|experience", re.I)
+# 只说资深、专家等而没有给出年限时规则无法确定
+_SENIORITY = re.compile(r"资深|专家|高级|senior|expert|staff|principal", re.I)
+
+_EDU_UNLIMITED = re.compile(r"学历不限|不限学历|学历要求不限")
+# 按从低到高的顺序
+_EDU_PATTERNS = (
+    ("专科", re.compile(r"大专|专科|高职|associate", re.I)),
+    ("本科", re.compile(r"本科|学士|大学学历|bachelor|\bBS\b|\bB\.S\.", re.I)),
+    ("硕士", re.compile(r"硕士|研究生|master|\bMS\b|\bM\.S\.", re.I)),
+    ("博士", re.compile(r"博士|ph\.?d", re.I)),
+)
+_EDU_QUALIFIER = re.compile(r"以上|学历|学位|毕业|在读|degree", re.I)
+
+# 规范名称 -> 别名，名称本身也会被匹配；ASCII 别名不区分大小写
+TECH_TERMS: dict[str, tuple[str, ...]] = {
+    # 编程语言
+    "Python": (),
+    "Java": (),
+    "C++": ("cpp",),
+    "C": (),
+    "C#": ("csharp",),
+    "Go": ("golang",),
+    "Rust": (),
+    "JavaScript": ("js",),
+    "TypeScript": ("ts",),
+    "Kotlin": (),
+    "Swift": (),
+    "Objective-C": ("objc", "oc"),
+    "PHP": (),
+    "Scala": (),
+    "Shell": ("bash",),
+    "Lua": (),
+    "SQL": (),
+    "R": (),
+    "Dart": (),
+    # 前端与客户端
+    "React": ("reactjs", "react.js"),
+    "Vue": ("vuejs", "vue.js"),
+    "Angular": (),
+    "Node.js": ("nodejs", "node"),
+    "HTML": ("html5",),
+    "CSS": ("css3",),
+    "Webpack": (),
+    "小程序": ("微信小程序",),
+    "Flutter": (),
+    "React Native": ("rn",),
+    "Android": ("安卓",),
+    "iOS": (),
+    "HarmonyOS": ("鸿蒙",),
+    "Unity": ("unity3d",),
+    "Unreal": ("ue4", "ue5", "虚幻引擎"),
+    # 后端与框架
+    "Spring": ("spring boot", "springboot", "spring cloud", "springcloud"),
+    "MyBatis": (),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": (),
+    "gRPC": (),
+    "微服务": ("microservice", "microservices"),
+    "分布式系统": ("分布式",),
+    "高并发": (),
+    "RPC": (),
+    "Netty": (),
+    "JVM": (),
+    # 数据存储与中间件
+    "MySQL": (),
+    "PostgreSQL": ("postgres", "pgsql"),
+    "Oracle": (),
+    "Redis": (),
+    "MongoDB": ("mongo",),
+    "Elasticsearch": ("es", "elastic search"),
+    "HBase": (),
+    "ClickHouse": (),
+    "Kafka": (),
+    "RocketMQ": (),
+    "RabbitMQ": (),
+    "消息队列": ("mq",),
+    "数据库": (),
+    # 大数据
+    "Hadoop": (),
+    "Spark": (),
+    "Flink": (),
+    "Hive": (),
+    "数据仓库": ("数仓",),
+    "ETL": (),
+    "大数据": ("big data",),
+    # 基础设施
+    "Linux": (),
+    "Docker": (),
+    "Kubernetes": ("k8s",),
+    "云原生": ("cloud native",),
+    "DevOps": (),
+    "CI/CD": ("cicd",),
+    "Git": (),
+    "Nginx": (),
+    "TCP/IP": ("tcp", "tcp/ip协议"),
+    "网络安全": ("信息安全", "安全攻防"),
+    "操作系统": (),
+    "嵌入式": ("embedded",),
+    "FPGA": (),
+    "芯片": (),
+    # 算法与 AI
+    "机器学习": ("machine learning", "ml"),
+    "深度学习": ("deep learning", "dl"),
+    "强化学习": ("reinforcement learning", "rl"),
+    "自然语言处理": ("nlp", "natural language processing"),
+    # 不收录 "CV"：招聘文本里它更常指简历（"CV投递"）
+    "计算机视觉": ("computer vision",),
+    "大模型": ("llm", "大语言模型", "large language model"),
+    "AIGC": (),
+    "多模态": ("multimodal",),
+    "推荐系统": ("推荐算法", "recommender system"),
+    "搜索": ("搜索算法", "搜索引擎"),
+    "广告算法": ("计算广告",),
+    "语音识别": ("asr",),
+    "知识图谱": (),
+    "PyTorch": ("torch",),
+    "TensorFlow": ("tf",),
+    "CUDA": (),
+    "Transformer": ("transformers",),
+    "数据挖掘": ("data mining",),
+    "数据分析": ("data analysis",),
+    "数据结构": (),
+    "算法": (),
+    "自动驾驶": ("autonomous driving",),
+    "SLAM": (),
+    "图形学": ("图形渲染", "渲染"),
+    "音视频": ("音视频编解码", "ffmpeg", "webrtc"),
+    # 测试与其他
+    "自动化测试": ("测试自动化",),
+    "性能测试": (),
+    "Selenium": (),
+    "A/B测试": ("ab测试", "a/b test", "abtest"),
+    "Excel": (),
+    "Tableau": (),
+    "Figma": (),
+    "Photoshop": ("ps",),
+}
+
+# 一两个字母的别名（如 "R"、"C"、"ts"、"es"）误判太多，区分大小写，只匹配原写法和全大写，
+# 并且不能与 & 相连（"R&D"）
+_SHORT_ALIAS_LENGTH = 2
+_ASCII_BOUNDARY_BEFORE = r"(?<![A-Za-z0-9_+#])"
+_ASCII_BOUNDARY_AFTER = r"(?![A-Za-z0-9_+#])"
+_SHORT_BOUNDARY_BEFORE = r"(?<![A-Za-z0-9_+#&])"
+_SHORT_BOUNDARY_AFTER = r"(?![A-Za-z0-9_+#&])"
+# 单个字母后面紧跟汉字时多半是 "C端"、"B/C端" 之类的业务用语，只接受 "C语言" 这样的写法
+_LETTER_BOUNDARY_AFTER = _SHORT_BOUNDARY_AFTER + r"(?!(?!语言)[\u4e00-\u9fff])"
+
+
+def _to_int(value: str) -> int:
+    if value.isdigit():
+        return int(value)
+    if len(value) == 2:  # 十一、二十……
+        tens, ones = value
+        if tens == "十":
+            return 10 + _CN_DIGITS[ones]
+        return _CN_DIGITS[tens] * (10 if ones == "十" else 1)
+    return _CN_DIGITS[value]
+
+
+def _experience_level(years: int) -> str:
+    if years < 1:
+        return "0-1年"
+    if years < 3:
+        return "1-3年"
+    if years < 5:
+        return "3-5年"
+    if years < 10:
+        return "5-10年"
+    return "10年以上"
+
+
+def _build_term_pattern(terms: dict[str, tuple[str, ...]]):
+    lookup: dict[str, str] = {}
+    short_aliases: dict[str, set[str]] = {}
+    for name, aliases in terms.items():
+        for alias in (name, *aliases):
+            lookup.setdefault(alias.lower(), name)
+            if alias.isascii() and len(alias) <= _SHORT_ALIAS_LENGTH:
+                short_aliases.setdefault(alias.lower(), set()).update(
+                    (alias, alias.upper())
+                )
+    parts = []
+    for alias in sorted(lookup, key=len, reverse=True):
+        escaped = re.escape(alias)
+        if not alias.isascii():
+            parts.append(escaped)
+        elif len(alias) <= _SHORT_ALIAS_LENGTH:
+            spellings = "|".join(map(re.escape, short_aliases[alias]))
+            after = _LETTER_BOUNDARY_AFTER if len(alias) == 1 else _SHORT_BOUNDARY_AFTER
+            parts.append(_SHORT_BOUNDARY_BEFORE + f"(?-i:{spellings})" + after)
+        else:
+            parts.append(_ASCII_BOUNDARY_BEFORE + escaped + _ASCII_BOUNDARY_AFTER)
+    return re.compile("|".join(parts), re.I), lookup
+
+
+@dataclass
+class RuleExtraction:
+    """规则提取的结果，confidence 为每个字段的置信度（0~1）"""
+
+    experience_req: str = "不限"
+    education_req: str = "不限"
+    description_keywords: list[str] = field(default_factory=list)
+    requirement_keywords: list[str] = field(default_factory=list)
+    confidence: dict[str, float] = field(default_factory=dict)
+
+    def uncertain_fields(self, threshold: float) -> list[str]:
+        """置信度低于阈值、需要交给 LLM 的字段"""
+        return [name for name, score in self.confidence.items() if score < threshold]
+
+
+class RuleExtractor:
+    """
+    用正则提取经验和学历要求，用技术词表提取关键词。
+    min_keywords: 文本中匹配到的关键词少于这个数量时认为关键词不可信
+    """
+
+    def __init__(
+        self,
+        terms: dict[str, tuple[str, ...]] = TECH_TERMS,
+        min_keywords: int = 3,
+        max_keywords: int = 15,
+    ):
+        self.min_keywords = min_keywords
+        self.max_keywords = max_keywords
+        self._term_pattern, self._term_lookup = _build_term_pattern(terms)
+
+    def extract(
+        self,
+        description: str | None,
+        requirement: str | None,
+        experience_req: str | None = None,
+        education_req: str | None = None,
+    ) -> RuleExtraction:
+        """
+        提取经验要求、学历要求和两组关键词。
+        experience_req、education_req 为来源已经给出的值，有效时直接采用，置信度为 1。
+        """
+        description = description or ""
+        requirement = requirement or ""
+        # 要求大多写在 requirement 中，有些来源只有 description
+        text = f"{requirement}\n{description}"
+        result = RuleExtraction()
+
+        if _is_supplied(experience_req):
+            result.experience_req, score = experience_req, 1.0
+        else:
+            result.experience_req, score = self.extract_experience(text)
+        result.confidence["experience_req"] = score
+
+        if _is_supplied(education_req):
+            result.education_req, score = education_req, 1.0
+        else:
+            result.education_req, score = self.extract_education(text)
+        result.confidence["education_req"] = score
+
+        for name, value in (
+            ("description_keywords", description),
+            ("requirement_keywords", requirement),
+        ):
+            keywords = self.extract_keywords(value)
+            setattr(result, name, keywords)
+            enough = not value.strip() or len(keywords) >= self.min_keywords
+            result.confidence[name] = 0.9 if enough else 0.5
+        return result
+
+    def extract_experience(self, text: str) -> tuple[str, float]:
+        requirements = _requirement_clauses(text)
+        if _EXP_UNLIMITED.search(requirements):
+            return "不限", 0.95
+        for clause in _CLAUSE_SPLIT.split(requirements):
+            match = _EXP_RANGE.search(clause) or _EXP_MIN.search(clause)
+            if match is not None:
+                years = _to_int(match.group(1))
+                score = 0.95 if _EXP_CONTEXT.search(clause) else 0.6
+                return _experience_level(years), score
+            if _EXP_BELOW.search(clause):
+                return "0-1年", 0.9
+            match = _EXP_ENGLISH.search(clause)
+            if match is not None and _EXP_CONTEXT.search(clause):
+                return _experience_level(int(match.group(1))), 0.9
+        if _EXP_GRADUATE.search(requirements):
+            return "应届毕业生", 0.9
+        if _SENIORITY.search(text):
+            return "不限", 0.4
+        # 没有提到经验时与 LLM 的默认值一致
+        return "不限", 0.8
+
+    def extract_education(self, text: str) -> tuple[str, float]:
+        requirements = _requirement_clauses(text)
+        if _EDU_UNLIMITED.search(requirements):
+            return "不限", 0.95
+        for clause in _CLAUSE_SPLIT.split(requirements):
+            # 同一句中出现多个学历时取最低的，如"本科及以上"、"硕士或本科"
+            for level, pattern in _EDU_PATTERNS:
+                if pattern.search(clause):
+                    return level, 0.95 if _EDU_QUALIFIER.search(clause) else 0.7
+        return "不限", 0.8
+
+    def extract_keywords(self, text: str | None) -> list[str]:
+        """按出现顺序返回文本中的技术关键词，去重后最多 max_keywords 个"""
+        if not text:
+            return []
+        keywords: list[str] = []
+        for match in self._term_pattern.finditer(text):
+            name = self._term_lookup[match.group(0).lower()]
+            if name not in keywords:
+                keywords.append(name)
+                if len(keywords) >= self.max_keywords:
+                    break
+        return keywords
+
+
+def _is_supplied(value: str | None) -> bool:
+    return value is not None and str(value).strip() not in _UNKNOWN_VALUES
+
+
+def _requirement_clauses(text: str) -> str:
+    """去掉加分项的句子"""
+    return "\n".join(x for x in _CLAUSE_SPLIT.split(text) if not _BONUS.search(x))
+
+
+rule_extractor = RuleExtractor()
@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+import threading
+import yaml
+
+from ..core.models import Item
+from ..core.protocols import DedupResponse
+from ..utils.logger import get_logger
+from .set_deduplicator import SetDeduplicator
+
+logger = get_logger("DeduplicatorRegistry")
+
+
+@dataclass
+class _Partition:
+    """一个 source_platform 已经见过的 job_id，同一平台的所有数据源共用"""
+
+    st: set = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class PlatformDeduplicator(SetDeduplicator):
+    """
+    一个数据源实例（一个引擎）使用的去重器。
+    已经见过的 job_id 按 item.source_platform 存放在注册表的分区中，与存储层的去重范围一致，
+    同一平台的多个数据源（如快手的校招和社招）共用一个分区；连续重复计数属于这个数据源自己。
+    """
+
+    def __init__(self, registry: "DeduplicatorRegistry", max_consecutive_duplicates):
+        super().__init__(set(), max_consecutive_duplicates=max_consecutive_duplicates)
+        self._registry = registry
+        # merge_set 载入的指纹，不带平台信息，首次遇到某个平台时并入它的分区
+        self._fingerprints: set = set()
+        self._joined: dict[str, _Partition] = {}
+
+    def _join(self, source_platform: str) -> _Partition:
+        partition = self._joined.get(source_platform)
+        if partition is None:
+            partition = self._registry.partition(source_platform)
+            with partition.lock:
+                partition.st.update(self._fingerprints)
+            self._joined[source_platform] = partition
+        return partition
+
+    def check_status(self, item: Item) -> DedupResponse:
+        # 锁的顺序固定为先本去重器再分区，分区锁持有期间不会再获取其他锁
+        with self._lock:
+            partition = self._join(item.source_platform)
+            with partition.lock:
+                self.st = partition.st
+                return self._check_status(item)
+
+    def is_seen(self, item: Item) -> bool:
+        partition = self._registry.partition(item.source_platform)
+        with partition.lock:
+            return item.job_id in partition.st or item.job_id in self._fingerprints
+
+    def merge_set(self, st: set) -> None:
+        with self._lock:
+            self._fingerprints |= st
+            for partition in self._joined.values():
+                with partition.lock:
+                    partition.st.update(st)
+
+
+@dataclass
+class DeduplicatorRegistry:
+    """
+    按 source_platform 分区的去重器注册表。
+    每个数据源实例通过 new_deduplicator 获得自己的去重器（独立的连续重复计数和锁），
+    已经见过的 job_id 按平台分区共享，每个分区一把锁；注册表自身的锁只在创建分区时使用。
+    """
+
+    config_path: str = "./config/settings.yaml"
+    max_consecutive_duplicates: int | None = None
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._partitions: dict[str, _Partition] = {}
+        # 只读取一次配置，避免每个去重器各自打开配置文件
+        if self.max_consecutive_duplicates is None:
+            config = yaml.safe_load(open(self.config_path))
+            self.max_consecutive_duplicates = config["crawler"].get(
+                "max_consecutive_duplicates", 7
+            )
+
+    def partition(self, source_platform: str) -> _Partition:
+        """获取（不存在则创建）某个平台的分区"""
+        with self._lock:
+            partition = self._partitions.get(source_platform)
+            if partition is None:
+                partition = _Partition()
+                self._partitions[source_platform] = partition
+                logger.debug(f"Created deduplicator partition: {source_platform}")
+            return partition
+
+    def new_deduplicator(self) -> PlatformDeduplicator:
+        """为一个数据源实例创建去重器"""
+        return PlatformDeduplicator(self, self.max_consecutive_duplicates)
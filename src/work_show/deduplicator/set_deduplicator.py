@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from ..utils.logger import get_logger
 from ..core.models import Item
 from ..core.protocols import DedupAction, DedupResponse
-import random
+import threading
 import yaml
 
 logger = get_logger("SetDeduplicator")
@@ -13,14 +13,22 @@ class SetDeduplicator:
     st: set
     consecutive_dup: int = 0
     config_path: str = "./config/settings.yaml"
+    max_consecutive_duplicates: int | None = None
 
     def __post_init__(self):
-        config = yaml.safe_load(open(self.config_path))
-        self.max_consecutive_duplicates = config["crawler"].get(
-            "max_consecutive_duplicates", 7
-        )
+        # 每个实例一把锁，各数据源的去重器互不竞争
+        self._lock = threading.Lock()
+        if self.max_consecutive_duplicates is None:
+            config = yaml.safe_load(open(self.config_path))
+            self.max_consecutive_duplicates = config["crawler"].get(
+                "max_consecutive_duplicates", 7
+            )
 
     def check_status(self, item: Item) -> DedupResponse:
+        with self._lock:
+            return self._check_status(item)
+
+    def _check_status(self, item: Item) -> DedupResponse:
         if item.job_id == None or item.job_id == "":
             return DedupResponse(DedupAction.SKIP)  # 表示当前这个不需要，因为id无效
         if item.job_id in self.st:
@@ -33,8 +41,9 @@ class SetDeduplicator:
                     f"Feature Stop: Reached {self.consecutive_dup} consecutive duplicates. {item.source_platform} break"
                 )
                 return DedupResponse(DedupAction.STOP)  # 表示退出循环，停止爬取
-            if self.consecutive_dup >= 3 and self.consecutive_dup % 3 == 0:
-                skip_count = random.randint(0, self.consecutive_dup // 3)
+            if self.consecutive_dup >= 6 and self.consecutive_dup % 3 == 0:
+                # 确定性的跳页：重复越多跳得越远，但不会随机跳过新数据所在的页
+                skip_count = self.consecutive_dup // 3 - 1
                 return DedupResponse(DedupAction.SKIP_PAGES, args=skip_count)
             return DedupResponse(DedupAction.SKIP)
         else:
@@ -43,5 +52,9 @@ class SetDeduplicator:
             return DedupResponse(DedupAction.SAVE)  # 新数据，保存
         return DedupResponse(DedupAction.SAVE)  # 默认保存
 
+    def is_seen(self, item: Item) -> bool:
+        return item.job_id in self.st
+
     def merge_set(self, st: set) -> None:
-        self.st = self.st.union(st)
+        with self._lock:
+            self.st = self.st.union(st)
@@ -0,0 +1,50 @@
+from typing import Callable
+
+from ..utils.logger import get_logger
+
+logger = get_logger("BoundarySearch")
+
+
+def find_boundary_page(
+    has_unseen: Callable[[int], bool],
+    start_page: int = 1,
+    max_page: int = 1024,
+) -> int:
+    """
+    在按更新时间排序的分页列表中，查找最后一个包含未见过 id 的页号。
+
+    新数据总是集中在列表的前缀页中，因此先按 start_page + 2^k - 1 指数探测，
+    找到第一个不含新数据（或为空）的页，再在最后一个含新数据的页与它之间二分。
+    请求次数从 O(pages) 降为 O(log pages)。
+
+    :param has_unseen: 传入页号，返回该页是否含有未见过的 id（空页返回 False）
+    :param start_page: 起始页号
+    :param max_page: 探测的最大页号，防止无限翻页
+    :return: 边界页号；如果 start_page 就没有新数据，返回 start_page - 1
+    """
+    lo = start_page - 1  # 已知含新数据的最后一页（虚拟的起点）
+    hi = None  # 已知不含新数据的第一页
+    step = 1
+    probe = start_page
+    while probe <= max_page:
+        if has_unseen(probe):
+            lo = probe
+            probe = start_page + (step << 1) - 1
+            step <<= 1
+        else:
+            hi = probe
+            break
+    if hi is None:
+        # 探测到上限仍然有新数据，在上限范围内继续二分
+        if lo >= max_page:
+            return max_page
+        hi = max_page + 1
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if has_unseen(mid):
+            lo = mid
+        else:
+            hi = mid
+    logger.info(f"Boundary search finished, last page with new items: {lo}")
+    return lo
@@ -1,8 +1,19 @@
-from ..core.protocols import DataSource, DataStorage, Deduplicator, DedupAction
+from typing import Iterator
+from ..core.exceptions import LLMUnavailableError
+from ..core.models import Item
+from ..core.protocols import (
+    DataSource,
+    DataStorage,
+    Deduplicator,
+    DedupAction,
+    JobLifecycleStorage,
+    PagedDataSource,
+)
 from ..utils.logger import get_logger
 import random
-from ..data_clean import mapping_table
+from ..data_clean.city_normalizer import city_normalizer
 from ..deduplicator.set_deduplicator import SetDeduplicator
+from .boundary_search import find_boundary_page
 
 logger = get_logger("CrawlerEngine")
 
@@ -13,14 +24,45 @@ class CrawlerEngine:
         source: DataSource,
         storage: DataStorage,
         config: dict,
-        deduplicator: Deduplicator = SetDeduplicator(set()),
+        deduplicator: Deduplicator | None = None,
     ):
         self.source = source
         self.storage = storage
+        # 默认参数只会求值一次，必须在这里为每个引擎创建独立的去重器
+        if deduplicator is None:
+            deduplicator = SetDeduplicator(set())
         self.deduplicator = deduplicator
         # 从配置中读取熔断阈值
         self.max_consecutive_duplicates = config.get("max_consecutive_duplicates", 10)
         self.dedup_filters = config.get("dedup_filters", {})
+        # 支持按页跳转的数据源，使用边界查找代替逐页翻到重复阈值
+        self.boundary_search = config.get("boundary_search", True)
+        self.max_probe_page = config.get("max_probe_page", 1024)
+        self._bounded = False
+        # 完整遍历模式：忽略熔断和跳页，遍历结束后把这次没有看到的职位标记为已关闭
+        self.full_pass = config.get("full_pass", False)
+        # 不按页抓取的数据源，每攒够这么多个再次看到的职位批量刷新一次 last_seen
+        self.touch_batch_size = config.get("touch_batch_size", 100)
+        # 入库前把城市统一为行政区划表中的标准名称
+        self.normalize_city = config.get("normalize_city", True)
+        # 判定为新职位的先攒起来，攒够这么多个后打包成批量请求交给 LLM，结果写入缓存，
+        # 之后 extract_by_llm 逐个提取时直接命中缓存；0 表示不预取
+        self.llm_prefetch = config.get("llm_prefetch", 16)
+        self._prefetch_json_data = None
+        if self.llm_prefetch > 0:
+            try:
+                # call_llm 导入时读取配置文件并创建缓存，只在开启预取时才导入
+                from ..utils.call_llm import prefetch_json_data
+
+                self._prefetch_json_data = prefetch_json_data
+            except Exception as e:
+                logger.warning(f"LLM prefetch disabled: {e}")
+        self._lifecycle = isinstance(storage, JobLifecycleStorage)
+        self._pending_touch: list[tuple[str, str]] = []
+        # 已经判定为 SAVE、等待批量预取 LLM 结果的职位及其 DedupResponse.args
+        self._pending_saves: list[tuple[Item, object]] = []
+        # (source_platform, work_type) -> 本次看到的 job_id，只在完整遍历模式下记录
+        self._seen: dict[tuple[str, str | None], set[str]] = {}
         self.total_saved = 0
         self._register_handlers()
         self.deduplicator.merge_set(
@@ -48,6 +90,8 @@ class CrawlerEngine:
             item = self.source.extract_by_llm(item)
             if not item:
                 pass
+            if self.normalize_city and item.city is not None:
+                item.city = city_normalizer.normalize(item.city)
             self.storage.save(item)
             self.total_saved += 1
             logger.info(f"{self.source.__class__.__name__}写入成功")
@@ -55,6 +99,12 @@ class CrawlerEngine:
                 logger.info(
                     f"Progress: Saved {self.total_saved} items..., Source: {item.source_platform}"
                 )
+        except LLMUnavailableError as e:
+            # 不保存未提取的职位，下次运行时它仍是新职位，会再次提取
+            logger.error(
+                f"Skip item {item.job_id}, source: {item.source_platform}, "
+                f"LLM unavailable: {e}"
+            )
         except Exception as e:
             logger.error(
                 f"Failed to save item {item.job_id}, source: {item.source_platform}: {e}"
@@ -66,6 +116,9 @@ class CrawlerEngine:
 
     @dedup_action(DedupAction.STOP)
     def _action_stop(self, item, args=None):
+        if self._bounded or self.full_pass:
+            # 已经通过边界查找确定了要爬的页，或者需要完整遍历列表，连续重复不再意味着应当停止
+            return
         logger.warning(
             f"Stop signal received. Stopping crawling at item {item.job_id}."
         )
@@ -73,32 +126,159 @@ class CrawlerEngine:
 
     @dedup_action(DedupAction.SKIP_PAGES)
     def _action_skip_pages(self, item, args=None):
+        if self._bounded or self.full_pass:
+            return
         if args is not None and isinstance(args, int) and args > 0:
             logger.info(
                 f"Consecutive duplicates detected. Skipping {args} pages. Source: {item.source_platform}"
             )
             self.source.skip_pages(args)
 
+    def _iter_paged_items(self) -> Iterator[Item]:
+        """
+        先用边界查找确定最后一个含有新数据的页，再顺序处理 start_page 到该页。
+        探测过程中抓到的页会被缓存，不会重复请求。
+        """
+        pages: dict[int, list[Item]] = {}
+
+        def get_page(n: int) -> list[Item]:
+            if n not in pages:
+                pages[n] = self.source.fetch_page(n)
+            return pages[n]
+
+        def has_unseen(n: int) -> bool:
+            return any(
+                item.job_id and not self.deduplicator.is_seen(item)
+                for item in get_page(n)
+            )
+
+        start_page = self.source.start_page
+        boundary = find_boundary_page(
+            has_unseen, start_page=start_page, max_page=self.max_probe_page
+        )
+        logger.info(
+            f"{type(self.source).__name__}: crawling pages {start_page}..{boundary}"
+        )
+        for n in range(start_page, boundary + 1):
+            yield from get_page(n)
+            pages.pop(n, None)
+            self._flush_touch()
+
+    def _iter_items(self) -> Iterator[Item]:
+        self._bounded = (
+            self.boundary_search
+            and not self.full_pass
+            and isinstance(self.source, PagedDataSource)
+        )
+        if self._bounded:
+            return self._iter_paged_items()
+        return self.source.fetch_items()
+
+    def _prefetch_llm(self, items: list[Item]) -> None:
+        """批量预取待保存职位的 LLM 提取结果，失败只记录日志，逐个提取时会再请求"""
+        jobs = [
+            (
+                item.job_id,
+                item.description,
+                item.requirement,
+                item.experience_req,
+                item.education_req,
+            )
+            for item in items
+        ]
+        try:
+            self._prefetch_json_data(jobs)
+        except Exception as e:
+            logger.error(f"Failed to prefetch LLM results of {len(jobs)} jobs: {e}")
+
+    def _flush_saves(self) -> None:
+        """为攒下的待保存职位批量预取 LLM 结果，再依次保存"""
+        if not self._pending_saves:
+            return
+        pending, self._pending_saves = self._pending_saves, []
+        self._prefetch_llm([item for item, _ in pending])
+        for item, args in pending:
+            self._handle(item, DedupAction.SAVE, args)
+
+    def _handle(self, item: Item, action: DedupAction, args=None):
+        handler = self._handlers.get(action)
+        if not handler:
+            logger.warning(f"Unknown dedup action: {action}")
+            return None
+        result = handler(item, args)
+        self._record_seen(item, action)
+        return result
+
     @dedup_action(DedupAction.UPDATE)
     def _action_update(self, item, args=None):
         pass
 
+    def _record_seen(self, item: Item, action: DedupAction) -> None:
+        """记录本次看到的职位；新职位写入时已经带上 last_seen，只有重复的职位需要 touch"""
+        if not self._lifecycle or not item.job_id:
+            return
+        if action != DedupAction.SAVE:
+            self._pending_touch.append((item.source_platform, item.job_id))
+        if self.full_pass:
+            scope = (item.source_platform, item.work_type)
+            self._seen.setdefault(scope, set()).add(item.job_id)
+
+    def _flush_touch(self) -> None:
+        """批量刷新 last_seen，失败只记录日志，不影响爬取"""
+        if not self._pending_touch:
+            return
+        keys, self._pending_touch = self._pending_touch, []
+        try:
+            self.storage.touch(keys)
+        except Exception as e:
+            logger.error(f"Failed to touch {len(keys)} jobs: {e}")
+
+    def _close_unseen(self) -> None:
+        """完整遍历结束后，按 (source_platform, work_type) 把没有再看到的职位标记为已关闭"""
+        for (platform, work_type), seen_ids in self._seen.items():
+            filters = {"source_platform": platform, "work_type": work_type}
+            try:
+                self.storage.mark_closed(seen_ids, filters)
+            except Exception as e:
+                logger.error(f"Failed to mark closed jobs, scope: {filters}: {e}")
+
     def run(self):
         self.total_saved = 0
+        self._seen = {}
+        completed = False
         logger.info(f"Start crawling from source: {type(self.source).__name__}")
+        self._pending_saves = []
         try:
-            for item in self.source.fetch_items():
+            # 每次只读取一个职位并立即判定，STOP 和 SKIP_PAGES 不会因为预取而推迟生效；
+            # 开启预取时判定为 SAVE 的职位先攒起来，攒够 llm_prefetch 个或遇到 STOP、SKIP_PAGES 时
+            # 一次批量请求 LLM，再按原来的顺序保存
+            for item in self._iter_items():
                 dedup_response = self.deduplicator.check_status(item)
-                handler = self._handlers.get(dedup_response.action)
-
-                if handler:
-                    result = handler(item, dedup_response.args)
-                    if result == "STOP":
-                        break
-                else:
-                    logger.warning(f"Unknown dedup action: {dedup_response.action}")
+                action = dedup_response.action
+                if action == DedupAction.SAVE and self._prefetch_json_data is not None:
+                    self._pending_saves.append((item, dedup_response.args))
+                    if len(self._pending_saves) >= self.llm_prefetch:
+                        self._flush_saves()
+                    continue
+                if action in (DedupAction.STOP, DedupAction.SKIP_PAGES):
+                    self._flush_saves()
+                if self._handle(item, action, dedup_response.args) == "STOP":
+                    break
+                if len(self._pending_touch) >= self.touch_batch_size:
+                    self._flush_touch()
+            else:
+                completed = True
 
         except Exception as e:
             logger.critical(f"Critical Engine Error: {e}")
         finally:
+            # 已经判定为新职位的不能丢下，否则本次运行中它们不会再被保存
+            try:
+                self._flush_saves()
+            except Exception as e:
+                logger.error(f"Failed to save pending items: {e}")
+            self._flush_touch()
+            # 只有完整、无异常地遍历了整个列表，集合差才意味着职位已经下线
+            if completed and self.full_pass and self._lifecycle:
+                self._close_unseen()
             logger.info(f"Crawling finished. Total new items: {self.total_saved}")
@@ -3,57 +3,146 @@ from typing import Iterator
 import pandas as pd
 from ..core.protocols import DataStorage
 from ..core.models import Item
+from ..core.schema import compile_schema
+from .jsonl_index import JsonlOffsetIndex
 import json
 from typing import Any
 
+# jsonl 中每一行的字段映射，批量导入时也使用这个映射
+JSONL_SCHEMA = {
+    "job_id": "$.id",
+    "company_name": None,
+    "source_platform": "$.channelCode",
+    "job_url": None,
+    "title": "$.name",
+    "city": "$.workLocationCode",
+    "category": "$.positionCategoryCode",
+    "experience_req": "$.workExperienceCode",
+    "education_req": "$.educationLimitCode",
+    "job_level": "$.level",
+    "salary_min": "$.salaryMin",
+    "salary_max": "$.salaryMax",
+    "description": "$.description",
+    "requirement": "$.positionDemand",
+    "publish_date": "$.updateTime",
+    "crawl_date": None,
+    "extra_info": {
+        "applyNum": "$.applyNum",
+        "entryNum": "$.entryNum",
+        "recruitProjectCode": "$.recruitProjectCode",
+        "positionNatureCode": "$.positionNatureCode",
+        "ifSecret": "$.ifSecret",
+        "headCountUsed": "$.headCountUsed",
+        "workLocationsCode": "$.workLocationsCode",
+        "departmentCode": "$.departmentCode",
+    },
+}
+
+
+_COMPILED_SCHEMA = compile_schema(JSONL_SCHEMA)
+
+
+def transform_record(record: dict) -> Item:
+    return Item.transform_with_jsonpath(_COMPILED_SCHEMA, record)
+
 
 @dataclass
 class FileJsonlSource:
-    """从jsonl里面读取数据"""
+    """
+    从jsonl里面读取数据，跳页时通过偏移索引直接 seek。
+    开启 resume 时在旁边维护 <文件名>.offsets.json：再次运行时从上次处理到的位置继续，
+    追加的数据只需要读取新增部分。指定 byte_range 时只读取该字节区间，用于多个读取者并行处理同一个文件。
+    """
 
     jsonl_file_path: str
+    # 从上次处理到的位置继续，并把偏移索引保存到文件旁边；默认每次从头读取，不写任何文件
+    resume: bool = False
+    # 每隔多少行记录一次字节偏移
+    index_stride: int = 1000
+    # 只读取 [start, end) 字节区间，区间边界需要在行首（见 jsonl_index.byte_ranges）
+    byte_range: tuple[int, int] | None = None
     _skip_count = 0
 
     def skip_pages(self, n) -> None:
         self._skip_count += n
 
-    def fetch_items(self) -> Iterator[Item]:
-        schema_dict = {
-            "job_id": "$.id",
-            "company_name": None,
-            "source_platform": "$.channelCode",
-            "job_url": None,
-            "title": "$.name",
-            "department": "$.departmentCode",
-            "city": "$.workLocationCode",
-            "category": "$.positionCategoryCode",
-            "experience_req": "$.workExperienceCode",
-            "education_req": "$.educationLimitCode",
-            "job_level": "$.level",
-            "salary_min": "$.salaryMin",
-            "salary_max": "$.salaryMax",
-            "description": "$.description",
-            "requirement": "$.positionDemand",
-            "publish_date": "$.updateTime",
-            "crawl_date": None,
-            "extra_info": {
-                "applyNum": "$.applyNum",
-                "entryNum": "$.entryNum",
-                "recruitProjectCode": "$.recruitProjectCode",
-                "positionNatureCode": "$.positionNatureCode",
-                "ifSecret": "$.ifSecret",
-                "headCountUsed": "$.headCountUsed",
-                "workLocationsCode": "$.workLocationsCode",
-            },
-        }
-        with open(self.jsonl_file_path, mode="r", encoding="utf-8") as f:
-            for data_raw_str in f.readlines():
+    def _iter_range(self, start: int, end: int) -> Iterator[Item]:
+        with open(self.jsonl_file_path, mode="rb") as f:
+            f.seek(start)
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
                 if self._skip_count > 0:
                     self._skip_count -= 1
                     continue
-                data_raw_dict = json.loads(data_raw_str)
-                t = Item.transform_with_jsonpath(schema_dict, data_raw_dict)
-                yield t
+                if line.strip():
+                    yield transform_record(json.loads(line))
+
+    def fetch_items(self) -> Iterator[Item]:
+        if self.byte_range is not None:
+            yield from self._iter_range(*self.byte_range)
+            return
+        index = JsonlOffsetIndex.load(self.jsonl_file_path, self.index_stride)
+        line_no, offset = 0, 0
+        if self.resume:
+            line_no, offset = index.imported_line, index.imported_offset
+        with open(self.jsonl_file_path, mode="rb") as f:
+            f.seek(offset)
+            # 调用方取下一条时才算处理完上一条，只记录已经处理完的位置
+            committed = (line_no, offset)
+            try:
+                while True:
+                    if self._skip_count > 0:
+                        target = line_no + self._skip_count
+                        self._skip_count = 0
+                        # 先跳到索引中最近的位置，剩下不足一个步长的行逐行跳过
+                        indexed_line, indexed_offset = index.seek_line(target)
+                        if indexed_line > line_no:
+                            f.seek(indexed_offset)
+                            line_no, offset = indexed_line, indexed_offset
+                        while line_no < target:
+                            line = f.readline()
+                            if not line.endswith(b"\n"):
+                                f.seek(offset)
+                                break
+                            index.record_line(line_no, offset, offset + len(line))
+                            line_no, offset = line_no + 1, offset + len(line)
+                        committed = (line_no, offset)
+                        continue
+                    line = f.readline()
+                    if not line:
+                        break
+                    record = None
+                    if line.strip():
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            # 没有换行结尾的最后一行可能还在写入，留到下次再读
+                            if not line.endswith(b"\n"):
+                                break
+                            raise
+                    index.record_line(line_no, offset, offset + len(line))
+                    line_no, offset = line_no + 1, offset + len(line)
+                    if record is not None:
+                        yield transform_record(record)
+                    committed = (line_no, offset)
+                    if line_no % index.stride == 0:
+                        self._save_index(index, *committed)
+            except GeneratorExit:
+                # 调用方提前结束（如去重判定 STOP，或处理某一条时出错），
+                # 最后取出的一条没有确认处理完，下次从它开始
+                self._save_index(index, *committed)
+                raise
+            # 读取出错时不保存，下次从上一次保存的位置重新读取
+            self._save_index(index, *committed)
+
+    def _save_index(self, index: JsonlOffsetIndex, line_no: int, offset: int) -> None:
+        # 只有续读模式才记录读取位置并写入索引文件，从头读取时索引只在内存中使用
+        if not self.resume:
+            return
+        index.imported_line, index.imported_offset = line_no, offset
+        index.save()
 
     def fetch_all_fingerprints(
         self, data_storage: DataStorage, filters: dict[str, Any] | None = None
@@ -0,0 +1,107 @@
+"""
+jsonl 文件的字节偏移索引
+
+索引保存在数据文件旁边的 <文件名>.offsets.json 中，每 stride 行记录一次该行起始的字节偏移，
+并记录上次读取到的位置。跳过若干行或者从上次的位置继续读取时可以直接 seek，
+追加写入的数据只需要读取新增的字节；多个读取者也可以按行边界把文件切分成若干字节区间并行读取。
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+
+INDEX_SUFFIX = ".offsets.json"
+# 用文件开头的这么多字节判断文件是否被整体替换（而不是追加）
+_HEAD_BYTES = 4096
+
+
+def _file_head(path: str, size: int) -> str:
+    """文件开头 min(size, _HEAD_BYTES) 个字节的哈希，追加写入不会改变它"""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read(min(size, _HEAD_BYTES))).hexdigest()
+
+
+@dataclass
+class JsonlOffsetIndex:
+    path: str
+    stride: int = 1000
+    # offsets[k] 为第 k * stride 行（从 0 开始）的起始字节偏移
+    offsets: list[int] = field(default_factory=list)
+    # 已经建立索引的完整行数，以及最后一个已索引行的结束偏移
+    lines: int = 0
+    indexed_bytes: int = 0
+    # 上次读取到的位置：下一行的行号和字节偏移
+    imported_line: int = 0
+    imported_offset: int = 0
+    head: str = ""
+
+    @property
+    def index_path(self) -> str:
+        return self.path + INDEX_SUFFIX
+
+    @classmethod
+    def load(cls, path: str, stride: int = 1000) -> "JsonlOffsetIndex":
+        """
+        读取索引文件。索引不存在、步长不同、数据文件变短或开头内容变化（说明被重写而不是追加）时，
+        返回一个空索引，从头开始读取。
+        """
+        fresh = cls(path=path, stride=stride)
+        try:
+            with open(fresh.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            index = cls(**{**data, "path": path})
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return fresh
+        if index.stride != stride or not os.path.exists(path):
+            return fresh
+        if os.path.getsize(path) < index.indexed_bytes:
+            return fresh
+        if _file_head(path, index.indexed_bytes) != index.head:
+            return fresh
+        return index
+
+    def save(self) -> None:
+        self.head = _file_head(self.path, self.indexed_bytes)
+        data = asdict(self)
+        data.pop("path")
+        # 先写临时文件再替换，避免中断时留下不完整的索引
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.index_path)
+
+    def record_line(self, line_no: int, start: int, end: int) -> None:
+        """记录读到的一行，只有紧接着已索引部分的行才会扩展索引"""
+        if line_no != self.lines:
+            return
+        if line_no % self.stride == 0:
+            self.offsets.append(start)
+        self.lines += 1
+        self.indexed_bytes = end
+
+    def seek_line(self, line_no: int) -> tuple[int, int]:
+        """返回不超过 line_no 的最近一个已索引行的 (行号, 字节偏移)"""
+        if not self.offsets:
+            return 0, 0
+        k = min(line_no // self.stride, len(self.offsets) - 1)
+        return k * self.stride, self.offsets[k]
+
+
+def byte_ranges(path: str, parts: int) -> list[tuple[int, int]]:
+    """
+    把文件按行边界切分为至多 parts 个字节区间 [start, end)，
+    每个区间可以由独立的读取者（如多个 FileJsonlSource）处理。
+    """
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts - 1, bounds[-1]))
+            f.readline()  # 对齐到下一行的开头
+            pos = min(f.tell(), size)
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
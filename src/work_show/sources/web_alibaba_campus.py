@@ -165,10 +165,12 @@ class WebAlibabaCampusSource:
                         job_id=str(item.get("id", uuid.uuid4())),
                         company_name="阿里巴巴",
                         source_platform="阿里官网",
-                        work_type="实习"
-                        if item.get("batchName", "")
-                        and "实习" in item.get("batchName", "")
-                        else "校招",
+                        work_type=(
+                            "实习"
+                            if item.get("batchName", "")
+                            and "实习" in item.get("batchName", "")
+                            else "校招"
+                        ),
                         job_url=f"https://talent-holding.alibaba.com/campus/position-detail?lang=zh&positionId={str(item.get('id', ''))}",
                         title=item.get("name", ""),
                         city=item.get("workLocations", ""),
@@ -197,7 +199,9 @@ class WebAlibabaCampusSource:
             item.education_req,
             item.description_keywords,
             item.requirement_keywords,
-        ) = get_json_data(item.description, item.requirement)
+        ) = get_json_data(
+            item.description, item.requirement, item.experience_req, item.education_req
+        )
         return item
 
     def fetch_all_fingerprints(
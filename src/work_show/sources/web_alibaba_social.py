@@ -14,7 +14,6 @@ from rich import inspect
 import requests
 import uuid
 
-
 home_url = "https://talent-holding.alibaba.com/off-campus/position-list?lang=zh"
 
 
@@ -165,7 +164,9 @@ class WebAlibabaSocialSource:
             item.education_req,
             item.description_keywords,
             item.requirement_keywords,
-        ) = get_json_data(item.description, item.requirement)
+        ) = get_json_data(
+            item.description, item.requirement, item.experience_req, item.education_req
+        )
         return item
 
     def fetch_all_fingerprints(
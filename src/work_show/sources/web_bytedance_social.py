@@ -2,6 +2,7 @@ from DrissionPage import WebPage
 from dataclasses import dataclass
 from typing import Iterator
 from ..core.models import Item
+from ..core.transform import FieldRule, TransformSpec, transform_batch
 from ..utils.call_llm import get_json_data
 import json
 import time
@@ -12,6 +13,50 @@ from typing import Any
 from datetime import datetime
 from rich import inspect
 
+# 映射表和转换规则与页码无关，在导入时编译一次
+_SCHEMA = {
+    "job_id": "$.id",
+    "company_name": None,
+    "source_platform": None,
+    "work_type": "$.recruit_type.name",
+    "job_url": None,
+    "title": "$.title",
+    "city": "$.city_info.name",
+    "category": "$.job_category.name",
+    "experience_req": "$.job_post_info.experience",
+    "education_req": "$.job_post_info.education",
+    "job_level": None,
+    "salary_min": None,
+    "salary_max": None,
+    "description": "$.description",
+    "requirement": "$.requirement",
+    "publish_date": "$.publish_time",
+    "crawl_date": None,
+    "extra_info": {
+        "work_type": "$.recruit_type.parent.name",
+        "city_info": "$.city_info",
+        "job_subject": "$.job_subject",
+        "city_list": "$.city_list",
+    },
+}
+
+_SPEC = TransformSpec(
+    schema=_SCHEMA,
+    rules={
+        "job_url": FieldRule(
+            template="https://jobs.bytedance.com/experienced/position/{job_id}/detail"
+        ),
+        "city": FieldRule(source="extra_info.city_list", pluck="name", as_list=True),
+        "publish_date": FieldRule(divide=1000),
+        "job_id": FieldRule(cast=str),
+    },
+    constants={
+        "source_platform": "字节官网",
+        "company_name": "字节跳动",
+        "work_type": "社招",
+    },
+)
+
 
 @dataclass
 class WebByteDanceSocialSource:
@@ -20,73 +65,41 @@ class WebByteDanceSocialSource:
 
     def __post_init__(self):
         self._skip_count = 0
+        self._tab = None
 
     def skip_pages(self, n: int):
         self._skip_count += n
 
+    def fetch_page(self, n: int) -> list[Item]:
+        """获取第 n 页的职位，引擎可以借此按页号跳转"""
+        if self._tab is None:
+            self._tab = self.web_page.new_tab()
+            self._tab.listen.start("api/v1/search/job/posts")
+        else:
+            time.sleep(1 + random.random() * 20)
+        p = self._tab
+
+        # TODO 招聘字节的社招 https://jobs.bytedance.com/experienced/position
+        p.get(
+            f"https://jobs.bytedance.com/experienced/position?keywords=&category=&location=&project=&type=&job_hot_flag=&current={n}&limit=20&functionCategory=&tag="
+        )
+        res = p.listen.wait()
+        res_list = res.response.body.get("data")["job_post_list"]
+        return transform_batch(res_list, _SPEC)
+
     def fetch_items(self) -> Iterator[Item]:
-        p = self.web_page.new_tab()
-        p.listen.start("api/v1/search/job/posts")
         i = self.start_page
-        schema_dict = {
-            "job_id": "$.id",
-            "company_name": None,
-            "source_platform": None,
-            "work_type": "$.recruit_type.name",
-            "job_url": None,
-            "title": "$.title",
-            "city": "$.city_info.name",
-            "category": "$.job_category.name",
-            "experience_req": "$.job_post_info.experience",
-            "education_req": "$.job_post_info.education",
-            "job_level": None,
-            "salary_min": None,
-            "salary_max": None,
-            "description": "$.description",
-            "requirement": "$.requirement",
-            "publish_date": "$.publish_time",
-            "crawl_date": None,
-            "extra_info": {
-                "work_type": "$.recruit_type.parent.name",
-                "city_info": "$.city_info",
-                "job_subject": "$.job_subject",
-                "city_list": "$.city_list",
-            },
-        }
-
         while True:
-            # TODO 招聘字节的社招 https://jobs.bytedance.com/experienced/position
-            p.get(
-                f"https://jobs.bytedance.com/experienced/position?keywords=&category=&location=&project=&type=&job_hot_flag=&current={i}&limit=20&functionCategory=&tag="
-            )
-            res = p.listen.wait()
-            res_list = res.response.body.get("data")["job_post_list"]
-            if len(res_list) == 0:
+            items = self.fetch_page(i)
+            if len(items) == 0:
                 break
-            for item in res_list:
-                t = Item.transform_with_jsonpath(schema_dict, item)
-                t.source_platform = "字节官网"
-                t.company_name = "字节跳动"
-                if t.job_url == None or t.job_url == "":
-                    t.job_url = f"https://jobs.bytedance.com/experienced/position/{t.job_id}/detail"
-                t.crawl_date = int(time.time())
-                if t.extra_info and "city_list" in t.extra_info:
-                    t.city = [x["name"] for x in t.extra_info["city_list"]]
-                else:
-                    t.city = [t.city]
-                try:
-                    t.publish_date = t.publish_date // 1000
-                except Exception as e:
-                    pass
-                t.work_type = "社招"
-                t.job_id = str(t.job_id)
+            for t in items:
                 yield t
                 if self._skip_count > 0:
                     i += self._skip_count
                     self._skip_count = 0
                     break
             i += 1
-            time.sleep(1 + random.random() * 20)
         return "没有任何数据了"
 
     def extract_by_llm(self, item: Item) -> Item:
@@ -96,7 +109,9 @@ class WebByteDanceSocialSource:
             item.education_req,
             item.description_keywords,
             item.requirement_keywords,
-        ) = get_json_data(item.description, item.requirement)
+        ) = get_json_data(
+            item.description, item.requirement, item.experience_req, item.education_req
+        )
         return item
 
     def fetch_all_fingerprints(
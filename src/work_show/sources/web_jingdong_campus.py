@@ -147,7 +147,9 @@ class WebJingdongCampusSource:
             item.education_req,
             item.description_keywords,
             item.requirement_keywords,
-        ) = get_json_data(item.description, item.requirement)
+        ) = get_json_data(
+            item.description, item.requirement, item.experience_req, item.education_req
+        )
         return item
 
     def fetch_all_fingerprints(
@@ -2,6 +2,7 @@ from DrissionPage import ChromiumPage
 from dataclasses import dataclass
 from typing import Iterator
 from ..core.models import Item
+from ..core.transform import FieldRule, TransformSpec, transform_batch
 from ..utils.call_llm import get_json_data
 import json
 import time
@@ -11,24 +12,11 @@ from ..core.protocols import DataStorage
 from typing import Any
 from datetime import datetime
 from rich import inspect
+from functools import partial
+from ..data_clean.code_dict import code_dicts
+from .web_kuaishou_social import fetch_code_dicts
 
-
-def get_mapping_table():
-    mp = {}
-    p2 = Chromium()
-    p2.listen.start(
-        "api/v1/dictionary/batch?types=workLocation,positionCategory,positionExperience,positionNature"
-    )
-    p2.get(f"https://zhaopin.kuaishou.cn/recruit/e/#/official/social/job-info/28457")
-    res = p2.listen.wait()
-    res_key_list = res.response.body.get("result")
-    for item in res_key_list:
-        res_list = res_key_list[item]
-        for item_info in res_list:
-            mp[item_info["code"]] = item_info["name"]
-    with open("test2.json", mode="w", encoding="utf-8") as f:
-        f.write(json.dumps(mp, ensure_ascii=False, indent=2))
-    p2.disconnect()
+CODE_DICT_PLATFORM = "kuaishou_campus"
 
 
 @dataclass
@@ -38,6 +26,14 @@ class WebKuaishouCampusSource:
 
     def __post_init__(self):
         self._skip_count = 0
+        code_dicts.register_fetcher(
+            CODE_DICT_PLATFORM,
+            partial(
+                fetch_code_dicts,
+                self.web_page,
+                "https://campus.kuaishou.cn/recruit/campus/e/#/campus/jobs",
+            ),
+        )
 
     def skip_pages(self, n: int):
         self._skip_count += n
@@ -73,8 +69,35 @@ class WebKuaishouCampusSource:
                 "workLocationsCode": "$.workLocationDicts",
             },
         }
-        mp = json.loads(mapping_table)
+        codes = code_dicts.refresh(CODE_DICT_PLATFORM)
         work_type = "intern"
+        spec = TransformSpec(
+            schema=schema_dict,
+            rules={
+                "work_type": FieldRule(
+                    default="校招" if work_type == "fulltime" else "实习"
+                ),
+                "job_url": FieldRule(
+                    template="https://campus.kuaishou.cn/recruit/campus/e/#/campus/job-info/{job_id}"
+                ),
+                "company_name": FieldRule(default="快手"),
+                "city": FieldRule(
+                    source="extra_info.workLocationsCode",
+                    pluck="name",
+                    as_list=True,
+                    default=["未知"],
+                ),
+                "publish_date": FieldRule(divide=1000),
+                "experience_req": FieldRule(
+                    lookup=codes.table("experience"), lookup_default="未知"
+                ),
+                "category": FieldRule(
+                    lookup=codes.table("category"), lookup_default="未知"
+                ),
+                "job_id": FieldRule(cast=str),
+            },
+            constants={"source_platform": "快手官网"},
+        )
         i = 1
         while True:
             page_url = f"https://campus.kuaishou.cn/recruit/campus/e/#/campus/jobs?pageNum={i}&positionNatureCode={work_type}"
@@ -84,25 +107,7 @@ class WebKuaishouCampusSource:
             res_list = res.response.body.get("result")["list"]
             if res_list == None or len(res_list) == 0:
                 break
-            for item in res_list:
-                t = Item.transform_with_jsonpath(schema_dict, item)
-                t.source_platform = "快手官网"
-                if t.work_type == None or t.work_type == "":
-                    t.work_type = "校招" if work_type == "fulltime" else "实习"
-                if t.job_url == None or t.job_url == "":
-                    t.job_url = f"https://campus.kuaishou.cn/recruit/campus/e/#/campus/job-info/{t.job_id}"
-                if t.crawl_date == None or t.crawl_date == "":
-                    t.crawl_date = int(time.time())
-                if t.company_name == None or t.company_name == "":
-                    t.company_name = "快手"
-                if t.extra_info and "workLocationsCode" in t.extra_info:
-                    t.city = [x["name"] for x in t.extra_info["workLocationsCode"]]
-                else:
-                    t.city = ["未知"]
-                t.publish_date = t.publish_date // 1000
-                t.experience_req = mp.get(t.experience_req, "未知")
-                t.category = mp.get(t.category, "未知")
-                t.job_id = str(t.job_id)
+            for t in transform_batch(res_list, spec):
                 yield t
                 if self._skip_count > 0:
                     i += self._skip_count
@@ -119,7 +124,9 @@ class WebKuaishouCampusSource:
             item.education_req,
             item.description_keywords,
             item.requirement_keywords,
-        ) = get_json_data(item.description, item.requirement)
+        ) = get_json_data(
+            item.description, item.requirement, item.experience_req, item.education_req
+        )
         return item
 
     def fetch_all_fingerprints(
@@ -135,156 +142,3 @@ class WebKuaishouCampusSource:
         ):
             filters["source_platform"] = "快手官网"
         return data_storage.fetch_all_fingerprints(filters)
-
-
-mapping_table = """{
-  "Beijing": "北京",
-  "Shanghai": "上海",
-  "Guangzhou": "广州",
-  "Shenzhen": "深圳",
-  "Tianjin": "天津",
-  "Hangzhou": "杭州",
-  "Chengdu": "成都",
-  "Wuhan": "武汉",
-  "Jinan": "济南",
-  "qingdao": "青岛",
-  "Yantai": "烟台",
-  "xiamen": "厦门",
-  "Taiyuan": "太原",
-  "Xian": "西安",
-  "Shenyang": "沈阳",
-  "Haerbin": "哈尔滨",
-  "changchun": "长春",
-  "shijiazhuang": "石家庄",
-  "kunming": "昆明",
-  "Dalian": "大连",
-  "Lanzhou": "兰州",
-  "Wuxi": "无锡",
-  "huaian": "淮安",
-  "tongren": "铜仁",
-  "jishou": "吉首",
-  "Changsha": "长沙",
-  "wulanchabu": "乌兰察布",
-  "hongkong": "香港",
-  "suzhou": "苏州",
-  "Los Angeles": "洛杉矶",
-  "chengmai": "澄迈",
-  "San Jose": "硅谷",
-  "New York": "纽约",
-  "Seattle": "西雅图",
-  "Washington, D.C.": "华盛顿特区",
-  "Yancheng": "盐城",
-  "San Diego": "圣地亚哥",
-  "bengaluru": "班加罗尔",
-  "saopaulo": "圣保罗",
-  "gurugram": "古尔冈",
-  "Jakarta": "雅加达",
-  "Kualalumpur": "吉隆坡",
-  "Egypt": "埃及",
-  "Mexico": "墨西哥",
-  "Argentina": "阿根廷",
-  "Viet Nam": "越南",
-  "Russia": "俄罗斯",
-  "Singapore": "新加坡",
-  "Seoul": "首尔",
-  "islamabad": "伊斯兰堡",
-  "zhengzhou": "郑州",
-  "chongqing": "重庆",
-  "Dongguan": "东莞",
-  "Tangshan": "唐山",
-  "Linyi": "临沂",
-  "baoding": "保定",
-  "Luoyang": "洛阳",
-  "Suining": "遂宁",
-  "Zhuhai": "珠海",
-  "huhehaote": "呼和浩特",
-  "yinchuan": "银川",
-  "nanjing": "南京",
-  "columbia": "哥伦比亚",
-  "peru": "秘鲁",
-  "Bangkok": "曼谷",
-  "London": "伦敦",
-  "Dubai": "迪拜",
-  "Karachi": "卡拉奇",
-  "Morocco": "摩洛哥",
-  "Dhaka": "达卡",
-  "Kathmandu": "加德满都",
-  "Colombo": "科伦坡",
-  "Moscow": "莫斯科",
-  "Istanbul": "伊斯坦布尔",
-  "Lahore": "拉合尔",
-  "hefei": "合肥",
-  "C001": "全职",
-  "C002": "实习",
-  "C003": "兼职",
-  "1": "不限",
-  "2": "应届毕业生",
-  "3": "1年以下",
-  "4": "1-3年",
-  "5": "3-5年",
-  "6": "5-10年",
-  "7": "10年以上",
-  "B012": "客服",
-  "J0001": "技术",
-  "B009": "工程",
-  "B008": "算法",
-  "B003": "产品",
-  "B004": "职能",
-  "B005": "运营",
-  "B006": "市场",
-  "B002": "设计",
-  "B010": "战略支持",
-  "J0012": "工程",
-  "B011": "战略分析",
-  "B001": "技术",
-  "J0011": "算法",
-  "J1001": "算法",
-  "J1002": "算法",
-  "J1003": "算法",
-  "J1004": "算法",
-  "J1005": "算法",
-  "J1006": "算法",
-  "J1007": "算法",
-  "J1008": "算法",
-  "J1009": "算法",
-  "J1010": "算法",
-  "J1011": "算法",
-  "J1012": "算法",
-  "J1013": "算法",
-  "J1014": "工程",
-  "J1015": "工程",
-  "J1016": "工程",
-  "J1017": "工程",
-  "J1018": "工程",
-  "J1019": "工程",
-  "J1020": "工程",
-  "J1021": "产品",
-  "J1026": "产品",
-  "J1022": "产品",
-  "J1023": "产品",
-  "J1024": "产品",
-  "J1025": "产品",
-  "J1027": "运营",
-  "J1028": "运营",
-  "J1029": "运营",
-  "J1030": "运营",
-  "J1031": "运营",
-  "J1032": "运营",
-  "J1033": "运营",
-  "J1034": "运营",
-  "J1035": "运营",
-  "J1036": "运营",
-  "J0005": "产品",
-  "J0004": "运营",
-  "J0003": "设计",
-  "J0014": "分析",
-  "J0013": "战略",
-  "J0006": "市场",
-  "J0002": "职能",
-  "J0007": "客服",
-  "J0008": "审核",
-  "J0009": "内容评级",
-  "J0015": "销售及支持",
-  "J0010": "其它",
-  "B007": "其他"
-}"""
@@ -2,6 +2,7 @@ from DrissionPage import WebPage
 from dataclasses import dataclass
 from typing import Iterator
 from ..core.models import Item
+from ..core.transform import FieldRule, TransformSpec, transform_batch
 from ..utils.call_llm import get_json_data
 import json
 import time
@@ -10,24 +11,36 @@ import os
 from ..core.protocols import DataStorage
 from typing import Any
 from datetime import datetime
+from functools import partial
+from ..data_clean.code_dict import code_dicts
 
+CODE_DICT_PLATFORM = "kuaishou_social"
 
-def get_mapping_table():
-    mp = {}
-    p2 = WebPage()
-    p2.listen.start(
-        "api/v1/dictionary/batch?types=workLocation,positionCategory,positionExperience,positionNature"
-    )
-    p2.get(f"https://zhaopin.kuaishou.cn/recruit/e/#/official/social/job-info/28457")
-    res = p2.listen.wait()
-    res_key_list = res.response.body.get("result")
-    for item in res_key_list:
-        res_list = res_key_list[item]
-        for item_info in res_list:
-            mp[item_info["code"]] = item_info["name"]
-    with open("test2.json", mode="w", encoding="utf-8") as f:
-        f.write(json.dumps(mp, ensure_ascii=False, indent=2))
-    p2.disconnect()
+
+# 快手字典接口返回的类型 -> 注册表中的字典种类
+_DICT_TYPES = {
+    "workLocation": "city",
+    "positionCategory": "category",
+    "positionExperience": "experience",
+    "positionNature": "nature",
+}
+
+
+def fetch_code_dicts(web_page, page_url: str) -> dict[str, dict[str, str]]:
+    """打开招聘页面，监听页面请求的字典接口，返回 {字典种类: {代码: 名称}}"""
+    p = web_page.new_tab()
+    try:
+        p.listen.start("api/v1/dictionary/batch")
+        p.get(page_url)
+        res = p.listen.wait(timeout=30)
+        result = res.response.body.get("result") or {}
+        return {
+            _DICT_TYPES[key]: {x["code"]: x["name"] for x in entries}
+            for key, entries in result.items()
+            if key in _DICT_TYPES
+        }
+    finally:
+        p.close()
 
 
 @dataclass
@@ -37,6 +50,14 @@ class WebKuaishouSocialSource:
 
     def __post_init__(self):
         self._skip_count = 0
+        code_dicts.register_fetcher(
+            CODE_DICT_PLATFORM,
+            partial(
+                fetch_code_dicts,
+                self.web_page,
+                "https://zhaopin.kuaishou.cn/recruit/e/#/official/social/",
+            ),
+        )
 
     def skip_pages(self, n: int):
         self._skip_count += n
@@ -72,7 +93,32 @@ class WebKuaishouSocialSource:
                 "workLocationsCode": "$.workLocationsCode",
             },
         }
-        mp = json.loads(mapping_table)
+        codes = code_dicts.refresh(CODE_DICT_PLATFORM)
+        spec = TransformSpec(
+            schema=schema_dict,
+            rules={
+                "work_type": FieldRule(template="{work_type_name}"),
+                "job_url": FieldRule(
+                    template="https://zhaopin.kuaishou.cn/recruit/e/#/official/{page_type}/job-info/{job_id}"
+                ),
+                "company_name": FieldRule(default="快手"),
+                "city": FieldRule(
+                    source="extra_info.workLocationsCode",
+                    lookup=codes.table("city"),
+                    lookup_default="未知",
+                    as_list=True,
+                ),
+                "publish_date": FieldRule(parse_date="iso"),
+                "experience_req": FieldRule(
+                    lookup=codes.table("experience"), lookup_default="未知"
+                ),
+                "category": FieldRule(
+                    lookup=codes.table("category"), lookup_default="未知"
+                ),
+                "job_id": FieldRule(cast=str),
+            },
+            constants={"source_platform": "快手官网"},
+        )
         work_types = ["social", "trainee"]
         while True:
             for work_type in work_types:
@@ -83,32 +129,11 @@ class WebKuaishouSocialSource:
                 res_list = res.response.body.get("result")["list"]
                 if res_list == None or len(res_list) == 0:
                     break
-                for item in res_list:
-                    t = Item.transform_with_jsonpath(schema_dict, item)
-                    t.source_platform = "快手官网"
-                    if t.work_type == None or t.work_type == "":
-                        t.work_type = "社招" if work_type == "social" else "实习"
-                    if t.job_url == None or t.job_url == "":
-                        t.job_url = f"https://zhaopin.kuaishou.cn/recruit/e/#/official/{work_type}/job-info/{t.job_id}"
-                    if t.crawl_date == None or t.crawl_date == "":
-                        t.crawl_date = int(time.time())
-                    if t.company_name == None or t.company_name == "":
-                        t.company_name = "快手"
-                    if t.extra_info and "workLocationsCode" in t.extra_info:
-                        t.city = [
-                            mp.get(x, "未知") for x in t.extra_info["workLocationsCode"]
-                        ]
-                    else:
-                        t.city = [mp.get(t.city, "未知")]
-                    try:
-                        t.publish_date = int(
-                            datetime.fromisoformat(t.publish_date).timestamp()
-                        )
-                    except Exception as e:
-                        pass
-                    t.experience_req = mp.get(t.experience_req, "未知")
-                    t.category = mp.get(t.category, "未知")
-                    t.job_id = str(t.job_id)
+                context = {
+                    "page_type": work_type,
+                    "work_type_name": "社招" if work_type == "social" else "实习",
+                }
+                for t in transform_batch(res_list, spec, context):
                     yield t
                     if self._skip_count > 0:
                         i += self._skip_count
@@ -125,7 +150,9 @@ class WebKuaishouSocialSource:
             item.education_req,
             item.description_keywords,
             item.requirement_keywords,
-        ) = get_json_data(item.description, item.requirement)
+        ) = get_json_data(
+            item.description, item.requirement, item.experience_req, item.education_req
+        )
         return item
 
     def fetch_all_fingerprints(
@@ -141,120 +168,3 @@ class WebKuaishouSocialSource:
         ):
             filters["source_platform"] = "快手官网"
         return data_storage.fetch_all_fingerprints(filters)
-
-
-mapping_table = """{
-  "Beijing": "北京",
-  "Shanghai": "上海",
-  "Guangzhou": "广州",
-  "Shenzhen": "深圳",
-  "Tianjin": "天津",
-  "Hangzhou": "杭州",
-  "Chengdu": "成都",
-  "Wuhan": "武汉",
-  "Jinan": "济南",
-  "qingdao": "青岛",
-  "Yantai": "烟台",
-  "xiamen": "厦门",
-  "Taiyuan": "太原",
-  "Xian": "西安",
-  "Shenyang": "沈阳",
-  "Haerbin": "哈尔滨",
-  "changchun": "长春",
-  "shijiazhuang": "石家庄",
-  "kunming": "昆明",
-  "Dalian": "大连",
-  "Lanzhou": "兰州",
-  "Wuxi": "无锡",
-  "huaian": "淮安",
-  "tongren": "铜仁",
-  "jishou": "吉首",
-  "Changsha": "长沙",
-  "wulanchabu": "乌兰察布",
-  "hongkong": "香港",
-  "suzhou": "苏州",
-  "Los Angeles": "洛杉矶",
-  "chengmai": "澄迈",
-  "San Jose": "硅谷",
-  "New York": "纽约",
-  "Seattle": "西雅图",
-  "Washington, D.C.": "华盛顿特区",
-  "Yancheng": "盐城",
-  "San Diego": "圣地亚哥",
-  "bengaluru": "班加罗尔",
-  "saopaulo": "圣保罗",
-  "gurugram": "古尔冈",
-  "Jakarta": "雅加达",
-  "Kualalumpur": "吉隆坡",
-  "Egypt": "埃及",
-  "Mexico": "墨西哥",
-  "Argentina": "阿根廷",
-  "Viet Nam": "越南",
-  "Russia": "俄罗斯",
-  "Singapore": "新加坡",
-  "Seoul": "首尔",
-  "islamabad": "伊斯兰堡",
-  "zhengzhou": "郑州",
-  "chongqing": "重庆",
-  "Dongguan": "东莞",
-  "Tangshan": "唐山",
-  "Linyi": "临沂",
-  "baoding": "保定",
-  "Luoyang": "洛阳",
-  "Suining": "遂宁",
-  "Zhuhai": "珠海",
-  "huhehaote": "呼和浩特",
-  "yinchuan": "银川",
-  "nanjing": "南京",
-  "columbia": "哥伦比亚",
-  "peru": "秘鲁",
-  "Bangkok": "曼谷",
-  "London": "伦敦",
-  "Dubai": "迪拜",
-  "Karachi": "卡拉奇",
-  "Morocco": "摩洛哥",
-  "Dhaka": "达卡",
-  "Kathmandu": "加德满都",
-  "Colombo": "科伦坡",
-  "Moscow": "莫斯科",
-  "Istanbul": "伊斯坦布尔",
-  "Lahore": "拉合尔",
-  "hefei": "合肥",
-  "C001": "全职",
-  "C002": "实习",
-  "C003": "兼职",
-  "1": "不限",
-  "2": "应届毕业生",
-  "3": "1年以下",
-  "4": "1-3年",
-  "5": "3-5年",
-  "6": "5-10年",
-  "7": "10年以上",
-  "B012": "客服类",
-  "J0001": "技术类",
-  "B009": "工程类",
-  "B008": "算法类",
-  "B003": "产品类",
-  "B004": "职能类",
-  "B005": "运营类",
-  "B006": "市场类",
-  "B002": "设计类",
-  "B010": "战略支持类",
-  "J0012": "工程类",
-  "B011": "战略分析类",
-  "B001": "技术类",
-  "J0011": "算法类",
-  "J0005": "产品类",
-  "J0004": "运营类",
-  "J0003": "设计类",
-  "J0014": "分析类",
-  "J0013": "战略类",
-  "J0006": "市场类",
-  "J0002": "职能类",
-  "J0007": "客服类",
-  "J0008": "审核类",
-  "J0009": "内容评级类",
-  "J0015": "销售及支持类",
-  "J0010": "其它类",
-  "B007": "其他"
-}"""
@@ -110,7 +110,12 @@ class WebPDDSocialSource:
                 item.education_req,
                 item.description_keywords,
                 item.requirement_keywords,
-            ) = get_json_data(item.description, item.requirement)
+            ) = get_json_data(
+                item.description,
+                item.requirement,
+                item.experience_req,
+                item.education_req,
+            )
             return item
         else:
             return None
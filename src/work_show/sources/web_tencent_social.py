@@ -2,6 +2,7 @@ from DrissionPage import ChromiumPage
 from dataclasses import dataclass
 from typing import Iterator
 from ..core.models import Item
+from ..core.transform import FieldRule, TransformSpec, transform_batch
 from ..utils.call_llm import get_json_data
 import json
 import time
@@ -12,6 +13,38 @@ from typing import Any
 from datetime import datetime
 from rich import inspect
 
+# 映射表和转换规则与页码无关，在导入时编译一次
+_SCHEMA = {
+    "job_id": "$.PostId",
+    "company_name": None,
+    "source_platform": None,
+    "job_url": "$.PostURL",
+    "title": "$.RecruitPostName",
+    "city": "$.LocationName",
+    "category": "$.CategoryName",
+    "experience_req": "$.RequireWorkYearsName",
+    "education_req": None,
+    "job_level": None,
+    "salary_min": None,
+    "salary_max": None,
+    "description": "$.Responsibility",
+    "requirement": None,
+    "publish_date": "$.LastUpdateTime",
+    "crawl_date": None,
+}
+
+_SPEC = TransformSpec(
+    schema=_SCHEMA,
+    rules={
+        "company_name": FieldRule(default="腾讯"),
+        "city": FieldRule(as_list=True),
+        "publish_date": FieldRule(parse_date="%Y年%m月%d日"),
+        "category": FieldRule(default="未知"),
+        "job_id": FieldRule(cast=str),
+    },
+    constants={"source_platform": "腾讯官网", "work_type": "社招"},
+)
+
 
 @dataclass
 class WebTencentSocialSource:
@@ -20,64 +53,38 @@ class WebTencentSocialSource:
 
     def __post_init__(self):
         self._skip_count = 0
+        self._tab = None
 
     def skip_pages(self, n: int):
         self._skip_count += n
 
+    def fetch_page(self, n: int) -> list[Item]:
+        """获取第 n 页的职位，引擎可以借此按页号跳转"""
+        if self._tab is None:
+            self._tab = self.web_page.new_tab()
+            self._tab.listen.start("api/post/Query")
+        else:
+            time.sleep(1 + random.random() * 2)
+        p = self._tab
+        page_url = f"https://careers.tencent.com/search.html?query=co_1&index={n}&sc=1"
+        p.get(page_url)
+        res = p.listen.wait()
+        res_list = res.response.body.get("Data")["Posts"]
+        return transform_batch(res_list, _SPEC)
+
     def fetch_items(self) -> Iterator[Item]:
-        p = self.web_page.new_tab()
-        p.listen.start("api/post/Query")
         i = self.start_page
-        schema_dict = {
-            "job_id": "$.PostId",
-            "company_name": None,
-            "source_platform": None,
-            "job_url": "$.PostURL",
-            "title": "$.RecruitPostName",
-            "city": "$.LocationName",
-            "category": "$.CategoryName",
-            "experience_req": "$.RequireWorkYearsName",
-            "education_req": None,
-            "job_level": None,
-            "salary_min": None,
-            "salary_max": None,
-            "description": "$.Responsibility",
-            "requirement": None,
-            "publish_date": "$.LastUpdateTime",
-            "crawl_date": None,
-        }
-        i = 1
         while True:
-            page_url = (
-                f"https://careers.tencent.com/search.html?query=co_1&index={i}&sc=1"
-            )
-            p.get(page_url)
-            res = p.listen.wait()
-            res_list = res.response.body.get("Data")["Posts"]
-            if res_list == None or len(res_list) == 0:
+            items = self.fetch_page(i)
+            if len(items) == 0:
                 break
-            for item in res_list:
-                t = Item.transform_with_jsonpath(schema_dict, item)
-                t.source_platform = "腾讯官网"
-                t.work_type = "社招"
-                if t.crawl_date == None or t.crawl_date == "":
-                    t.crawl_date = int(time.time())
-                if t.company_name == None or t.company_name == "":
-                    t.company_name = "腾讯"
-                t.city = [t.city]
-                t.publish_date = int(
-                    datetime.strptime(t.publish_date, "%Y年%m月%d日").timestamp()
-                )
-                if not t.category:
-                    t.category = "未知"
-                t.job_id = str(t.job_id)
+            for t in items:
                 yield t
                 if self._skip_count > 0:
                     i += self._skip_count
                     self._skip_count = 0
                     break
             i += 1
-            time.sleep(1 + random.random() * 2)
         return "没有任何数据了"
 
     def extract_by_llm(self, item: Item) -> Item:
@@ -87,7 +94,9 @@ class WebTencentSocialSource:
             item.education_req,
             item.description_keywords,
             _,
-        ) = get_json_data(item.description, item.requirement)
+        ) = get_json_data(
+            item.description, item.requirement, item.experience_req, item.education_req
+        )
         return item
 
     def fetch_all_fingerprints(
@@ -0,0 +1,114 @@
+"""
+jobs 表的变更日志（CDC）
+
+由触发器在同一事务中写入 job_changes，seq 使用 AUTOINCREMENT，单调递增且不会复用。
+下游（提醒、搜索索引、导出）记住处理到的 seq，每次只读取之后的变更即可。
+
+op 取值：
+    insert  新职位
+    update  内容发生变化（只刷新 crawl_date / last_seen 的重复写入不记录）
+    close   被标记为已关闭
+    reopen  已关闭的职位重新出现
+    delete  行被删除
+
+分片存储中每个分片有自己的 job_changes，seq 只在分片内单调，游标为 {分片名: seq} 的复合游标，
+命令行中写作 "分片名:seq,分片名:seq"。
+"""
+
+from dataclasses import dataclass
+
+CHANGE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS job_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    source_platform TEXT,
+    job_id TEXT,
+    changed_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+);
+-- 有行时触发器不记录变更，供不改变内容的维护操作（如 compact_texts）在自己的事务内暂停记录
+CREATE TABLE IF NOT EXISTS job_changes_paused (reason TEXT);
+"""
+# 维护操作在事务开始后写入、提交前删除，其他连接永远看不到这一行
+PAUSE_CHANGES_SQL = "INSERT INTO job_changes_paused VALUES (?)"
+RESUME_CHANGES_SQL = "DELETE FROM job_changes_paused"
+
+
+@dataclass
+class JobChange:
+    seq: int
+    op: str
+    source_platform: str | None
+    job_id: str | None
+    changed_at: int
+    # 变更所在的分片，单库存储为 None
+    shard: str | None = None
+
+
+def parse_cursor(text: str) -> int | dict[str, int]:
+    """解析命令行中的游标：整数为单库的 seq，"分片名:seq,..." 为分片存储的复合游标"""
+    if ":" not in text:
+        return int(text)
+    cursor = {}
+    for part in text.split(","):
+        shard, _, seq = part.rpartition(":")
+        cursor[shard] = int(seq)
+    return cursor
+
+
+def format_cursor(cursor: int | dict[str, int]) -> str:
+    if isinstance(cursor, int):
+        return str(cursor)
+    return ",".join(f"{shard}:{seq}" for shard, seq in sorted(cursor.items()))
+
+
+def advance_cursor(
+    cursor: int | dict[str, int], changes: list[JobChange]
+) -> int | dict[str, int]:
+    """处理完 changes 之后的游标，作为下一次 read_changes 的 since"""
+    if isinstance(cursor, int) and all(c.shard is None for c in changes):
+        return max([cursor, *(c.seq for c in changes)])
+    merged = dict(cursor) if isinstance(cursor, dict) else {}
+    for change in changes:
+        merged[change.shard] = max(merged.get(change.shard, 0), change.seq)
+    return merged
+
+
+def change_triggers_sql(table_name: str, content_columns: list[str]) -> str:
+    """
+    生成 jobs 表上的变更触发器，content_columns 中任一列变化才算 update。
+    先删除同名触发器再创建，旧库中的触发器随之更新为当前的定义。
+    """
+    changed = " OR ".join(f"OLD.{col} IS NOT NEW.{col}" for col in content_columns)
+    active = "NOT EXISTS (SELECT 1 FROM job_changes_paused)"
+
+    def trigger(name: str, event: str, op: str, row: str, when: str = "") -> str:
+        when_clause = f"WHEN {active} AND ({when})" if when else f"WHEN {active}"
+        return (
+            f"DROP TRIGGER IF EXISTS trg_{table_name}_{name};\n"
+            f"CREATE TRIGGER trg_{table_name}_{name} "
+            f"AFTER {event} ON {table_name} {when_clause} BEGIN "
+            f"INSERT INTO job_changes (op, source_platform, job_id) "
+            f"VALUES ('{op}', {row}.source_platform, {row}.job_id); END;\n"
+        )
+
+    return "".join(
+        [
+            trigger("insert", "INSERT", "insert", "NEW"),
+            trigger("update", "UPDATE", "update", "NEW", changed),
+            trigger(
+                "close",
+                "UPDATE OF closed_at",
+                "close",
+                "NEW",
+                "OLD.closed_at IS NULL AND NEW.closed_at IS NOT NULL",
+            ),
+            trigger(
+                "reopen",
+                "UPDATE OF closed_at",
+                "reopen",
+                "NEW",
+                "OLD.closed_at IS NOT NULL AND NEW.closed_at IS NULL",
+            ),
+            trigger("delete", "DELETE", "delete", "OLD"),
+        ]
+    )
@@ -0,0 +1,185 @@
+import json
+import threading
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+import pandas as pd
+
+from ..core.models import Item
+from ..core.protocols import DataStorage
+from ..utils.logger import get_logger
+from .sql_storage import DummyLock, SaveResult, _as_list
+
+try:
+    import duckdb
+except ImportError:  # 可选依赖，只有选择 duckdb 后端时才需要
+    duckdb = None
+
+logger = get_logger(__name__)
+
+# 列定义：city 和关键字使用 LIST 类型而不是 JSON 字符串，便于 unnest 后聚合
+_SCHEMA = (
+    ("job_id", "VARCHAR NOT NULL"),
+    ("company_name", "VARCHAR"),
+    ("source_platform", "VARCHAR NOT NULL"),
+    ("work_type", "VARCHAR"),
+    ("job_url", "VARCHAR"),
+    ("title", "VARCHAR"),
+    ("city", "VARCHAR[]"),
+    ("category", "VARCHAR"),
+    ("experience_req", "VARCHAR"),
+    ("education_req", "VARCHAR"),
+    ("job_level", "VARCHAR"),
+    ("salary_min", "DOUBLE"),
+    ("salary_max", "DOUBLE"),
+    ("description", "VARCHAR"),
+    ("description_keywords", "VARCHAR[]"),
+    ("requirement", "VARCHAR"),
+    ("requirement_keywords", "VARCHAR[]"),
+    ("publish_date", "BIGINT"),
+    ("crawl_date", "BIGINT"),
+    ("extra_info", "JSON"),
+)
+_COLUMNS = tuple(name for name, _ in _SCHEMA)
+
+
+@dataclass
+class DuckDbStorage(DataStorage):
+    """
+    基于嵌入式 DuckDB 的列式存储，适合按城市、分类、学历、发布周等维度做聚合分析。
+    以 (source_platform, job_id) 为主键，重复写入时替换旧行。
+    """
+
+    duckdb_path: str
+    table_name: str
+    lock: Lock = field(default_factory=DummyLock)
+
+    def __post_init__(self):
+        if duckdb is None:
+            raise ImportError(
+                "duckdb is not installed, install the optional 'duckdb' extra to use DuckDbStorage"
+            )
+        self._conn = duckdb.connect(self.duckdb_path)
+        # DuckDB 的连接不能跨线程并发使用，每个线程通过 cursor() 获取独立的连接
+        self._local = threading.local()
+        # 所有线程的 cursor，close 时一并关闭
+        self._cursors: list["duckdb.DuckDBPyConnection"] = []
+        self._cursors_lock = threading.Lock()
+        columns = ", ".join(f"{name} {col_type}" for name, col_type in _SCHEMA)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+            f"{columns}, PRIMARY KEY (source_platform, job_id))"
+        )
+
+    def _get_conn(self) -> "duckdb.DuckDBPyConnection":
+        if not hasattr(self._local, "conn"):
+            with self._cursors_lock:
+                if self._conn is None:
+                    raise RuntimeError(f"DuckDbStorage {self.duckdb_path} is closed")
+                self._local.conn = self._conn.cursor()
+                self._cursors.append(self._local.conn)
+        return self._local.conn
+
+    @staticmethod
+    def _adapt_item(item: Item) -> dict[str, Any]:
+        return {
+            "job_id": item.job_id,
+            "company_name": item.company_name,
+            "source_platform": item.source_platform,
+            "work_type": item.work_type,
+            "job_url": item.job_url,
+            "title": item.title,
+            "city": _as_list(item.city),
+            "category": item.category,
+            "experience_req": item.experience_req,
+            "education_req": item.education_req,
+            "job_level": item.job_level,
+            "salary_min": item.salary_min,
+            "salary_max": item.salary_max,
+            "description": item.description,
+            "description_keywords": _as_list(item.description_keywords),
+            "requirement": item.requirement,
+            "requirement_keywords": _as_list(item.requirement_keywords),
+            "publish_date": item.publish_date,
+            "crawl_date": item.crawl_date,
+            "extra_info": (
+                json.dumps(item.extra_info, ensure_ascii=False)
+                if item.extra_info is not None
+                else None
+            ),
+        }
+
+    def save(self, item: Item) -> SaveResult:
+        return self.save_batch([item])
+
+    def save_batch(self, items: list[Item]) -> SaveResult:
+        if not items:
+            return SaveResult()
+        # 同一批中重复的 key 以最后一次为准
+        latest = {(x.source_platform, x.job_id): x for x in items}
+        df = pd.DataFrame(
+            [self._adapt_item(x) for x in latest.values()], columns=list(_COLUMNS)
+        )
+        columns = ", ".join(_COLUMNS)
+        with self.lock:
+            conn = self._get_conn()
+            try:
+                conn.begin()
+                conn.register("_batch", df)
+                updated = conn.execute(
+                    f"SELECT COUNT(*) FROM {self.table_name} t "
+                    f"JOIN _batch b USING (source_platform, job_id)"
+                ).fetchone()[0]
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table_name} ({columns}) "
+                    f"SELECT {columns} FROM _batch"
+                )
+                conn.unregister("_batch")
+                conn.commit()
+                return SaveResult(inserted=len(df) - updated, updated=updated)
+            except Exception as e:
+                conn.rollback()
+                logger.error(
+                    f"DuckDB Batch Save Error, duckdb path {self.duckdb_path}: \n{e}"
+                )
+                raise e
+
+    def fetch_all_fingerprints(self, filters: dict[str, Any] | None = None) -> set[str]:
+        try:
+            sql = f"SELECT job_id FROM {self.table_name}"
+            params = []
+            if filters:
+                where_clauses = []
+                for key, value in filters.items():
+                    where_clauses.append(f"{key} = ?")
+                    params.append(value)
+                sql += " WHERE " + " AND ".join(where_clauses)
+            rows = self._get_conn().execute(sql, params).fetchall()
+            return set([row[0] for row in rows])
+        except Exception as e:
+            logger.error(f"Failed to fetch fingerprints: {e}")
+            return set()
+
+    def query(self, sql: str, params: list[Any] | None = None) -> pd.DataFrame:
+        """
+        执行分析查询并返回 DataFrame，例如按城市统计：
+        SELECT city, COUNT(*) FROM (SELECT unnest(city) AS city FROM jobs) GROUP BY city
+        """
+        return self._get_conn().execute(sql, params or []).df()
+
+    def query_rows(self, sql: str, params: list[Any] | None = None) -> list[tuple]:
+        """执行只读查询并返回所有行，city 等 LIST 列为 Python 列表"""
+        return self._get_conn().execute(sql, params or []).fetchall()
+
+    def close(self) -> None:
+        # 关闭所有线程的 cursor 和底层连接，释放数据库文件锁
+        with self._cursors_lock:
+            for cursor in self._cursors:
+                cursor.close()
+            self._cursors = []
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        if hasattr(self._local, "conn"):
+            del self._local.conn
@@ -0,0 +1,54 @@
+from contextlib import AbstractContextManager
+from typing import Any
+
+from ..core.protocols import DataStorage
+from .sql_storage import DummyLock, SqliteStorage
+
+
+def build_storage(
+    db_config: dict[str, Any], lock: AbstractContextManager | None = None
+) -> DataStorage:
+    """
+    根据 settings.yaml 中的 database 配置创建存储实例。
+    database.backend 可选 sqlite（默认）、sqlite_sharded（按平台分片）或 duckdb。
+    """
+    backend = db_config.get("backend", "sqlite")
+    if backend == "duckdb":
+        from .duckdb_storage import DuckDbStorage
+
+        return DuckDbStorage(
+            duckdb_path=db_config["url"],
+            table_name=db_config["table_name"],
+            lock=lock or DummyLock(),
+        )
+    if backend == "sqlite_sharded":
+        from .sharded_storage import ShardedSqliteStorage
+
+        # url 为分片目录，每个 source_platform 一个数据库文件，各分片使用自己的写锁
+        return ShardedSqliteStorage(
+            shard_dir=db_config["url"],
+            table_name=db_config["table_name"],
+            schema_path=db_config.get("schema_path", "./sql/create_table.sql"),
+            shard_options=_sqlite_options(db_config),
+        )
+    if backend != "sqlite":
+        raise ValueError(f"Unknown database backend: {backend}")
+    return SqliteStorage(
+        sqlite_path=db_config["url"],
+        table_name=db_config["table_name"],
+        lock=lock or DummyLock(),
+        **_sqlite_options(db_config),
+    )
+
+
+def _sqlite_options(db_config: dict[str, Any]) -> dict[str, Any]:
+    """SqliteStorage 的可选功能开关"""
+    return {
+        "upsert": db_config.get("upsert", False),
+        "side_tables": db_config.get("side_tables", False),
+        "full_text": db_config.get("full_text", False),
+        "extra_info_keys": db_config.get("extra_info_keys", []),
+        "compress_text": db_config.get("compress_text", False),
+        "stats": db_config.get("stats", False),
+        "change_log": db_config.get("change_log", False),
+    }
@@ -0,0 +1,42 @@
+"""
+FTS5 全文检索的中文分词辅助函数
+
+unicode61 分词器会把一整段连续的汉字当成一个词，无法检索其中的子串。
+这里在写入和查询前把连续汉字切成重叠的二元组（"算法工程师" -> "算法 法工 工程 程师"），
+查询时把每个词转换成由二元组组成的短语，从而支持任意长度不小于 2 的中文子串检索。
+"""
+
+import re
+
+_CJK_RUN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+def _bigrams(run: str) -> str:
+    if len(run) == 1:
+        return run
+    return " ".join(run[i : i + 2] for i in range(len(run) - 1))
+
+
+def segment_cjk(text: str | None) -> str:
+    """把文本中的连续汉字切分为二元组，其余字符交给 unicode61 处理"""
+    if not text:
+        return ""
+    return _CJK_RUN.sub(lambda m: f" {_bigrams(m.group())} ", text)
+
+
+def build_match_query(query: str) -> str:
+    """
+    把用户输入（空格分隔的多个词，如 "Rust Kubernetes 后端"）转换为 FTS5 MATCH 表达式。
+    每个词作为一个短语，多个词之间为 AND；单个汉字使用前缀匹配。
+    """
+    phrases = []
+    for term in query.split():
+        segmented = " ".join(segment_cjk(term).split())
+        if not segmented:
+            continue
+        escaped = segmented.replace('"', '""')
+        if len(term) == 1 and _CJK_RUN.fullmatch(term):
+            phrases.append(f'"{escaped}"*')
+        else:
+            phrases.append(f'"{escaped}"')
+    return " ".join(phrases)
@@ -0,0 +1,205 @@
+"""
+把 jobs 表增量导出为按 source_platform 和发布月份分区的 Parquet 数据集
+
+city 和关键字写成 list<string> 列，公司、分类、学历等低基数列使用字典编码，
+仪表板和 notebook 可以直接用 pyarrow / pandas / duckdb 读取，不需要再逐行解析 JSON。
+每次导出只写入 crawl_date 不早于上次导出的行，导出进度保存在输出目录的状态文件中；
+同一秒内已经导出过的职位记在状态文件中并跳过，不会因为整秒时间戳重复或遗漏。
+全量导出先写到临时目录，完成后再替换输出目录，不会和旧文件混在一起。
+同一个职位被重新爬取后会再次导出，读取方需要按 (source_platform, job_id) 取 crawl_date 最新的一行。
+"""
+
+import json
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..core.models import Item
+from ..utils.logger import get_logger
+from .sql_storage import SqliteStorage, _as_list
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 可选依赖，只有导出 Parquet 时才需要
+    pa = None
+    pq = None
+
+logger = get_logger(__name__)
+
+STATE_FILE = "_export_state.json"
+PARTITION_COLUMNS = ["source_platform", "publish_month"]
+# 取值较少、适合字典编码的列
+_DICTIONARY_COLUMNS = (
+    "company_name",
+    "work_type",
+    "category",
+    "experience_req",
+    "education_req",
+    "job_level",
+)
+_LIST_COLUMNS = ("city", "description_keywords", "requirement_keywords")
+_UNKNOWN_MONTH = "unknown"
+
+
+def _schema() -> "pa.Schema":
+    string_dict = pa.dictionary(pa.int32(), pa.string())
+    fields = [
+        ("job_id", pa.string()),
+        ("company_name", string_dict),
+        ("source_platform", pa.string()),
+        ("work_type", string_dict),
+        ("job_url", pa.string()),
+        ("title", pa.string()),
+        ("city", pa.list_(pa.string())),
+        ("category", string_dict),
+        ("experience_req", string_dict),
+        ("education_req", string_dict),
+        ("job_level", string_dict),
+        ("salary_min", pa.float64()),
+        ("salary_max", pa.float64()),
+        ("description", pa.string()),
+        ("description_keywords", pa.list_(pa.string())),
+        ("requirement", pa.string()),
+        ("requirement_keywords", pa.list_(pa.string())),
+        ("publish_date", pa.timestamp("s", tz="UTC")),
+        ("crawl_date", pa.timestamp("s", tz="UTC")),
+        ("extra_info", pa.string()),
+        ("publish_month", pa.string()),
+    ]
+    return pa.schema(fields)
+
+
+def _publish_month(publish_date: int | None) -> str:
+    if not publish_date:
+        return _UNKNOWN_MONTH
+    try:
+        return datetime.fromtimestamp(publish_date, tz=timezone.utc).strftime("%Y-%m")
+    except (OverflowError, OSError, ValueError, TypeError):
+        return _UNKNOWN_MONTH
+
+
+def _to_table(items: list[Item], schema: "pa.Schema") -> "pa.Table":
+    columns: dict[str, list] = {name: [] for name in schema.names}
+    for item in items:
+        for name in schema.names:
+            if name == "publish_month":
+                value = _publish_month(item.publish_date)
+            elif name in _LIST_COLUMNS:
+                value = _as_list(getattr(item, name))
+            elif name == "extra_info":
+                value = (
+                    json.dumps(item.extra_info, ensure_ascii=False)
+                    if item.extra_info is not None
+                    else None
+                )
+            else:
+                value = getattr(item, name)
+            columns[name].append(value)
+    return pa.table(columns, schema=schema)
+
+
+@dataclass
+class ParquetExporter:
+    storage: SqliteStorage
+    output_dir: str
+    # 每个 Parquet 文件最多包含的行数，同时也是从 SQLite 分块读取的大小
+    chunk_size: int = 50000
+
+    def __post_init__(self):
+        if pa is None:
+            raise ImportError(
+                "pyarrow is not installed, install the optional 'parquet' extra to export Parquet"
+            )
+        self._root = Path(self.output_dir)
+
+    def _load_state(self) -> dict:
+        path = self._root / STATE_FILE
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def _save_state(root: Path, state: dict) -> None:
+        # 先写临时文件再替换，避免中断时留下不完整的状态文件
+        path = root / STATE_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+    def export(self, full: bool = False) -> int:
+        """
+        导出上次导出之后新爬取的行，full 为 True 时忽略导出进度重新导出全部数据。
+        返回本次导出的行数。
+        """
+        # 文件名带上本次导出的批次号，增量导出不会覆盖已有文件
+        batch_id = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        if not full:
+            self._root.mkdir(parents=True, exist_ok=True)
+            total, state = self._write(self._root, self._load_state(), batch_id)
+            if total:
+                self._save_state(self._root, state)
+            logger.info(f"Exported {total} rows to {self.output_dir}")
+            return total
+
+        staging = self._root.with_name(f"{self._root.name}.{batch_id}.tmp")
+        staging.mkdir(parents=True)
+        try:
+            total, state = self._write(staging, {}, batch_id)
+            self._save_state(staging, state)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        old = self._root.with_name(f"{self._root.name}.{batch_id}.old")
+        if self._root.exists():
+            self._root.rename(old)
+        staging.rename(self._root)
+        shutil.rmtree(old, ignore_errors=True)
+        logger.info(f"Exported all {total} rows to {self.output_dir}")
+        return total
+
+    def _write(self, root: Path, state: dict, batch_id: str) -> tuple[int, dict]:
+        """把上次导出之后的行写入 root，返回导出的行数和新的导出进度"""
+        last = state.get("last_crawl_date")
+        # 上次导出时 crawl_date 等于 last 的职位，这一秒内后来写入的行还没有导出
+        exported = {tuple(key) for key in state.get("last_keys", [])}
+        schema = _schema()
+        total, max_crawl_date, max_keys = 0, last, set(exported)
+        # crawl_date 是整秒时间戳，从 last 这一秒开始重新读取
+        crawled_after = None if last is None else last - 1
+        for i, items in enumerate(
+            self.storage.iter_items(crawled_after, chunk_size=self.chunk_size)
+        ):
+            items = [
+                x
+                for x in items
+                if x.crawl_date != last or (x.source_platform, x.job_id) not in exported
+            ]
+            if not items:
+                continue
+            pq.write_to_dataset(
+                _to_table(items, schema),
+                root_path=str(root),
+                partition_cols=PARTITION_COLUMNS,
+                basename_template=f"part-{batch_id}-{i}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+                use_dictionary=list(_DICTIONARY_COLUMNS),
+                compression="zstd",
+            )
+            total += len(items)
+            for x in items:
+                if x.crawl_date is None:
+                    continue
+                if max_crawl_date is None or x.crawl_date > max_crawl_date:
+                    max_crawl_date, max_keys = x.crawl_date, set()
+                if x.crawl_date == max_crawl_date:
+                    max_keys.add((x.source_platform, x.job_id))
+        state = {
+            "last_crawl_date": max_crawl_date,
+            "last_keys": sorted(max_keys),
+            "exported_at": int(time.time()),
+        }
+        return total, state
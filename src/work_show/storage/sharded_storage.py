@@ -0,0 +1,377 @@
+"""
+按 source_platform 分片的 SQLite 存储
+
+每个平台写入 shard_dir 下独立的数据库文件，各自拥有 WAL 和写锁，不同平台的写入互不竞争，
+一个分片损坏或被锁住也不会阻塞其他平台。
+读取时把分片 ATTACH 到内存数据库，通过名为 table_name（以及 job_stats）的临时视图 UNION ALL 起来查询；
+分片数超过 ATTACH 上限时按组分别查询再拼接结果，只支持逐行的查询，聚合等查询会被拒绝。
+变更日志保存在各分片中，按 {分片名: seq} 的复合游标读取。
+"""
+
+import heapq
+import itertools
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from ..core.models import Item
+from ..core.protocols import DataStorage
+from ..utils.logger import get_logger
+from .change_log import JobChange
+from .sql_storage import SaveResult, SqliteStorage
+
+logger = get_logger(__name__)
+
+SHARD_SUFFIX = ".sqlite"
+# SQLite 编译时默认最多同时 ATTACH 10 个数据库
+_MAX_ATTACHED = 10
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]")
+# 建表脚本中的表名，新建分片时重命名为 table_name
+_SCHEMA_TABLE = "jobs"
+# 联合查询中除 table_name 之外可用的表，只在开启了对应功能的分片中存在
+_FEDERATED_TABLES = ("job_stats",)
+# 查询计划中出现这些操作码说明结果依赖全部的行（聚合、排序、去重、LIMIT、IN 列表等临时表），
+# 不能按组分别执行后拼接
+_CROSS_ROW_OPCODES = {
+    "AggStep",
+    "AggStep1",
+    "SorterOpen",
+    "OpenEphemeral",
+    "DecrJumpZero",
+}
+
+
+def _table_columns(conn: sqlite3.Connection, schema: str, table: str) -> list[str]:
+    """表的列名，包括生成列（如 extra_<key>），表不存在时返回空列表"""
+    rows = conn.execute(f"PRAGMA {schema}.table_xinfo({table})").fetchall()
+    # hidden 为 1 的是虚拟表的隐藏列，2、3 是生成列
+    return [row[1] for row in rows if row[6] != 1]
+
+
+def _select_sql(schema: str, table: str, present: list[str], columns: list[str]):
+    """按 columns 的顺序选出 schema.table 的列，分片中缺少的列（如其他分片的生成列）补 NULL"""
+    exprs = [col if col in present else f"NULL AS {col}" for col in columns]
+    return f"SELECT {', '.join(exprs)} FROM {schema}.{table}"
+
+
+def _is_row_wise(conn: sqlite3.Connection, sql: str, params: list[Any]) -> bool:
+    """查询的每一行只取决于联合表中的一行，按组执行再拼接的结果与整体执行一致"""
+    opcodes = {row[1] for row in conn.execute(f"EXPLAIN {sql}", params)}
+    return not opcodes & _CROSS_ROW_OPCODES
+
+
+@dataclass
+class ShardedSqliteStorage(DataStorage):
+    shard_dir: str
+    table_name: str
+    # 新建分片时执行的建表脚本，脚本建好的 jobs 表会被重命名为 table_name
+    schema_path: str = "./sql/create_table.sql"
+    # 透传给每个分片 SqliteStorage 的参数，如 upsert、side_tables、full_text 等
+    shard_options: dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        Path(self.shard_dir).mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._shards: dict[Path, SqliteStorage] = {}
+
+    def _shard_path(self, source_platform: str) -> Path:
+        name = _UNSAFE_FILENAME_CHARS.sub("_", source_platform or "unknown")
+        return Path(self.shard_dir) / f"{name}{SHARD_SUFFIX}"
+
+    def _shard_paths(self) -> list[Path]:
+        return sorted(Path(self.shard_dir).glob(f"*{SHARD_SUFFIX}"))
+
+    def _create_tables(self, path: Path) -> None:
+        """分片中还没有 table_name 时执行建表脚本，并把脚本中的 jobs 表重命名为 table_name"""
+        conn = sqlite3.connect(path)
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (self.table_name,),
+            ).fetchone()
+            if exists:
+                return
+            conn.executescript(Path(self.schema_path).read_text(encoding="utf-8"))
+            if self.table_name != _SCHEMA_TABLE:
+                # RENAME 会同时改写引用这张表的索引、视图和触发器
+                conn.execute(
+                    f'ALTER TABLE {_SCHEMA_TABLE} RENAME TO "{self.table_name}"'
+                )
+                conn.commit()
+        finally:
+            conn.close()
+
+    def _open_shard(self, path: Path) -> SqliteStorage:
+        """打开（不存在则创建）一个分片，每个分片使用独立的写锁"""
+        with self._lock:
+            storage = self._shards.get(path)
+            if storage is None:
+                self._create_tables(path)
+                storage = SqliteStorage(
+                    sqlite_path=str(path),
+                    table_name=self.table_name,
+                    lock=threading.Lock(),
+                    **self.shard_options,
+                )
+                self._shards[path] = storage
+                logger.debug(f"Opened shard {path}")
+            return storage
+
+    def shard(self, source_platform: str) -> SqliteStorage:
+        """获取（不存在则创建）某个平台的分片"""
+        return self._open_shard(self._shard_path(source_platform))
+
+    @staticmethod
+    def _shard_name(storage: SqliteStorage) -> str:
+        return Path(storage.sqlite_path).stem
+
+    def _each_shard(self) -> Iterator[SqliteStorage]:
+        """依次打开已有的分片，用于维护命令，无法打开的分片会被跳过"""
+        for path in self._shard_paths():
+            try:
+                storage = self._open_shard(path)
+            except sqlite3.DatabaseError as e:
+                logger.error(f"Skip unreadable shard {path}: {e}")
+                continue
+            yield storage
+
+    @staticmethod
+    def _group_by_platform(items: Iterable, platform_of) -> dict[str, list]:
+        groups: dict[str, list] = {}
+        for x in items:
+            groups.setdefault(platform_of(x), []).append(x)
+        return groups
+
+    def save(self, item: Item) -> SaveResult:
+        return self.shard(item.source_platform).save(item)
+
+    def save_batch(self, items: list[Item]) -> SaveResult:
+        total = SaveResult()
+        groups = self._group_by_platform(items, lambda x: x.source_platform)
+        for platform, platform_items in groups.items():
+            result = self.shard(platform).save_batch(platform_items)
+            total.inserted += result.inserted
+            total.updated += result.updated
+        return total
+
+    def touch(self, keys: Iterable[tuple[str, str]], seen_at: int | None = None) -> int:
+        groups = self._group_by_platform(keys, lambda x: x[0])
+        return sum(
+            self.shard(platform).touch(platform_keys, seen_at)
+            for platform, platform_keys in groups.items()
+        )
+
+    def mark_closed(
+        self,
+        seen_ids: set[str],
+        filters: dict[str, Any],
+        closed_at: int | None = None,
+    ) -> int:
+        if "source_platform" not in filters:
+            raise ValueError("mark_closed requires a source_platform filter")
+        return self.shard(filters["source_platform"]).mark_closed(
+            seen_ids, filters, closed_at
+        )
+
+    @staticmethod
+    def _attach(conn: sqlite3.Connection, alias: str, path: Path) -> None:
+        """只读 ATTACH 一个分片，无法打开时抛出 sqlite3.DatabaseError"""
+        uri = path.resolve().as_uri() + "?mode=ro"
+        conn.execute(f"ATTACH DATABASE ? AS {alias}", (uri,))
+        conn.execute(f"SELECT 1 FROM {alias}.sqlite_master LIMIT 1")
+
+    def _federated_tables(self) -> tuple[str, ...]:
+        return (self.table_name, *_FEDERATED_TABLES)
+
+    def _attach_group(self, paths: list[Path]) -> tuple[sqlite3.Connection, dict]:
+        """
+        把一组分片 ATTACH 到内存数据库，返回连接和每张表在各分片中的列：
+        {表名: {别名: 列名列表}}，分片中不存在的表不会出现
+        """
+        conn = sqlite3.connect(":memory:")
+        try:
+            aliases = []
+            for i, path in enumerate(paths):
+                self._attach(conn, f"shard{i}", path)
+                aliases.append(f"shard{i}")
+            present = {}
+            for table in self._federated_tables():
+                cols = {alias: _table_columns(conn, alias, table) for alias in aliases}
+                present[table] = {alias: c for alias, c in cols.items() if c}
+            return conn, present
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+
+    @staticmethod
+    def _create_views(
+        conn: sqlite3.Connection, present: dict, columns: dict[str, list[str]]
+    ) -> None:
+        """
+        每张表创建一个 UNION ALL 的临时视图，列为 columns 中的全部列；
+        这组分片都没有但其他分片有的表创建为空视图
+        """
+        for table, by_alias in present.items():
+            if not columns[table]:
+                continue
+            selects = [
+                _select_sql(alias, table, cols, columns[table])
+                for alias, cols in by_alias.items()
+            ]
+            if not selects:
+                nulls = ", ".join(f"NULL AS {col}" for col in columns[table])
+                selects = [f"SELECT {nulls} WHERE 0"]
+            conn.execute(f"CREATE TEMP VIEW {table} AS {' UNION ALL '.join(selects)}")
+
+    def federated_query(self, sql: str, params: list[Any] | None = None) -> list[tuple]:
+        """
+        在所有分片组成的联合表上执行只读查询，sql 中直接使用 table_name 或 job_stats 作为表名。
+        联合表的列为各分片列的并集，分片中缺少的列为 NULL。
+
+        分片数不超过 ATTACH 上限时整体执行，任何查询的结果都与单库一致；
+        超过时每组 ATTACH 上限个分片分别执行再拼接，只支持逐行的查询，
+        包含聚合、排序、DISTINCT、LIMIT 等的查询抛出 ValueError。
+        分片无法打开或查询出错时抛出 sqlite3.DatabaseError。
+        """
+        params = params or []
+        paths = self._shard_paths()
+        groups = [
+            paths[i : i + _MAX_ATTACHED] for i in range(0, len(paths), _MAX_ATTACHED)
+        ]
+        attached = []
+        try:
+            # 先打开所有组，得到各表在全部分片中的列，每组的视图使用相同的列
+            for group in groups:
+                attached.append(self._attach_group(group))
+            columns: dict[str, list[str]] = {}
+            for _, present in attached:
+                for table, by_alias in present.items():
+                    known = columns.setdefault(table, [])
+                    known.extend(
+                        c for cols in by_alias.values() for c in cols if c not in known
+                    )
+            for conn, present in attached:
+                self._create_views(conn, present, columns)
+            if len(attached) > 1 and not _is_row_wise(attached[0][0], sql, params):
+                raise ValueError(
+                    f"{len(paths)} shards exceed the ATTACH limit of {_MAX_ATTACHED}, "
+                    f"only row-wise queries can be federated: {sql}"
+                )
+            rows = []
+            for conn, _ in attached:
+                rows.extend(conn.execute(sql, params).fetchall())
+            return rows
+        finally:
+            for conn, _ in attached:
+                conn.close()
+
+    def query_rows(self, sql: str, params: list[Any] | None = None) -> list[tuple]:
+        return self.federated_query(sql, params)
+
+    def fetch_all_fingerprints(self, filters: dict[str, Any] | None = None) -> set[str]:
+        """
+        各分片 job_id 的并集。与单库不同，读取失败时抛出异常而不是返回空集合，
+        避免爬虫把所有职位当作新职位重新保存
+        """
+        filters = filters or {}
+        # 指定了平台时只需要读对应的分片
+        if "source_platform" in filters:
+            if not self._shard_path(filters["source_platform"]).exists():
+                return set()
+            return self.shard(filters["source_platform"])._query_fingerprints(filters)
+        fingerprints = set()
+        for path in self._shard_paths():
+            fingerprints |= self._open_shard(path)._query_fingerprints(filters)
+        return fingerprints
+
+    def iter_items(
+        self,
+        crawled_after: int | None = None,
+        chunk_size: int = 1000,
+        open_only: bool = False,
+    ) -> Iterator[list[Item]]:
+        """依次只读打开每个分片分块读取，压缩存储的文本由分片负责解压"""
+        for path in self._shard_paths():
+            storage = SqliteStorage(
+                sqlite_path=str(path), table_name=self.table_name, read_only=True
+            )
+            try:
+                yield from storage.iter_items(crawled_after, chunk_size, open_only)
+            except sqlite3.DatabaseError as e:
+                logger.error(f"Failed to read shard {path}: {e}")
+            finally:
+                storage.close()
+
+    def search(
+        self, query: str, limit: int = 20, source_platform: str | None = None
+    ) -> list[Item]:
+        """
+        在每个分片的全文索引中检索，按 bm25 分数合并。
+        各分片的 bm25 基于自己的词频统计，跨分片的排序是近似的。
+        """
+        if source_platform:
+            if not self._shard_path(source_platform).exists():
+                return []
+            return self.shard(source_platform).search(query, limit, source_platform)
+        scored = []
+        for storage in self._each_shard():
+            scored.extend(storage.search_scored(query, limit))
+        return [item for _, item in heapq.nsmallest(limit, scored, key=lambda x: x[0])]
+
+    def rebuild_side_tables(self, chunk_size: int = 1000) -> int:
+        return sum(x.rebuild_side_tables(chunk_size) for x in self._each_shard())
+
+    def rebuild_fts(self, chunk_size: int = 1000) -> int:
+        return sum(x.rebuild_fts(chunk_size) for x in self._each_shard())
+
+    def rebuild_stats(self, chunk_size: int = 1000) -> int:
+        return sum(x.rebuild_stats(chunk_size) for x in self._each_shard())
+
+    def compact_texts(self, chunk_size: int = 1000) -> int:
+        return sum(x.compact_texts(chunk_size) for x in self._each_shard())
+
+    def train_text_dictionaries(
+        self, dict_size: int = 64 * 1024, max_samples: int = 5000
+    ) -> dict[str, int]:
+        trained: dict[str, int] = {}
+        for storage in self._each_shard():
+            trained.update(storage.train_text_dictionaries(dict_size, max_samples))
+        return trained
+
+    def vacuum(self) -> None:
+        for storage in self._each_shard():
+            storage.vacuum()
+
+    def read_changes(
+        self, since: int | dict[str, int] = 0, limit: int = 1000
+    ) -> list[JobChange]:
+        """
+        读取各分片 job_changes 中游标之后的至多 limit 条变更，JobChange.shard 为所在的分片。
+        since 为 {分片名: seq} 的复合游标（0 表示从头读取），各分片内按 seq 升序、
+        分片之间按 changed_at 合并；下游用 change_log.advance_cursor 得到下一次的 since。
+        """
+        if isinstance(since, int):
+            if since:
+                raise ValueError(
+                    "sharded storage needs a {shard: seq} cursor, seq is per shard"
+                )
+            since = {}
+        streams = []
+        for path in self._shard_paths():
+            storage = self._open_shard(path)
+            name = self._shard_name(storage)
+            changes = storage.read_changes(since.get(name, 0), limit)
+            for change in changes:
+                change.shard = name
+            streams.append(changes)
+        # 每个分片取出的都是 seq 连续的一段，合并后截断仍然可以用复合游标继续读取
+        merged = heapq.merge(*streams, key=lambda x: x.changed_at)
+        return list(itertools.islice(merged, limit))
+
+    def close(self) -> None:
+        with self._lock:
+            for storage in self._shards.values():
+                storage.close()
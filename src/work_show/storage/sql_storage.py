@@ -1,16 +1,121 @@
 import sqlite3
 import json
+import re
 import threading
+import time
 from dataclasses import dataclass, field
-from typing import Any, Tuple
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Tuple
 from threading import Lock
 
 from ..core.protocols import DataStorage
 from ..core.models import Item
 from ..utils.logger import get_logger
+from .change_log import (
+    CHANGE_TABLE_SQL,
+    PAUSE_CHANGES_SQL,
+    RESUME_CHANGES_SQL,
+    JobChange,
+    change_triggers_sql,
+)
+from .fts import build_match_query, segment_cjk
+from .stats import (
+    STATS_CLEANUP_SQL,
+    STATS_TABLE_SQL,
+    STATS_UPSERT_SQL,
+    StatsRecord,
+    add_deltas,
+    delta_rows,
+)
+from .text_store import TEXT_TABLES_SQL, TextCodec, text_hash, train_dictionary
 
 logger = get_logger(__name__)
 
+# jobs 表中由 Item 写入的列，顺序与 _adapt_item 返回的元组一致
+_COLUMNS = (
+    "job_id",
+    "company_name",
+    "source_platform",
+    "work_type",
+    "job_url",
+    "title",
+    "city",
+    "category",
+    "experience_req",
+    "education_req",
+    "job_level",
+    "salary_min",
+    "salary_max",
+    "description",
+    "description_keywords",
+    "requirement",
+    "requirement_keywords",
+    "publish_date",
+    "crawl_date",
+    "extra_info",
+    "description_hash",
+    "requirement_hash",
+)
+# 后来新增的普通列，旧数据库启动时自动补上
+_ADDED_COLUMNS = {
+    "extra_info": "TEXT",
+    "description_hash": "TEXT",
+    "requirement_hash": "TEXT",
+    "first_seen": "INTEGER",
+    "last_seen": "INTEGER",
+    "closed_at": "INTEGER",
+}
+# 职位生命周期列，由写入、touch 和 mark_closed 维护，不属于 Item
+_LIFECYCLE_COLUMNS = ("first_seen", "last_seen")
+# (source_platform, job_id) 唯一键，UPSERT 冲突时不更新这两列
+_KEY_COLUMNS = ("source_platform", "job_id")
+# extra_info 中可以声明为生成列的 key 只允许是合法标识符
+_EXTRA_KEY_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# 统计表需要的列，旧行按这个顺序读出后转换为 StatsRecord
+_STATS_SOURCE_COLUMNS = (
+    "source_platform, city, category, education_req, experience_req, "
+    "work_type, publish_date, salary_min, salary_max"
+)
+# SQLite 单条语句的参数个数上限较低，IN (...) 查询时分块
+_IN_CHUNK_SIZE = 500
+
+# 城市、关键字的规范化副表，一行一个值，值列上有索引
+_SIDE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS job_city (
+    source_platform TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    city TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_city_city ON job_city (city, source_platform, job_id);
+CREATE INDEX IF NOT EXISTS idx_job_city_job ON job_city (source_platform, job_id);
+CREATE TABLE IF NOT EXISTS job_keyword (
+    source_platform TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    keyword TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_keyword_keyword ON job_keyword (keyword, kind);
+CREATE INDEX IF NOT EXISTS idx_job_keyword_job ON job_keyword (source_platform, job_id);
+"""
+
+
+def _as_list(value) -> list:
+    """city/keywords 可能是 list、单个字符串或 None，统一成去重后的 list"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return [x for x in dict.fromkeys(value) if x]
+
+
+def _loads_json(value):
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return None
+
 
 # 一个虚拟的锁，什么也不做，用于单线程向后兼容
 class DummyLock:
@@ -21,16 +126,45 @@ class DummyLock:
         pass
 
 
+@dataclass
+class SaveResult:
+    """一次写入中新插入和被更新的行数"""
+
+    inserted: int = 0
+    updated: int = 0
+
+
 @dataclass
 class SqliteStorage(DataStorage):
     sqlite_path: str
     table_name: str
     lock: Lock = field(default_factory=DummyLock)
+    # 开启后在 (source_platform, job_id) 上建立唯一索引，写入使用 INSERT ... ON CONFLICT DO UPDATE；
+    # 表上已经有这个唯一索引（sql/create_table.sql 建的表都有）时总是开启，否则重复写入会违反唯一约束
+    upsert: bool = False
+    # 开启后同步维护 job_city / job_keyword 副表
+    side_tables: bool = False
+    # 开启后同步维护 FTS5 全文索引表 {table_name}_fts
+    full_text: bool = False
+    # extra_info 中的热点 key，会被建成带索引的虚拟生成列 extra_<key>
+    extra_info_keys: list[str] = field(default_factory=list)
+    # 开启后描述和要求按内容哈希去重并压缩存入 job_text，jobs 表只保存哈希
+    compress_text: bool = False
+    # 开启后在同一事务中维护仪表板使用的预聚合统计表 job_stats
+    stats: bool = False
+    # 开启后通过触发器把插入、更新、关闭等变更记录到 job_changes，供下游增量消费
+    change_log: bool = False
+    # 只读打开：不建表、不迁移，连接使用 mode=ro，用于分片存储等只读取已有数据库的场景
+    read_only: bool = False
 
     def __post_init__(self):
         # 使用 threading.local() 来存储每个线程独立的数据库连接
         self._local = threading.local()
-        
+        self._codec = TextCodec()
+        self._company_dicts: dict[str, int] = {}  # 公司 -> 最新的压缩字典 id
+        if self.read_only:
+            return
+
         # 初始化数据库设置：启用 WAL 模式以提高并发性能
         try:
             with sqlite3.connect(self.sqlite_path) as conn:
@@ -39,13 +173,134 @@ class SqliteStorage(DataStorage):
         except Exception as e:
             logger.warning(f"Failed to enable WAL mode: {e}")
 
+        self._ensure_columns()
+        if not self.upsert and self._has_unique_index():
+            self.upsert = True
+        if self.upsert:
+            self._ensure_unique_index()
+        if self.side_tables:
+            self._get_conn().executescript(_SIDE_TABLES_SQL)
+        if self.full_text:
+            self._get_conn().executescript(self._fts_sql())
+        if self.compress_text:
+            self._get_conn().executescript(TEXT_TABLES_SQL)
+            self._load_dictionaries()
+        if self.stats:
+            self._get_conn().executescript(STATS_TABLE_SQL)
+        if self.change_log:
+            self._ensure_change_log()
+
+    def _ensure_columns(self) -> None:
+        """
+        旧数据库缺少后来新增的列时补上；再为配置中 extra_info 的热点 key 添加虚拟生成列和索引。
+        虚拟列不占存储，写入仍然只有一次 INSERT。
+        """
+        with self.lock:
+            conn = self._get_conn()
+            columns = {
+                row[1] for row in conn.execute(f"PRAGMA table_xinfo({self.table_name})")
+            }
+            if not columns:
+                return  # 表还不存在，由 sql/create_table.sql 负责建表
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(
+                        f"ALTER TABLE {self.table_name} ADD COLUMN {column} {column_type}"
+                    )
+                    logger.info(f"Added {column} column to {self.table_name}")
+                    if column in _LIFECYCLE_COLUMNS:
+                        # 旧数据没有生命周期信息，以爬取时间作为首次和最后一次看到的时间
+                        conn.execute(
+                            f"UPDATE {self.table_name} SET {column} = crawl_date"
+                        )
+            # 只包含未关闭职位的部分索引，用于查询在招职位和 mark_closed
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_open "
+                f"ON {self.table_name} (source_platform, job_id) WHERE closed_at IS NULL"
+            )
+            for key in self.extra_info_keys:
+                if not _EXTRA_KEY_PATTERN.match(key):
+                    raise ValueError(
+                        f"Invalid extra_info key for generated column: {key}"
+                    )
+                column = f"extra_{key}"
+                if column not in columns:
+                    conn.execute(
+                        f"ALTER TABLE {self.table_name} ADD COLUMN {column} "
+                        f"GENERATED ALWAYS AS (json_extract(extra_info, '$.{key}')) VIRTUAL"
+                    )
+                    logger.info(f"Added generated column {column} to {self.table_name}")
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_{column} "
+                    f"ON {self.table_name} ({column})"
+                )
+            conn.commit()
+
+    @property
+    def _unique_index_name(self) -> str:
+        return f"idx_{self.table_name}_platform_job_id"
+
+    def _has_unique_index(self) -> bool:
+        """表上是否已经有 (source_platform, job_id) 的唯一索引"""
+        conn = self._get_conn()
+        for row in conn.execute(f"PRAGMA index_list({self.table_name})"):
+            name, unique = row[1], row[2]
+            if not unique:
+                continue
+            columns = [x[2] for x in conn.execute(f"PRAGMA index_info({name})")]
+            if columns == ["source_platform", "job_id"]:
+                return True
+        return False
+
+    def _ensure_unique_index(self) -> None:
+        """
+        在线迁移：删除 (source_platform, job_id) 重复的旧行（保留最后写入的一行），
+        然后建立唯一索引。整个过程在一个 IMMEDIATE 事务中完成，WAL 模式下读不受影响。
+        """
+        with self.lock:
+            conn = self._get_conn()
+            if self._has_unique_index():
+                return
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                cursor = conn.execute(f"""
+                    DELETE FROM {self.table_name}
+                    WHERE job_id IS NOT NULL AND rowid NOT IN (
+                        SELECT MAX(rowid) FROM {self.table_name}
+                        GROUP BY source_platform, job_id
+                    )
+                    """)
+                removed = cursor.rowcount
+                conn.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {self._unique_index_name} "
+                    f"ON {self.table_name} (source_platform, job_id)"
+                )
+                conn.commit()
+                logger.info(
+                    f"Created unique index on {self.table_name}, removed {removed} duplicate rows"
+                )
+            except Exception as e:
+                conn.rollback()
+                logger.error(
+                    f"Failed to migrate {self.table_name} to unique index: {e}"
+                )
+                raise e
+
     def _get_conn(self) -> sqlite3.Connection:
         """
         获取当前线程的数据库连接。如果不存在则创建一个。
         """
         if not hasattr(self._local, "conn"):
             # check_same_thread=False 虽然在 thread_local 下不是严格必需，但保持灵活性
-            self._local.conn = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            if self.read_only:
+                uri = Path(self.sqlite_path).resolve().as_uri() + "?mode=ro"
+                self._local.conn = sqlite3.connect(
+                    uri, uri=True, check_same_thread=False
+                )
+            else:
+                self._local.conn = sqlite3.connect(
+                    self.sqlite_path, check_same_thread=False
+                )
             # 设置忙等待超时，防止 'database is locked' 错误
             self._local.conn.execute("PRAGMA busy_timeout = 30000;")  # 30秒
         return self._local.conn
@@ -54,7 +309,15 @@ class SqliteStorage(DataStorage):
         """
         将 Item 对象转换为适合 SQLite 插入的元组。
         复杂类型 (list, dict) 被序列化为 JSON 字符串。
+        压缩文本模式下描述和要求只保存哈希，正文由 _store_texts 写入 job_text。
         """
+        description, requirement = item.description, item.requirement
+        description_hash = requirement_hash = None
+        if self.compress_text:
+            if description:
+                description_hash, description = text_hash(description), None
+            if requirement:
+                requirement_hash, requirement = text_hash(requirement), None
         return (
             item.job_id,
             item.company_name,
@@ -69,88 +332,845 @@ class SqliteStorage(DataStorage):
             item.job_level,
             item.salary_min,
             item.salary_max,
-            item.description,
+            description,
             json.dumps(item.description_keywords, ensure_ascii=False),  # list -> json
-            item.requirement,
+            requirement,
             json.dumps(item.requirement_keywords, ensure_ascii=False),  # list -> json
             item.publish_date,
             item.crawl_date,
+            (
+                json.dumps(item.extra_info, ensure_ascii=False)
+                if item.extra_info is not None
+                else None
+            ),  # dict -> json
+            description_hash,
+            requirement_hash,
+        )
+
+    def _insert_sql(self) -> str:
+        insert_columns = _COLUMNS + _LIFECYCLE_COLUMNS
+        columns = ", ".join(insert_columns)
+        placeholders = ", ".join("?" for _ in insert_columns)
+        sql = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
+        if self.upsert:
+            # 重新写入说明职位仍在招聘：保留 first_seen，刷新 last_seen 并清除 closed_at
+            updates = ", ".join(
+                [
+                    *(
+                        f"{col} = excluded.{col}"
+                        for col in _COLUMNS
+                        if col not in _KEY_COLUMNS
+                    ),
+                    "last_seen = excluded.last_seen",
+                    "closed_at = NULL",
+                ]
+            )
+            sql += f" ON CONFLICT (source_platform, job_id) DO UPDATE SET {updates}"
+        return sql
+
+    def _select_by_keys(
+        self, cursor: sqlite3.Cursor, items: list[Item], columns: str
+    ) -> list[tuple]:
+        """
+        按这批 item 的 (source_platform, job_id) 查询 jobs 表，
+        按平台分组并分块使用 IN (...)，走唯一索引。
+        """
+        by_platform: dict[str, list[str]] = {}
+        for item in items:
+            by_platform.setdefault(item.source_platform, []).append(item.job_id)
+        rows = []
+        for platform, job_ids in by_platform.items():
+            for i in range(0, len(job_ids), _IN_CHUNK_SIZE):
+                chunk = job_ids[i : i + _IN_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(
+                    f"SELECT {columns} FROM {self.table_name} "
+                    f"WHERE source_platform = ? AND job_id IN ({placeholders})",
+                    [platform, *chunk],
+                )
+                rows.extend(cursor.fetchall())
+        return rows
+
+    def _existing_keys(
+        self, cursor: sqlite3.Cursor, items: list[Item]
+    ) -> set[tuple[str, str]]:
+        """查询这批 item 中已经存在于表中的 key，用于区分插入和更新"""
+        return set(self._select_by_keys(cursor, items, "source_platform, job_id"))
+
+    def _write_items(self, cursor: sqlite3.Cursor, items: list[Item]) -> SaveResult:
+        """在当前事务中写入一批 item（包括副表），返回插入和更新的行数"""
+        # 先开启写事务，保证查询已有 key 与写入之间不会被其他进程插入
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        result = SaveResult()
+        if self.upsert:
+            existing = self._existing_keys(cursor, items)
+            # 同一批里重复的 key 只算一次插入，其余算更新
+            for item in items:
+                key = (item.source_platform, item.job_id)
+                if key in existing:
+                    result.updated += 1
+                else:
+                    result.inserted += 1
+                    existing.add(key)
+        else:
+            result.inserted = len(items)
+        if self.compress_text:
+            self._store_texts(cursor, items)
+        if self.stats:
+            # 需要在覆盖旧行之前读取旧值，从统计中减去
+            self._write_stats(cursor, items)
+        now = int(time.time())
+        cursor.executemany(
+            self._insert_sql(),
+            [
+                (*self._adapt_item(x), x.crawl_date or now, x.crawl_date or now)
+                for x in items
+            ],
+        )
+        if self.side_tables:
+            self._write_side_tables(cursor, items)
+        if self.full_text:
+            self._write_fts(cursor, items)
+        return result
+
+    @property
+    def _fts_table(self) -> str:
+        return f"{self.table_name}_fts"
+
+    def _fts_sql(self) -> str:
+        # rowid 与 jobs 表的 rowid 一致；写入前由 segment_cjk 把中文切成二元组
+        return f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {self._fts_table} USING fts5(
+                title, description, requirement,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+        """
+
+    @staticmethod
+    def _fts_row(rowid: int, title, description, requirement) -> tuple:
+        return (
+            rowid,
+            segment_cjk(title),
+            segment_cjk(description),
+            segment_cjk(requirement),
+        )
+
+    def _write_fts(self, cursor: sqlite3.Cursor, items: list[Item]) -> None:
+        """按 rowid 替换这批 item 在全文索引中的内容"""
+        latest = {(x.source_platform, x.job_id): x for x in items}
+        rows = self._select_by_keys(cursor, items, "rowid, source_platform, job_id")
+        cursor.executemany(
+            f"DELETE FROM {self._fts_table} WHERE rowid = ?",
+            [(rowid,) for rowid, _, _ in rows],
+        )
+        fts_rows = []
+        for rowid, platform, job_id in rows:
+            item = latest[(platform, job_id)]
+            fts_rows.append(
+                self._fts_row(rowid, item.title, item.description, item.requirement)
+            )
+        cursor.executemany(
+            f"INSERT INTO {self._fts_table} (rowid, title, description, requirement) "
+            f"VALUES (?, ?, ?, ?)",
+            fts_rows,
+        )
+
+    def rebuild_fts(self, chunk_size: int = 1000) -> int:
+        """从 jobs 表重建全文索引，返回处理的行数"""
+        with self.lock:
+            conn = self._get_conn()
+            conn.executescript(self._fts_sql())
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(f"DELETE FROM {self._fts_table}")
+                reader = conn.execute(
+                    f"SELECT rowid, title, description, requirement, "
+                    f"description_hash, requirement_hash "
+                    f"FROM {self.table_name} ORDER BY rowid"
+                )
+                writer = conn.cursor()
+                total = 0
+                while rows := reader.fetchmany(chunk_size):
+                    texts = self._load_texts(conn, [h for row in rows for h in row[4:]])
+                    writer.executemany(
+                        f"INSERT INTO {self._fts_table} "
+                        f"(rowid, title, description, requirement) VALUES (?, ?, ?, ?)",
+                        [
+                            self._fts_row(
+                                rowid,
+                                title,
+                                description or texts.get(description_hash),
+                                requirement or texts.get(requirement_hash),
+                            )
+                            for rowid, title, description, requirement, description_hash, requirement_hash in rows
+                        ],
+                    )
+                    total += len(rows)
+                conn.commit()
+                # 合并 b-tree 段，提高查询速度
+                conn.execute(
+                    f"INSERT INTO {self._fts_table} ({self._fts_table}) VALUES ('optimize')"
+                )
+                conn.commit()
+                logger.info(f"Rebuilt {self._fts_table} from {total} rows")
+                return total
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to rebuild full text index: {e}")
+                raise e
+
+    def search(
+        self, query: str, limit: int = 20, source_platform: str | None = None
+    ) -> list[Item]:
+        """
+        全文检索标题、描述和要求，按 bm25 排序（标题权重更高）。
+        query 为空格分隔的多个词，所有词都需要命中，如 "Rust Kubernetes"。
+        """
+        return [item for _, item in self.search_scored(query, limit, source_platform)]
+
+    def search_scored(
+        self, query: str, limit: int = 20, source_platform: str | None = None
+    ) -> list[tuple[float, Item]]:
+        """search 的带分数版本，返回 (bm25 分数, Item)，分数越小越相关"""
+        match = build_match_query(query)
+        if not match:
+            return []
+        columns = ", ".join(f"j.{col}" for col in _COLUMNS)
+        score = f"bm25({self._fts_table}, 5.0, 1.0, 1.0)"
+        sql = (
+            f"SELECT {score}, {columns} FROM {self._fts_table} f "
+            f"JOIN {self.table_name} j ON j.rowid = f.rowid "
+            f"WHERE {self._fts_table} MATCH ?"
+        )
+        params: list[Any] = [match]
+        if source_platform:
+            sql += " AND j.source_platform = ?"
+            params.append(source_platform)
+        sql += " ORDER BY 1 LIMIT ?"
+        params.append(limit)
+        rows = self._get_conn().execute(sql, params).fetchall()
+        items = self._rows_to_items([row[1:] for row in rows])
+        return [(row[0], item) for row, item in zip(rows, items)]
+
+    def _rows_to_items(self, rows: list[tuple]) -> list[Item]:
+        """把按 _COLUMNS 顺序的多行还原为 Item，压缩存储的文本会被透明解压"""
+        hashes = [
+            row[_COLUMNS.index(col)]
+            for row in rows
+            for col in ("description_hash", "requirement_hash")
+        ]
+        texts = self._load_texts(self._get_conn(), hashes)
+        return [self._row_to_item(row, texts) for row in rows]
+
+    @staticmethod
+    def _row_to_item(row: tuple, texts: dict[str, str] | None = None) -> Item:
+        """_adapt_item 的逆过程：把按 _COLUMNS 顺序的一行还原为 Item"""
+        data = dict(zip(_COLUMNS, row))
+        for key in (
+            "city",
+            "description_keywords",
+            "requirement_keywords",
+            "extra_info",
+        ):
+            data[key] = _loads_json(data[key])
+        for key in ("description", "requirement"):
+            content_hash = data.pop(f"{key}_hash")
+            if data[key] is None and content_hash and texts:
+                data[key] = texts.get(content_hash)
+        return Item(**data).compact()
+
+    def iter_items(
+        self,
+        crawled_after: int | None = None,
+        chunk_size: int = 1000,
+        open_only: bool = False,
+    ) -> Iterator[list[Item]]:
+        """
+        按 rowid 顺序分块读取职位，crawled_after 不为空时只返回 crawl_date 更新的行，
+        open_only 为 True 时只返回尚未关闭的职位。每块单独查询，不会长时间持有读事务。
+        """
+        columns = ", ".join(_COLUMNS)
+        conn = self._get_conn()
+        last_rowid = 0
+        while True:
+            sql = f"SELECT rowid, {columns} FROM {self.table_name} WHERE rowid > ?"
+            params: list[Any] = [last_rowid]
+            if crawled_after is not None:
+                sql += " AND crawl_date > ?"
+                params.append(crawled_after)
+            if open_only:
+                sql += " AND closed_at IS NULL"
+            sql += " ORDER BY rowid LIMIT ?"
+            params.append(chunk_size)
+            rows = conn.execute(sql, params).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            yield self._rows_to_items([row[1:] for row in rows])
+
+    def _load_dictionaries(self) -> None:
+        """加载所有压缩字典，记录每家公司最新的字典"""
+        rows = self._get_conn().execute(
+            "SELECT dict_id, company_name, data FROM job_text_dict ORDER BY dict_id"
         )
+        for dict_id, company_name, data in rows:
+            try:
+                self._codec.add_dictionary(dict_id, data)
+                self._company_dicts[company_name] = dict_id
+            except RuntimeError as e:
+                # 只跳过这一个字典，后面的字典仍要加载，否则用它们压缩的文本无法解压
+                logger.warning(f"Skip compression dictionary {dict_id}: {e}")
+                continue
+
+    def _store_texts(self, cursor: sqlite3.Cursor, items: list[Item]) -> None:
+        """把这批 item 的描述和要求按内容哈希写入 job_text，已经存在的文本不会重复压缩"""
+        texts: dict[str, tuple[str, str | None]] = {}
+        for item in items:
+            for text in (item.description, item.requirement):
+                if text:
+                    texts.setdefault(text_hash(text), (text, item.company_name))
+        if not texts:
+            return
+        existing = set()
+        hashes = list(texts)
+        for i in range(0, len(hashes), _IN_CHUNK_SIZE):
+            chunk = hashes[i : i + _IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(
+                f"SELECT hash FROM job_text WHERE hash IN ({placeholders})", chunk
+            )
+            existing.update(row[0] for row in cursor.fetchall())
+        rows = []
+        for content_hash, (text, company_name) in texts.items():
+            if content_hash in existing:
+                continue
+            codec, dict_id, data = self._codec.compress(
+                text, self._company_dicts.get(company_name)
+            )
+            rows.append((content_hash, codec, dict_id, data))
+        cursor.executemany(
+            "INSERT OR IGNORE INTO job_text (hash, codec, dict_id, data) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    def _load_texts(self, conn: sqlite3.Connection, hashes: list) -> dict[str, str]:
+        """按哈希批量读取并解压文本"""
+        hashes = list({x for x in hashes if x})
+        texts = {}
+        for i in range(0, len(hashes), _IN_CHUNK_SIZE):
+            chunk = hashes[i : i + _IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT hash, codec, dict_id, data FROM job_text "
+                f"WHERE hash IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for content_hash, codec, dict_id, data in rows:
+                if dict_id is not None and not self._codec.has_dictionary(dict_id):
+                    self._load_dictionaries()
+                texts[content_hash] = self._codec.decompress(codec, dict_id, data)
+        return texts
 
-    def save(self, item: Item) -> None:
+    def compact_texts(self, chunk_size: int = 1000) -> int:
+        """
+        把已有行中明文存储的描述和要求迁移到 job_text，并清理不再被引用的文本。
+        每个分块一个事务，迁移过程中可以正常读写。返回迁移的行数。
+        """
+        conn = self._get_conn()
+        conn.executescript(TEXT_TABLES_SQL)
+        # 迁移只改变存储方式，不改变内容，开启了变更日志时暂停记录，避免产生大量 update
+        capture = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+            "AND name = 'job_changes_paused'"
+        ).fetchone()
+        total, last_rowid = 0, 0
+        while True:
+            with self.lock:
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    rows = conn.execute(
+                        f"SELECT rowid, company_name, description, requirement "
+                        f"FROM {self.table_name} WHERE rowid > ? "
+                        f"AND (description IS NOT NULL OR requirement IS NOT NULL) "
+                        f"ORDER BY rowid LIMIT ?",
+                        (last_rowid, chunk_size),
+                    ).fetchall()
+                    if not rows:
+                        conn.execute(f"""
+                            DELETE FROM job_text WHERE hash NOT IN (
+                                SELECT description_hash FROM {self.table_name}
+                                WHERE description_hash IS NOT NULL
+                                UNION
+                                SELECT requirement_hash FROM {self.table_name}
+                                WHERE requirement_hash IS NOT NULL
+                            )
+                            """)
+                        conn.commit()
+                        break
+                    items = [
+                        Item(
+                            job_id="",
+                            company_name=company_name,
+                            description=description,
+                            requirement=requirement,
+                        )
+                        for _, company_name, description, requirement in rows
+                    ]
+                    cursor = conn.cursor()
+                    self._store_texts(cursor, items)
+                    if capture:
+                        cursor.execute(PAUSE_CHANGES_SQL, ("compact_texts",))
+                    cursor.executemany(
+                        f"UPDATE {self.table_name} SET "
+                        f"description_hash = COALESCE(?, description_hash), "
+                        f"requirement_hash = COALESCE(?, requirement_hash), "
+                        f"description = NULL, requirement = NULL WHERE rowid = ?",
+                        [
+                            (
+                                text_hash(description) if description else None,
+                                text_hash(requirement) if requirement else None,
+                                rowid,
+                            )
+                            for rowid, _, description, requirement in rows
+                        ],
+                    )
+                    if capture:
+                        cursor.execute(RESUME_CHANGES_SQL)
+                    conn.commit()
+                    total += len(rows)
+                    last_rowid = rows[-1][0]
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Failed to compact texts: {e}")
+                    raise e
+        logger.info(f"Moved texts of {total} rows into job_text")
+        return total
+
+    def train_text_dictionaries(
+        self, dict_size: int = 64 * 1024, max_samples: int = 5000
+    ) -> dict[str, int]:
+        """
+        按公司训练 zstd 字典，并用新字典重新压缩该公司的文本。
+        需要安装 zstandard；返回 公司 -> 字典 id。
+        """
+        conn = self._get_conn()
+        conn.executescript(TEXT_TABLES_SQL)
+        companies = [
+            row[0]
+            for row in conn.execute(
+                f"SELECT DISTINCT company_name FROM {self.table_name} "
+                f"WHERE company_name IS NOT NULL"
+            )
+        ]
+        trained = {}
+        for company_name in companies:
+            hashes = [
+                h
+                for row in conn.execute(
+                    f"SELECT description_hash, requirement_hash FROM {self.table_name} "
+                    f"WHERE company_name = ?",
+                    (company_name,),
+                )
+                for h in row
+                if h
+            ]
+            hashes = list(dict.fromkeys(hashes))
+            texts = self._load_texts(conn, hashes[:max_samples])
+            data = train_dictionary(list(texts.values()), dict_size)
+            if data is None:
+                logger.warning(
+                    f"Not enough samples to train dictionary: {company_name}"
+                )
+                continue
+            with self.lock:
+                try:
+                    cursor = conn.execute(
+                        "INSERT INTO job_text_dict (company_name, data, created_at) "
+                        "VALUES (?, ?, strftime('%s', 'now'))",
+                        (company_name, data),
+                    )
+                    dict_id = cursor.lastrowid
+                    self._codec.add_dictionary(dict_id, data)
+                    self._company_dicts[company_name] = dict_id
+                    all_texts = self._load_texts(conn, hashes)
+                    conn.executemany(
+                        "UPDATE job_text SET codec = ?, dict_id = ?, data = ? "
+                        "WHERE hash = ?",
+                        [
+                            (*self._codec.compress(text, dict_id), content_hash)
+                            for content_hash, text in all_texts.items()
+                        ],
+                    )
+                    conn.commit()
+                    trained[company_name] = dict_id
+                    logger.info(
+                        f"Trained dictionary {dict_id} for {company_name} "
+                        f"and recompressed {len(all_texts)} texts"
+                    )
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Failed to train dictionary for {company_name}: {e}")
+                    raise e
+        return trained
+
+    @staticmethod
+    def _stats_record(item: Item) -> StatsRecord:
+        return StatsRecord(
+            source_platform=item.source_platform,
+            cities=_as_list(item.city),
+            category=item.category,
+            education_req=item.education_req,
+            experience_req=item.experience_req,
+            work_type=item.work_type,
+            publish_date=item.publish_date,
+            salary_min=item.salary_min,
+            salary_max=item.salary_max,
+        )
+
+    @staticmethod
+    def _stats_record_from_row(row: tuple) -> StatsRecord:
+        platform, city, *rest = row
+        return StatsRecord(platform, _as_list(_loads_json(city)), *rest)
+
+    def _write_stats(self, cursor: sqlite3.Cursor, items: list[Item]) -> None:
+        """UPSERT 模式下先减去被覆盖的旧行，再加上新行，把增量合并进 job_stats"""
+        deltas: dict[tuple, list[float]] = {}
+        if self.upsert:
+            # 同一批中重复的 key 以最后一次为准，和主表 UPSERT 的结果一致
+            items = list({(x.source_platform, x.job_id): x for x in items}.values())
+            for row in self._select_by_keys(cursor, items, _STATS_SOURCE_COLUMNS):
+                add_deltas(deltas, self._stats_record_from_row(row), -1)
+        for item in items:
+            add_deltas(deltas, self._stats_record(item), 1)
+        cursor.executemany(STATS_UPSERT_SQL, delta_rows(deltas))
+        cursor.execute(STATS_CLEANUP_SQL)
+
+    def rebuild_stats(self, chunk_size: int = 1000) -> int:
+        """根据 jobs 表重建 job_stats，用于回填已有数据。返回处理的行数。"""
+        with self.lock:
+            conn = self._get_conn()
+            conn.executescript(STATS_TABLE_SQL)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM job_stats")
+                reader = conn.execute(
+                    f"SELECT {_STATS_SOURCE_COLUMNS} FROM {self.table_name}"
+                )
+                deltas: dict[tuple, list[float]] = {}
+                total = 0
+                while rows := reader.fetchmany(chunk_size):
+                    for row in rows:
+                        add_deltas(deltas, self._stats_record_from_row(row), 1)
+                    total += len(rows)
+                conn.executemany(STATS_UPSERT_SQL, delta_rows(deltas))
+                conn.commit()
+                logger.info(f"Rebuilt job_stats from {total} rows")
+                return total
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to rebuild job_stats: {e}")
+                raise e
+
+    def _write_side_tables(self, cursor: sqlite3.Cursor, items: list[Item]) -> None:
+        """先删除这批 key 的旧副表数据，再写入新的城市和关键字"""
+        keys = list(dict.fromkeys((x.source_platform, x.job_id) for x in items))
+        cursor.executemany(
+            "DELETE FROM job_city WHERE source_platform = ? AND job_id = ?", keys
+        )
+        cursor.executemany(
+            "DELETE FROM job_keyword WHERE source_platform = ? AND job_id = ?", keys
+        )
+        city_rows, keyword_rows = self._side_rows(items)
+        cursor.executemany("INSERT INTO job_city VALUES (?, ?, ?)", city_rows)
+        cursor.executemany("INSERT INTO job_keyword VALUES (?, ?, ?, ?)", keyword_rows)
+
+    @staticmethod
+    def _side_rows(items: list[Item]) -> tuple[list[tuple], list[tuple]]:
+        city_rows, keyword_rows = {}, {}
+        for item in items:
+            key = (item.source_platform, item.job_id)
+            # 同一批中重复的 key 以最后一次为准，和主表 UPSERT 的结果一致
+            city_rows[key] = [(*key, city) for city in _as_list(item.city)]
+            keyword_rows[key] = [
+                (*key, kind, keyword)
+                for kind, keywords in (
+                    ("description", item.description_keywords),
+                    ("requirement", item.requirement_keywords),
+                )
+                for keyword in _as_list(keywords)
+            ]
+        return (
+            [row for rows in city_rows.values() for row in rows],
+            [row for rows in keyword_rows.values() for row in rows],
+        )
+
+    def rebuild_side_tables(self, chunk_size: int = 1000) -> int:
+        """
+        根据 jobs 表中的 JSON 字段重建 job_city / job_keyword，用于回填已有数据。
+        返回处理的行数。
+        """
+        with self.lock:
+            conn = self._get_conn()
+            conn.executescript(_SIDE_TABLES_SQL)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM job_city")
+                conn.execute("DELETE FROM job_keyword")
+                reader = conn.execute(
+                    f"SELECT source_platform, job_id, city, description_keywords, "
+                    f"requirement_keywords FROM {self.table_name} ORDER BY rowid"
+                )
+                writer = conn.cursor()
+                total = 0
+                while rows := reader.fetchmany(chunk_size):
+                    items = [
+                        Item(
+                            job_id=job_id,
+                            source_platform=platform,
+                            city=_loads_json(city),
+                            description_keywords=_loads_json(desc_keywords),
+                            requirement_keywords=_loads_json(req_keywords),
+                        )
+                        for platform, job_id, city, desc_keywords, req_keywords in rows
+                    ]
+                    city_rows, keyword_rows = self._side_rows(items)
+                    writer.executemany(
+                        "INSERT INTO job_city VALUES (?, ?, ?)", city_rows
+                    )
+                    writer.executemany(
+                        "INSERT INTO job_keyword VALUES (?, ?, ?, ?)", keyword_rows
+                    )
+                    total += len(rows)
+                conn.commit()
+                logger.info(f"Rebuilt job_city / job_keyword from {total} rows")
+                return total
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to rebuild side tables: {e}")
+                raise e
+
+    def find_job_keys(
+        self, cities: list[str] | None = None, keywords: list[str] | None = None
+    ) -> set[tuple[str, str]]:
+        """
+        通过副表索引查找包含任一城市、且包含任一关键字的职位 (source_platform, job_id)。
+        """
+        conn = self._get_conn()
+        result = None
+        for table, column, values in (
+            ("job_city", "city", cities),
+            ("job_keyword", "keyword", keywords),
+        ):
+            if not values:
+                continue
+            placeholders = ", ".join("?" for _ in values)
+            rows = conn.execute(
+                f"SELECT DISTINCT source_platform, job_id FROM {table} "
+                f"WHERE {column} IN ({placeholders})",
+                list(values),
+            ).fetchall()
+            keys = set(rows)
+            result = keys if result is None else result & keys
+        return result or set()
+
+    def save(self, item: Item) -> SaveResult:
         # 写入操作仍然建议加锁，以在应用层序列化写入，减轻数据库层的竞争
         with self.lock:
+            conn = self._get_conn()
             try:
-                conn = self._get_conn()
                 cursor = conn.cursor()
-                # 21 个字段，对应 21 个占位符
-                sql = f"""
-                    INSERT INTO {self.table_name} (
-                        job_id, company_name, source_platform, work_type, job_url,
-                        title, city, category, experience_req,
-                        education_req, job_level, salary_min, salary_max, description,
-                        description_keywords, requirement, requirement_keywords, publish_date, crawl_date
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
-                cursor.execute(sql, self._adapt_item(item))
+                result = self._write_items(cursor, [item])
                 conn.commit()
                 cursor.close()
+                return result
             except Exception as e:
+                conn.rollback()
                 logger.error(
                     f"sqlite3 DB Save Error, sqlite path {self.sqlite_path}: \n{e}"
                 )
                 raise e
 
-    def save_batch(self, items: list[Item]) -> None:
+    def save_batch(self, items: list[Item]) -> SaveResult:
         if not items:
-            return
+            return SaveResult()
         with self.lock:
+            conn = self._get_conn()
             try:
-                conn = self._get_conn()
                 cursor = conn.cursor()
-                sql = f"""
-                    INSERT INTO {self.table_name} (
-                        job_id, company_name, source_platform, work_type, job_url,
-                        title, city, category, experience_req,
-                        education_req, job_level, salary_min, salary_max, description,
-                        description_keywords, requirement, requirement_keywords, publish_date, crawl_date
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
-                # 将所有 item 转换为元组列表
-                data = [self._adapt_item(item) for item in items]
-                cursor.executemany(sql, data)
+                result = self._write_items(cursor, items)
                 conn.commit()
                 cursor.close()
+                if self.upsert:
+                    logger.info(
+                        f"Batch upsert into {self.table_name}: {result.inserted} inserted, {result.updated} updated"
+                    )
+                return result
             except Exception as e:
+                conn.rollback()
                 logger.error(
                     f"sqlite3 DB Batch Save Error, sqlite path {self.sqlite_path}: \n{e}"
                 )
                 raise e
 
     def fetch_all_fingerprints(self, filters: dict[str, Any] | None = None) -> set[str]:
-        # 读取操作在 WAL 模式下可以并发进行，无需加锁
         try:
-            conn = self._get_conn()
-            cursor = conn.cursor()
-            sql = f"SELECT job_id FROM {self.table_name}"
-            params = []
-            if filters:
-                where_clauses = []
-                for key, value in filters.items():
-                    where_clauses.append(f"{key} = ?")
-                    params.append(value)
-                sql += " WHERE " + " AND ".join(where_clauses)
-
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            cursor.close()
-            return set([row[0] for row in rows])
+            return self._query_fingerprints(filters)
         except Exception as e:
             logger.error(f"Failed to fetch fingerprints: {e}")
             return set()
 
+    def _query_fingerprints(self, filters: dict[str, Any] | None = None) -> set[str]:
+        """fetch_all_fingerprints 的实现，查询失败时抛出异常，供分片存储区分“没有数据”和“读取失败”"""
+        # 读取操作在 WAL 模式下可以并发进行，无需加锁
+        # 按 source_platform 筛选时，唯一索引 (source_platform, job_id) 可以覆盖整个查询
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        sql = f"SELECT job_id FROM {self.table_name}"
+        params = []
+        if filters:
+            where_clauses = []
+            for key, value in filters.items():
+                where_clauses.append(f"{key} = ?")
+                params.append(value)
+            sql += " WHERE " + " AND ".join(where_clauses)
+
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        return set([row[0] for row in rows])
+
+    def _ensure_change_log(self) -> None:
+        # 只刷新 crawl_date 的重复写入不算内容变化
+        content_columns = [
+            col for col in _COLUMNS if col not in _KEY_COLUMNS and col != "crawl_date"
+        ]
+        with self.lock:
+            self._get_conn().executescript(
+                CHANGE_TABLE_SQL + change_triggers_sql(self.table_name, content_columns)
+            )
+
+    def read_changes(self, since: int = 0, limit: int = 1000) -> list[JobChange]:
+        """
+        返回 seq 大于 since 的至多 limit 条变更，按 seq 升序。
+        下游保存最后一条的 seq，作为下一次调用的 since。
+        """
+        rows = (
+            self._get_conn()
+            .execute(
+                "SELECT seq, op, source_platform, job_id, changed_at FROM job_changes "
+                "WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit),
+            )
+            .fetchall()
+        )
+        return [JobChange(*row) for row in rows]
+
+    def prune_changes(self, before: int) -> int:
+        """删除 seq 不大于 before 的变更（所有下游都已经消费过的部分），返回删除的行数"""
+        with self.lock:
+            conn = self._get_conn()
+            cursor = conn.execute("DELETE FROM job_changes WHERE seq <= ?", (before,))
+            conn.commit()
+            return cursor.rowcount
+
+    def touch(self, keys: Iterable[tuple[str, str]], seen_at: int | None = None) -> int:
+        """
+        批量刷新再次看到的职位的 last_seen，并清除 closed_at。
+        keys 为 (source_platform, job_id)，整批在一个事务中按唯一索引更新。返回更新的行数。
+        """
+        by_platform: dict[str, list[str]] = {}
+        for platform, job_id in dict.fromkeys(keys):
+            by_platform.setdefault(platform, []).append(job_id)
+        if not by_platform:
+            return 0
+        seen_at = seen_at or int(time.time())
+        with self.lock:
+            conn = self._get_conn()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                total = 0
+                for platform, job_ids in by_platform.items():
+                    for i in range(0, len(job_ids), _IN_CHUNK_SIZE):
+                        chunk = job_ids[i : i + _IN_CHUNK_SIZE]
+                        placeholders = ", ".join("?" for _ in chunk)
+                        cursor = conn.execute(
+                            f"UPDATE {self.table_name} SET last_seen = ?, closed_at = NULL "
+                            f"WHERE source_platform = ? AND job_id IN ({placeholders})",
+                            [seen_at, platform, *chunk],
+                        )
+                        total += cursor.rowcount
+                conn.commit()
+                return total
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to touch jobs: {e}")
+                raise e
+
+    def fetch_open_fingerprints(
+        self, filters: dict[str, Any] | None = None
+    ) -> set[str]:
+        """获取尚未关闭的职位的 job_id，filters 与 fetch_all_fingerprints 相同"""
+        sql = f"SELECT job_id FROM {self.table_name} WHERE closed_at IS NULL"
+        params = []
+        # 使用 IS 比较，filters 中的值为 None 时匹配 NULL
+        for key, value in (filters or {}).items():
+            sql += f" AND {key} IS ?"
+            params.append(value)
+        rows = self._get_conn().execute(sql, params).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_closed(
+        self,
+        seen_ids: set[str],
+        filters: dict[str, Any],
+        closed_at: int | None = None,
+    ) -> int:
+        """
+        一次完整的列表遍历结束后调用：filters 范围内仍未关闭、但这次没有看到的职位标记为已关闭。
+        filters 至少需要包含 source_platform，返回关闭的行数。
+        """
+        if "source_platform" not in filters:
+            raise ValueError("mark_closed requires a source_platform filter")
+        closed_ids = list(self.fetch_open_fingerprints(filters) - seen_ids)
+        if not closed_ids:
+            return 0
+        closed_at = closed_at or int(time.time())
+        with self.lock:
+            conn = self._get_conn()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                total = 0
+                for i in range(0, len(closed_ids), _IN_CHUNK_SIZE):
+                    chunk = closed_ids[i : i + _IN_CHUNK_SIZE]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    cursor = conn.execute(
+                        f"UPDATE {self.table_name} SET closed_at = ? "
+                        f"WHERE source_platform = ? AND closed_at IS NULL "
+                        f"AND job_id IN ({placeholders})",
+                        [closed_at, filters["source_platform"], *chunk],
+                    )
+                    total += cursor.rowcount
+                conn.commit()
+                logger.info(f"Marked {total} jobs closed, scope: {filters}")
+                return total
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to mark jobs closed: {e}")
+                raise e
+
+    def query_rows(self, sql: str, params: list[Any] | None = None) -> list[tuple]:
+        """执行只读查询并返回所有行，出错时抛出 sqlite3.DatabaseError"""
+        return self._get_conn().execute(sql, params or []).fetchall()
+
+    def vacuum(self) -> None:
+        """回收删除和压缩后留下的空闲页"""
+        with self.lock:
+            self._get_conn().execute("VACUUM")
+
     def close(self) -> None:
         # 仅关闭当前线程的连接
         if hasattr(self._local, "conn"):
             self._local.conn.close()
-            del self._local.conn
\ No newline at end of file
+            del self._local.conn
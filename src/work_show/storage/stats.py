@@ -0,0 +1,98 @@
+"""
+仪表板使用的预聚合统计表 job_stats
+
+按 (平台, 城市, 分类, 学历, 经验, 工作类型, 发布周) 计数，随 save_batch 在同一个事务中增量维护。
+一个职位可能有多个城市：city_count 在每个城市各计一次，用于城市分布；
+job_count 和薪资只计在第一个城市上，按城市以外的维度求和时不会重复计数。
+维度为空时存为空字符串，保证唯一键能够命中。
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+STATS_DIMENSIONS = (
+    "source_platform",
+    "city",
+    "category",
+    "education_req",
+    "experience_req",
+    "work_type",
+    "publish_week",
+)
+STATS_MEASURES = ("job_count", "city_count", "salary_sum", "salary_n")
+
+STATS_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS job_stats (
+    {", ".join(f"{col} TEXT NOT NULL" for col in STATS_DIMENSIONS)},
+    job_count INTEGER NOT NULL DEFAULT 0,
+    city_count INTEGER NOT NULL DEFAULT 0,
+    salary_sum REAL NOT NULL DEFAULT 0,
+    salary_n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY ({", ".join(STATS_DIMENSIONS)})
+) WITHOUT ROWID;
+"""
+
+# 把一批增量合并进 job_stats，计数归零的行随后删除
+STATS_UPSERT_SQL = (
+    f"INSERT INTO job_stats ({', '.join(STATS_DIMENSIONS + STATS_MEASURES)}) "
+    f"VALUES ({', '.join('?' for _ in STATS_DIMENSIONS + STATS_MEASURES)}) "
+    f"ON CONFLICT ({', '.join(STATS_DIMENSIONS)}) DO UPDATE SET "
+    + ", ".join(f"{col} = {col} + excluded.{col}" for col in STATS_MEASURES)
+)
+STATS_CLEANUP_SQL = "DELETE FROM job_stats WHERE job_count <= 0 AND city_count <= 0"
+
+
+@dataclass
+class StatsRecord:
+    """一个职位参与统计的字段，cities 已经规范化为 list"""
+
+    source_platform: str | None
+    cities: list[str]
+    category: str | None
+    education_req: str | None
+    experience_req: str | None
+    work_type: str | None
+    publish_date: int | None
+    salary_min: float | None
+    salary_max: float | None
+
+
+def publish_week(publish_date: int | None) -> str:
+    """发布时间所在周的周一（UTC），格式 YYYY-MM-DD，与仪表板按周统计的口径一致"""
+    if not publish_date:
+        return ""
+    try:
+        day = datetime.fromtimestamp(publish_date, tz=timezone.utc).date()
+    except (OverflowError, OSError, ValueError, TypeError):
+        return ""
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def add_deltas(
+    deltas: dict[tuple, list[float]], record: StatsRecord, sign: int
+) -> None:
+    """把一个职位对各统计行的贡献（sign 为 1 或 -1）累加到 deltas"""
+    salary = None
+    if record.salary_min is not None and record.salary_max is not None:
+        salary = (record.salary_min + record.salary_max) / 2
+    base = (
+        record.category or "",
+        record.education_req or "",
+        record.experience_req or "",
+        record.work_type or "",
+        publish_week(record.publish_date),
+    )
+    for i, city in enumerate(record.cities or [""]):
+        key = (record.source_platform or "", city, *base)
+        delta = deltas.setdefault(key, [0, 0, 0.0, 0])
+        delta[1] += sign
+        if i == 0:
+            delta[0] += sign
+            if salary is not None:
+                delta[2] += sign * salary
+                delta[3] += sign
+
+
+def delta_rows(deltas: dict[tuple, list[float]]) -> list[tuple]:
+    """转换为 STATS_UPSERT_SQL 的参数，跳过相互抵消的行"""
+    return [(*key, *delta) for key, delta in deltas.items() if any(delta)]
@@ -0,0 +1,89 @@
+"""
+描述、要求等长文本的内容寻址压缩存储
+
+文本按 sha256 去重后压缩存入 job_text 表，jobs 表只保存哈希。
+安装了 zstandard 时使用 zstd（可选按公司训练的字典），否则退回标准库 zlib。
+"""
+
+import hashlib
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖，未安装时只能使用 zlib，也无法训练字典
+    zstandard = None
+
+ZSTD_LEVEL = 10
+
+TEXT_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS job_text (
+    hash TEXT PRIMARY KEY,            -- 文本的 sha256
+    codec TEXT NOT NULL,              -- zlib / zstd / zstd-dict
+    dict_id INTEGER,                  -- codec 为 zstd-dict 时使用的字典
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_text_dict (
+    dict_id INTEGER PRIMARY KEY,
+    company_name TEXT NOT NULL,
+    data BLOB NOT NULL,
+    created_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_job_text_dict_company ON job_text_dict (company_name);
+"""
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TextCodec:
+    """压缩/解压文本，并缓存已加载的 zstd 字典"""
+
+    def __init__(self):
+        self._dicts: dict[int, "zstandard.ZstdCompressionDict"] = {}
+
+    def has_dictionary(self, dict_id: int) -> bool:
+        return dict_id in self._dicts
+
+    def add_dictionary(self, dict_id: int, data: bytes) -> None:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to use compression dictionaries")
+        self._dicts[dict_id] = zstandard.ZstdCompressionDict(data)
+
+    def compress(
+        self, text: str, dict_id: int | None = None
+    ) -> tuple[str, int | None, bytes]:
+        """返回 (codec, dict_id, data)"""
+        raw = text.encode("utf-8")
+        if zstandard is None:
+            return "zlib", None, zlib.compress(raw, 9)
+        if dict_id is not None and dict_id in self._dicts:
+            compressor = zstandard.ZstdCompressor(
+                level=ZSTD_LEVEL, dict_data=self._dicts[dict_id]
+            )
+            return "zstd-dict", dict_id, compressor.compress(raw)
+        return "zstd", None, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+
+    def decompress(self, codec: str, dict_id: int | None, data: bytes) -> str:
+        if codec == "zlib":
+            return zlib.decompress(data).decode("utf-8")
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to decompress codec {codec}")
+        if codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+        if codec == "zstd-dict":
+            decompressor = zstandard.ZstdDecompressor(dict_data=self._dicts[dict_id])
+            return decompressor.decompress(data).decode("utf-8")
+        raise ValueError(f"Unknown text codec: {codec}")
+
+
+def train_dictionary(samples: list[str], dict_size: int = 64 * 1024) -> bytes | None:
+    """用同一家公司的文本训练 zstd 字典，样本不足或未安装 zstandard 时返回 None"""
+    if zstandard is None:
+        return None
+    try:
+        return zstandard.train_dictionary(
+            dict_size, [x.encode("utf-8") for x in samples]
+        ).as_bytes()
+    except zstandard.ZstdError:
+        return None
@@ -1,12 +1,30 @@
-import json
-import os
-from typing import Protocol, Type, TypeVar
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Type, TypeVar
 
+import httpx
 import yaml
-from google import genai
-from openai import OpenAI
-from pydantic import BaseModel
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    OpenAI,
+)
+from pydantic import BaseModel, ValidationError
 
+from ..data_clean.rule_extractor import (
+    EDUCATION_LEVELS,
+    EXPERIENCE_LEVELS,
+    rule_extractor,
+)
+from ..core.exceptions import LLMUnavailableError
+from .llm_cache import LLMCache, cache_key
+from .llm_router import LLMRouter
 from .logger import get_logger
 
 logger = get_logger("call_llm")
@@ -16,10 +34,249 @@ T = TypeVar("T", bound=BaseModel)
 
 config = yaml.safe_load(open("config/settings.yaml"))
 model = config["crawler"]["model"]
+# 规则提取的置信度不低于这个值的字段不再请求 LLM，大于 1 时所有字段都交给 LLM
+rule_confidence = config["crawler"].get("rule_confidence", 0.75)
+
+# 修改 get_json_data 的提示词或响应结构时递增，旧的缓存随之失效；
+# 缓存不区分模型，各模型服务的结果共用同一条缓存
+PROMPT_VERSION = "1"
+
+_cache_config = config.get("llm_cache", {})
+llm_cache = LLMCache(
+    _cache_config.get("path", "./cache/llm_cache.sqlite"),
+    max_bytes=_cache_config.get("max_mb", 256) * 1024 * 1024,
+)
 
 _model2func = {}
+# 与 _model2func 对应的异步版本
+_amodel2func = {}
+
+
+@dataclass(frozen=True)
+class Provider:
+    """一个 OpenAI 兼容的模型服务"""
+
+    base_url: str
+    model: str
+    api_key: str | None
+    # 结构化输出的方式：parse 使用 beta.chat.completions.parse，
+    # json_object 要求返回 JSON 对象，plain 只靠提示词约束
+    response_mode: str = "json_object"
+
+
+PROVIDERS: dict[str, Provider] = {
+    "gemini": Provider(
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        model="gemini-3-flash-preview",
+        api_key=config["crawler"].get("gemini_api_key"),
+        response_mode="parse",
+    ),
+    "deepseek": Provider(
+        base_url="https://api.deepseek.com",
+        model="deepseek-chat",
+        api_key=config["crawler"].get("deepseek_api_key"),
+    ),
+    "doubao": Provider(
+        base_url="https://ark.cn-beijing.volces.com/api/coding/v3",
+        model="ark-code-latest",
+        api_key=config["crawler"].get("doubao_api_key"),
+        response_mode="plain",
+    ),
+}
+
+_client_config = config.get("llm_client", {})
+# 连接超时和两次读取之间的超时；读取超时不限制总时长，单次请求的总时长由 total_timeout 限制
+connect_timeout = _client_config.get("connect_timeout", 5)
+read_timeout = _client_config.get("read_timeout", 60)
+total_timeout = _client_config.get("total_timeout", 120)
+# 429、5xx、超时和连接错误的重试次数，等待时间按指数增长并加随机抖动
+max_retries = _client_config.get("max_retries", 4)
+# 路由中有多个模型服务时单个服务的重试次数，出错后尽快交给路由换下一个服务，
+# 而不是在一个服务上耗尽 max_retries 的重试和退避等待
+failover_retries = _client_config.get("failover_retries", 0)
+backoff_base = _client_config.get("backoff_base", 1.0)
+backoff_max = _client_config.get("backoff_max", 30.0)
+# 每个模型服务的连接池大小和同时进行的请求数
+max_connections = _client_config.get("max_connections", 64)
+
+# 每个模型服务一个客户端，运行时切换 model 不会用到其他服务的地址和密钥
+_clients: dict[str, OpenAI] = {}
+# 异步客户端绑定创建时的事件循环，key 为 (服务名, 事件循环)
+_async_clients: dict[tuple[str, asyncio.AbstractEventLoop], AsyncOpenAI] = {}
+_async_semaphores: dict[tuple[str, asyncio.AbstractEventLoop], asyncio.Semaphore] = {}
+_clients_lock = threading.Lock()
+# 同步请求在这个线程池中执行，等待超过 total_timeout 时放弃（请求本身受 read_timeout 限制）
+_sync_pool = ThreadPoolExecutor(max_connections, thread_name_prefix="llm-request")
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(read_timeout, connect=connect_timeout)
+
+
+def _get_client(name: str) -> OpenAI:
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                provider = PROVIDERS[name]
+                client = OpenAI(
+                    api_key=provider.api_key,
+                    base_url=provider.base_url,
+                    timeout=_timeout(),
+                    # 重试由 _with_retries_sync 负责，以便加入抖动
+                    max_retries=0,
+                )
+                _clients[name] = client
+    return client
+
+
+def _get_async_client(name: str) -> tuple[AsyncOpenAI, asyncio.Semaphore]:
+    """返回当前事件循环中该服务的客户端和并发限制，连接池在同一事件循环的所有请求间复用"""
+    key = (name, asyncio.get_running_loop())
+    client = _async_clients.get(key)
+    if client is None:
+        provider = PROVIDERS[name]
+        limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        client = AsyncOpenAI(
+            api_key=provider.api_key,
+            base_url=provider.base_url,
+            timeout=_timeout(),
+            # 重试由 _with_retries 负责，以便加入抖动
+            max_retries=0,
+            http_client=httpx.AsyncClient(limits=limits, timeout=_timeout()),
+        )
+        _async_clients[key] = client
+        _async_semaphores[key] = asyncio.Semaphore(max_connections)
+    return client, _async_semaphores[key]
+
+
+def _request_kwargs(name: str, cls: Type[T], system_prompt: str, user_prompt: str):
+    provider = PROVIDERS[name]
+    kwargs = {
+        "model": provider.model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+    }
+    if provider.response_mode == "parse":
+        kwargs["response_format"] = cls
+    elif provider.response_mode == "json_object":
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
+
+
+def _parse_response(name: str, cls: Type[T], response) -> T:
+    message = response.choices[0].message
+    if PROVIDERS[name].response_mode == "parse":
+        parsed = message.parsed
+        return parsed if isinstance(parsed, cls) else cls.model_validate(parsed)
+    return cls.model_validate_json(message.content)
+
+
+def _request(name: str, cls: Type[T], system_prompt: str, user_prompt: str) -> T:
+    client = _get_client(name)
+    kwargs = _request_kwargs(name, cls, system_prompt, user_prompt)
+
+    def send() -> T:
+        if PROVIDERS[name].response_mode == "parse":
+            response = client.beta.chat.completions.parse(**kwargs)
+        else:
+            response = client.chat.completions.create(**kwargs)
+        # 解析返回结果
+        return _parse_response(name, cls, response)
+
+    # 如果解析失败或者API报错，抛出异常让上层处理
+    return _with_retries_sync(name, send)
+
+
+def _is_retryable(error: Exception) -> bool:
+    # asyncio.wait_for 和 Future.result 超时抛出的都是 TimeoutError
+    if isinstance(error, (APITimeoutError, APIConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _backoff_delay(attempt: int, error: Exception | None = None) -> float:
+    """
+    第 attempt 次重试前的等待秒数：在指数增长的上限内均匀随机（full jitter），
+    服务端给出 Retry-After 时取两者中较大的
+    """
+    delay = random.uniform(0, min(backoff_max, backoff_base * 2**attempt))
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, min(float(retry_after), backoff_max))
+        except ValueError:
+            pass
+    return delay
 
-_client = None
+
+def _retries() -> int:
+    """单个模型服务的重试次数：路由有其他服务可以切换时不超过 failover_retries"""
+    if len(router.providers) > 1:
+        return min(max_retries, failover_retries)
+    return max_retries
+
+
+async def _with_retries(name: str, send: Callable[[], Awaitable[T]]) -> T:
+    retries = _retries()
+    for attempt in range(retries + 1):
+        try:
+            return await asyncio.wait_for(send(), total_timeout)
+        except Exception as e:
+            if attempt == retries or not _is_retryable(e):
+                logger.error(f"{name} API Error: {e}")
+                raise
+            delay = _backoff_delay(attempt, e)
+            logger.warning(
+                f"{name} API Error: {e!r}, retry {attempt + 1}/{retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def _with_retries_sync(name: str, send: Callable[[], T]) -> T:
+    """
+    _with_retries 的同步版本，每次尝试最多等待 total_timeout 秒。
+    超时放弃的请求无法中止，会在线程池中继续执行到 read_timeout 为止，结果被丢弃
+    """
+    retries = _retries()
+    for attempt in range(retries + 1):
+        future = _sync_pool.submit(send)
+        try:
+            return future.result(timeout=total_timeout)
+        except Exception as e:
+            if attempt == retries or not _is_retryable(e):
+                logger.error(f"{name} API Error: {e!r}")
+                raise
+            delay = _backoff_delay(attempt, e)
+            logger.warning(
+                f"{name} API Error: {e!r}, retry {attempt + 1}/{retries} in {delay:.1f}s"
+            )
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def _arequest(name: str, cls: Type[T], system_prompt: str, user_prompt: str) -> T:
+    client, semaphore = _get_async_client(name)
+    kwargs = _request_kwargs(name, cls, system_prompt, user_prompt)
+
+    async def send() -> T:
+        async with semaphore:
+            if PROVIDERS[name].response_mode == "parse":
+                response = await client.beta.chat.completions.parse(**kwargs)
+            else:
+                response = await client.chat.completions.create(**kwargs)
+        return _parse_response(name, cls, response)
+
+    return await _with_retries(name, send)
 
 
 def _register_model(key: str):
@@ -30,110 +287,85 @@ def _register_model(key: str):
     return inner_wrapper
 
 
-@_register_model("gemini")
-def get_gemini_json_res(cls: Type[T], system_prompt: str, user_prompt: str) -> T:
-    global _client
-    if not _client:
-        _client = OpenAI(
-            api_key=config["crawler"]["gemini_api_key"],
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-        )
-    try:
-        # 在 google.genai SDK 中，system_instruction 放在 config 中
-        response = _client.beta.chat.completions.parse(
-            model="gemini-3-flash-preview",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": user_prompt,
-                },
-            ],
-            response_format=cls,
-        )
+def _register_async_model(key: str):
+    def inner_wrapper(wrapped_class):
+        _amodel2func[key] = wrapped_class
+        return wrapped_class
 
-        # 解析返回结果
-        return cls.model_validate_json(response.choices[0].message.parsed)
+    return inner_wrapper
 
-    except Exception as e:
-        logger.error(f"Gemini API Error: {e}")
-        # 如果解析失败或者API报错，抛出异常让上层处理，或者返回None
-        raise e
+
+@_register_model("gemini")
+def get_gemini_json_res(cls: Type[T], system_prompt: str, user_prompt: str) -> T:
+    return _request("gemini", cls, system_prompt, user_prompt)
 
 
 @_register_model("deepseek")
 def get_deepseek_json_res(cls: Type[T], system_prompt: str, user_prompt: str) -> T:
-    global _client
-    if not _client:
-        _client = OpenAI(
-            api_key=config["crawler"]["deepseek_api_key"],
-            base_url="https://api.deepseek.com",
-        )
-    try:
-        # 在 google.genai SDK 中，system_instruction 放在 config 中
-        response = _client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": user_prompt,
-                },
-            ],
-            response_format={"type": "json_object"},
-        )
-
-        # 解析返回结果
-        return cls.model_validate_json(response.choices[0].message.content)
-
-    except Exception as e:
-        logger.error(f"Gemini API Error: {e}")
-        # 如果解析失败或者API报错，抛出异常让上层处理，或者返回None
-        raise e
+    return _request("deepseek", cls, system_prompt, user_prompt)
 
 
 @_register_model("doubao")
 def get_doubao_json_res(cls: Type[T], system_prompt: str, user_prompt: str) -> T:
-    global _client
-    if not _client:
-        _client = OpenAI(
-            api_key="4a05c8c7-1088-4862-a16c-e980b307ab8d",
-            base_url="https://ark.cn-beijing.volces.com/api/coding/v3",
-        )
-    try:
-        # 在 google.genai SDK 中，system_instruction 放在 config 中
-        response = _client.chat.completions.create(
-            model="ark-code-latest",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": user_prompt,
-                },
-            ],
-            # response_format={"type": "json_object"},
-        )
+    return _request("doubao", cls, system_prompt, user_prompt)
 
-        # 解析返回结果
-        return cls.model_validate_json(response.choices[0].message.content)
 
-    except Exception as e:
-        print(f"{e}")
-        # 如果解析失败或者API报错，抛出异常让上层处理，或者返回None
-        raise e
+@_register_async_model("gemini")
+async def aget_gemini_json_res(cls: Type[T], system_prompt: str, user_prompt: str) -> T:
+    return await _arequest("gemini", cls, system_prompt, user_prompt)
 
 
-def get_json_data(
-    description: str, requirement: str
-) -> tuple[str, str, list[str], list[str]]:
-    # 定义响应结构
-    class DescriptionKeyboard(BaseModel):
-        experience_req: str
-        education_req: str
-        description_keywords: list[str]
-        requirement_keywords: list[str]
+@_register_async_model("deepseek")
+async def aget_deepseek_json_res(
+    cls: Type[T], system_prompt: str, user_prompt: str
+) -> T:
+    return await _arequest("deepseek", cls, system_prompt, user_prompt)
+
+
+@_register_async_model("doubao")
+async def aget_doubao_json_res(cls: Type[T], system_prompt: str, user_prompt: str) -> T:
+    return await _arequest("doubao", cls, system_prompt, user_prompt)
+
+
+_router_config = config.get("llm_router", {})
+# 默认只使用 model 指定的服务，其他服务需要在 llm_router.providers 中显式加入
+router = LLMRouter(
+    _router_config.get("providers") or [model],
+    hedge_percentile=_router_config.get("hedge_percentile", 0.95),
+    min_samples=_router_config.get("min_samples", 10),
+    failure_threshold=_router_config.get("failure_threshold", 3),
+    cooldown=_router_config.get("cooldown", 60),
+)
+
+
+async def aclose_clients() -> None:
+    """关闭当前事件循环中创建的异步客户端"""
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _async_clients if k[1] is loop]:
+        _async_semaphores.pop(key, None)
+        await _async_clients.pop(key).close()
+
+
+class DescriptionKeyboard(BaseModel):
+    """get_json_data 的响应结构"""
+
+    experience_req: str
+    education_req: str
+    description_keywords: list[str]
+    requirement_keywords: list[str]
+
+
+class BatchEntry(DescriptionKeyboard):
+    job_id: str
 
-    system_prompt = """Parse job data into JSON.
+
+class BatchResult(BaseModel):
+    """批量提取的响应结构，每个职位一项，用 job_id 对应"""
+
+    results: list[BatchEntry]
+
+
+SYSTEM_PROMPT = """Parse job data into JSON.
 
 Rules:
 1. experience_req: Map to ['应届毕业生', '0-1年', '1-3年', '3-5年', '5-10年', '10年以上', '不限']. Match start of range (e.g., "3y+" -> '3-5年'). Default: '不限'.
@@ -147,20 +379,257 @@ Output JSON:
     "description_keywords": [],
     "requirement_keywords": []
 }"""
-    user_prompt = f"""Data:
+
+BATCH_SYSTEM_PROMPT = """Parse each job in the data into JSON.
+
+Rules:
+1. experience_req: Map to ['应届毕业生', '0-1年', '1-3年', '3-5年', '5-10年', '10年以上', '不限']. Match start of range (e.g., "3y+" -> '3-5年'). Default: '不限'.
+2. education_req: Min degree ['专科', '本科', '硕士', '博士', '不限']. Default: '不限'.
+3. Keywords: Extract 5-15 Tech/Domain keywords for description/requirement. Normalize acronyms. Exclude soft skills/verbs.
+4. Return exactly one result per job, copying its job_id unchanged.
+
+Output JSON:
+{
+    "results": [
+        {
+            "job_id": "",
+            "experience_req": "",
+            "education_req": "",
+            "description_keywords": [],
+            "requirement_keywords": []
+        }
+    ]
+}"""
+
+_batch_config = config.get("llm_batch", {})
+# 一次请求最多包含的职位数和估算的输入 token 数
+batch_max_jobs = _batch_config.get("max_jobs", 8)
+batch_token_budget = _batch_config.get("token_budget", 6000)
+
+
+def _user_prompt(description: str | None, requirement: str | None) -> str:
+    return f"""Data:
 [description]: {description}
 [requirement]: {requirement}"""
 
+
+def _estimate_tokens(*texts: str | None) -> int:
+    """粗略估算 token 数：中文大约一个字一个 token，按字符数计算偏保守"""
+    return sum(len(x or "") for x in texts) + 20
+
+
+def _cached_response(key: str) -> DescriptionKeyboard | None:
+    """读取缓存的响应，内容不符合响应结构时删除这条缓存，按未命中处理"""
+    cached = llm_cache.get(key)
+    if cached is None:
+        return None
     try:
-        # 调用注册的模型函数，传入拆分后的 prompt
-        res = _model2func[model](DescriptionKeyboard, system_prompt, user_prompt)
-        return (
-            res.experience_req,
-            res.education_req,
-            res.description_keywords,
-            res.requirement_keywords,
+        return DescriptionKeyboard.model_validate(cached)
+    except ValidationError as e:
+        logger.warning(f"Drop invalid LLM cache entry {key}: {e}")
+        llm_cache.delete(key)
+        return None
+
+
+def _request_llm(
+    description: str | None, requirement: str | None
+) -> DescriptionKeyboard:
+    """
+    单个职位的 LLM 提取，先查缓存，成功的结果写入缓存。
+    所有模型服务都失败时抛出 LLMUnavailableError。
+    """
+    key = cache_key(PROMPT_VERSION, description, requirement)
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+    # 由路由选择模型服务，调用注册的模型函数，传入拆分后的 prompt
+    res = router.call(
+        _model2func,
+        DescriptionKeyboard,
+        SYSTEM_PROMPT,
+        _user_prompt(description, requirement),
+    )
+    llm_cache.put(key, res.model_dump())
+    return res
+
+
+def get_json_data(
+    description: str,
+    requirement: str,
+    experience_req: str | None = None,
+    education_req: str | None = None,
+) -> tuple[str, str, list[str], list[str]]:
+    """
+    提取经验要求、学历要求和两组关键词。
+    先用规则提取，只有置信度低于 rule_confidence 的字段才请求 LLM；
+    experience_req、education_req 为来源已经给出的值，有效时保留，不会被 LLM 的结果覆盖。
+    需要 LLM 而所有模型服务都失败时抛出 LLMUnavailableError，不返回空结果，避免未提取的职位被保存。
+    """
+    rules = rule_extractor.extract(
+        description, requirement, experience_req, education_req
+    )
+    uncertain = rules.uncertain_fields(rule_confidence)
+    if not uncertain:
+        return _merge(rules, None, uncertain)
+    return _merge(rules, _request_llm(description, requirement), uncertain)
+
+
+async def _arequest_llm(
+    description: str | None, requirement: str | None
+) -> DescriptionKeyboard:
+    """_request_llm 的异步版本；缓存是本地 SQLite，读写很快，直接在事件循环中调用"""
+    key = cache_key(PROMPT_VERSION, description, requirement)
+    cached = _cached_response(key)
+    if cached is not None:
+        return cached
+    res = await router.acall(
+        _amodel2func,
+        DescriptionKeyboard,
+        SYSTEM_PROMPT,
+        _user_prompt(description, requirement),
+    )
+    llm_cache.put(key, res.model_dump())
+    return res
+
+
+async def aget_json_data(
+    description: str,
+    requirement: str,
+    experience_req: str | None = None,
+    education_req: str | None = None,
+) -> tuple[str, str, list[str], list[str]]:
+    """get_json_data 的异步版本，大量职位可以在一个事件循环中并发提取"""
+    rules = rule_extractor.extract(
+        description, requirement, experience_req, education_req
+    )
+    uncertain = rules.uncertain_fields(rule_confidence)
+    if not uncertain:
+        return _merge(rules, None, uncertain)
+    return _merge(rules, await _arequest_llm(description, requirement), uncertain)
+
+
+def _valid_entry(entry: BatchEntry) -> bool:
+    return (
+        entry.experience_req in EXPERIENCE_LEVELS
+        and entry.education_req in EDUCATION_LEVELS
+    )
+
+
+def _request_batch(jobs: list[tuple[str, str | None, str | None, str]]) -> int:
+    """
+    一次请求提取一批职位，jobs 为 (job_id, description, requirement, 缓存 key)。
+    模型漏掉或写错的职位单独重试；响应整体无法解析时拆成两半分别重试，
+    所有模型服务都不可用时放弃，留给逐个提取时再请求。返回写入缓存的职位数。
+    """
+    if len(jobs) == 1:
+        _, description, requirement, _ = jobs[0]
+        try:
+            _request_llm(description, requirement)
+        except Exception as e:
+            logger.error(f"Failed to extract keywords: {e}")
+            return 0
+        return 1
+    user_prompt = "\n\n".join(
+        f"[job_id]: {job_id}\n{_user_prompt(description, requirement)}"
+        for job_id, description, requirement, _ in jobs
+    )
+    try:
+        res = router.call(_model2func, BatchResult, BATCH_SYSTEM_PROMPT, user_prompt)
+    except LLMUnavailableError as e:
+        # 解析失败（ValidationError、JSONDecodeError 都是 ValueError）说明批次太大或内容有问题
+        if not any(isinstance(x, ValueError) for x in e.errors.values()):
+            logger.error(f"Batch extraction of {len(jobs)} jobs failed: {e}")
+            return 0
+        logger.warning(f"Batch extraction of {len(jobs)} jobs failed, splitting: {e}")
+        middle = len(jobs) // 2
+        return _request_batch(jobs[:middle]) + _request_batch(jobs[middle:])
+
+    keys = {job_id: key for job_id, _, _, key in jobs}
+    done = set()
+    for entry in res.results:
+        key = keys.get(entry.job_id)
+        if key is None or entry.job_id in done or not _valid_entry(entry):
+            continue
+        llm_cache.put(key, entry.model_dump(exclude={"job_id"}))
+        done.add(entry.job_id)
+    missing = [job for job in jobs if job[0] not in done]
+    if missing:
+        logger.info(f"Retrying {len(missing)} of {len(jobs)} jobs individually")
+    for job_id, description, requirement, _ in missing:
+        try:
+            _request_llm(description, requirement)
+            done.add(job_id)
+        except Exception as e:
+            logger.error(f"Failed to extract keywords: {e}")
+    return len(done)
+
+
+def prefetch_json_data(
+    jobs: Iterable[tuple[str, str | None, str | None, str | None, str | None]],
+) -> int:
+    """
+    为一批职位批量请求 LLM 并写入缓存，之后逐个调用 get_json_data 时直接命中缓存。
+    jobs 为 (job_id, description, requirement, experience_req, education_req)；
+    规则已经能确定或已经有缓存的职位不会发送。返回写入缓存的职位数。
+    """
+    if not llm_cache.enabled:
+        # 没有缓存时预取的结果无处保存
+        return 0
+    pending: dict[str, tuple[str, str | None, str | None, str]] = {}
+    for job_id, description, requirement, experience_req, education_req in jobs:
+        if not description and not requirement:
+            continue
+        rules = rule_extractor.extract(
+            description, requirement, experience_req, education_req
         )
-    except Exception as e:
-        logger.error(f"Failed to extract keywords: {e}")
-        # 返回空列表而不是 None，防止解包报错
-        return "", "", [], []
+        if not rules.uncertain_fields(rule_confidence):
+            continue
+        key = cache_key(PROMPT_VERSION, description, requirement)
+        # 同样的文本只发送一次；contains 不计入缓存的命中统计
+        if key in pending or llm_cache.contains(key):
+            continue
+        pending[key] = (str(job_id), description, requirement, key)
+
+    fetched = 0
+    batch: list[tuple[str, str | None, str | None, str]] = []
+    tokens = _estimate_tokens(BATCH_SYSTEM_PROMPT)
+    for job in pending.values():
+        cost = _estimate_tokens(job[1], job[2])
+        if batch and (
+            len(batch) >= batch_max_jobs or tokens + cost > batch_token_budget
+        ):
+            fetched += _request_batch(batch)
+            batch, tokens = [], _estimate_tokens(BATCH_SYSTEM_PROMPT)
+        batch.append(job)
+        tokens += cost
+    if batch:
+        fetched += _request_batch(batch)
+    return fetched
+
+
+def _merge(
+    rules, res: DescriptionKeyboard | None, uncertain: list[str]
+) -> tuple[str, str, list[str], list[str]]:
+    """只用 LLM 的结果替换置信度低的字段，关键词在规则提取的基础上补充"""
+    merged = {}
+    for name in (
+        "experience_req",
+        "education_req",
+        "description_keywords",
+        "requirement_keywords",
+    ):
+        value = getattr(rules, name)
+        if res is not None and name in uncertain:
+            llm_value = getattr(res, name)
+            if isinstance(value, list):
+                seen = {x.lower() for x in value}
+                value = value + [x for x in llm_value if x.lower() not in seen]
+            elif llm_value:
+                value = llm_value
+        merged[name] = value
+    return (
+        merged["experience_req"],
+        merged["education_req"],
+        merged["description_keywords"],
+        merged["requirement_keywords"],
+    )
@@ -0,0 +1,218 @@
+"""
+LLM 响应的磁盘缓存
+
+同一段描述和要求会反复发给 LLM：职位换了 id 重新发布、同时出现在校招和社招、崩溃后重跑。
+缓存以 (提示词版本, 规范化后的描述, 要求) 的 sha256 为 key，保存 LLM 返回的 JSON，
+命中时省去一次数秒的远程调用。key 不包含模型：路由可能由任一模型服务返回结果，
+用配置的模型名作 key 会把备用模型的结果记在主模型名下；需要按模型区分结果时递增提示词版本。缓存放在单独的 SQLite 文件中，总大小超过上限时按最近访问时间淘汰。
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,             -- 见 cache_key
+    value TEXT NOT NULL,              -- LLM 返回的 JSON
+    size INTEGER NOT NULL,            -- value 的字节数
+    created_at INTEGER NOT NULL,
+    accessed_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at);
+"""
+
+# 超过上限时淘汰到上限的这个比例，避免每次写入都触发淘汰
+_EVICT_TARGET = 0.9
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str | None) -> str:
+    """合并连续空白并去掉首尾空白，只有排版不同的文本得到相同的 key"""
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+def cache_key(prompt_version: str, *texts: str | None) -> str:
+    h = hashlib.sha256()
+    for part in (prompt_version, *map(normalize_text, texts)):
+        h.update(part.encode("utf-8"))
+        # 分隔符避免 ("ab", "c") 与 ("a", "bc") 冲突
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LLMCache:
+    """
+    线程安全的 LLM 响应缓存，多个爬虫线程共享一个连接。
+    path 为 None 时不缓存，get 总是返回 None。
+    """
+
+    def __init__(self, path: str | None, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if path is None:
+            return
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+            self._conn.executescript(CACHE_TABLE_SQL)
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            self._stats.entries, self._stats.size_bytes = entries, size
+        except sqlite3.Error as e:
+            # 缓存不可用不影响爬取，只是每次都请求 LLM
+            logger.warning(f"LLM cache disabled, failed to open {path}: {e}")
+            self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def get(self, key: str) -> Any | None:
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+            try:
+                value = json.loads(row[0])
+            except ValueError:
+                # 损坏的条目按未命中处理，随后删除
+                self._stats.misses += 1
+            else:
+                self._conn.execute(
+                    "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                    (int(time.time()), key),
+                )
+                self._conn.commit()
+                self._stats.hits += 1
+                return value
+        logger.warning(f"Drop corrupt LLM cache entry {key}")
+        self.delete(key)
+        return None
+
+    def delete(self, key: str) -> None:
+        """删除一条缓存，用于读出的内容无法使用（如响应结构变化或数据损坏）时"""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT size FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.warning(f"Failed to delete LLM cache entry: {e}")
+                return
+            if row is not None:
+                self._stats.entries -= 1
+                self._stats.size_bytes -= row[0]
+
+    def contains(self, key: str) -> bool:
+        """只检查是否存在，不计入命中统计，也不刷新访问时间"""
+        if self._conn is None:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def put(self, key: str, value: Any) -> None:
+        if self._conn is None:
+            return
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        now = int(time.time())
+        with self._lock:
+            try:
+                old = self._conn.execute(
+                    "SELECT size FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                    (key, data, size, now, now),
+                )
+                if old is None:
+                    self._stats.entries += 1
+                self._stats.size_bytes += size - (old[0] if old else 0)
+                self._stats.writes += 1
+                if self._stats.size_bytes > self.max_bytes:
+                    self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.warning(f"Failed to write LLM cache: {e}")
+
+    def _evict(self) -> None:
+        """按最近访问时间从旧到新删除，直到总大小降到上限的 _EVICT_TARGET"""
+        excess = self._stats.size_bytes - int(self.max_bytes * _EVICT_TARGET)
+        keys = []
+        cursor = self._conn.execute(
+            # 同一秒内访问的条目按写入顺序淘汰
+            "SELECT key, size FROM llm_cache ORDER BY accessed_at, rowid"
+        )
+        for key, size in cursor:
+            if excess <= 0:
+                break
+            keys.append((key,))
+            excess -= size
+            self._stats.size_bytes -= size
+        cursor.close()
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", keys)
+        self._stats.entries -= len(keys)
+        self._stats.evictions += len(keys)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def clear(self) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._stats.entries = self._stats.size_bytes = 0
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,256 @@
+"""
+模型服务路由
+
+为每个模型服务记录最近的延迟和错误，每次请求先发给健康的服务中延迟中位数最低的一个。
+请求耗时超过该服务延迟的 hedge_percentile 分位数时，向下一个服务再发一份（对冲请求），
+先成功返回的结果胜出；请求出错时换下一个服务重试。连续失败 failure_threshold 次的服务
+在 cooldown 秒内排到最后，只在其他服务都失败时使用。所有服务都失败时抛出 LLMUnavailableError。
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Mapping, TypeVar
+
+from ..core.exceptions import LLMUnavailableError
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def _percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(p * (len(ordered) - 1))))
+    return ordered[k]
+
+
+@dataclass
+class ProviderStats:
+    window: int = 200
+    latencies: deque = field(init=False)
+    requests: int = 0
+    errors: int = 0
+    consecutive_failures: int = 0
+    # 在这个时间（time.monotonic）之前视为不健康
+    unhealthy_until: float = 0.0
+
+    def __post_init__(self):
+        self.latencies = deque(maxlen=self.window)
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def percentile(self, p: float) -> float | None:
+        return _percentile(list(self.latencies), p) if self.latencies else None
+
+
+class LLMRouter:
+    """
+    providers: 参与路由的服务名，顺序作为没有延迟数据时的优先级
+    hedge_percentile: 首个请求超过该服务延迟的这个分位数仍未返回时发出对冲请求
+    min_samples: 延迟样本少于这个数量时不对冲
+    """
+
+    def __init__(
+        self,
+        providers: list[str],
+        hedge_percentile: float = 0.95,
+        min_samples: int = 10,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        window: int = 200,
+        max_workers: int = 32,
+    ):
+        self.providers = list(providers)
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._stats = {name: ProviderStats(window) for name in self.providers}
+        self._lock = threading.Lock()
+        # 同步调用在线程中执行，对冲时两个请求同时进行
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="llm-router")
+
+    def record(
+        self,
+        name: str,
+        latency: float | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        with self._lock:
+            stats = self._stats[name]
+            stats.requests += 1
+            if error is None:
+                stats.latencies.append(latency)
+                stats.consecutive_failures = 0
+                stats.unhealthy_until = 0.0
+                return
+            stats.errors += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures < self.failure_threshold:
+                return
+            stats.unhealthy_until = time.monotonic() + self.cooldown
+        logger.warning(
+            f"LLM provider {name} failed {stats.consecutive_failures} times in a row, "
+            f"deprioritized for {self.cooldown}s: {error!r}"
+        )
+
+    def ranked(self) -> list[str]:
+        """健康的服务按延迟中位数从低到高，不健康的排在最后"""
+        now = time.monotonic()
+        with self._lock:
+            order = {name: i for i, name in enumerate(self.providers)}
+
+            def key(name: str):
+                stats = self._stats[name]
+                median = stats.percentile(0.5)
+                # 没有样本的服务先试一次，才能得到它的延迟
+                return (
+                    not stats.healthy(now),
+                    median or 0.0,
+                    order[name],
+                )
+
+            return sorted(self.providers, key=key)
+
+    def hedge_delay(self, name: str) -> float | None:
+        """发出对冲请求前等待的秒数，样本不足时返回 None（不对冲）"""
+        with self._lock:
+            stats = self._stats[name]
+            if len(stats.latencies) < self.min_samples:
+                return None
+            return stats.percentile(self.hedge_percentile)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """每个服务的请求数、错误数、延迟分位数和健康状态，用于日志和监控"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "requests": stats.requests,
+                    "errors": stats.errors,
+                    "p50": stats.percentile(0.5),
+                    "p95": stats.percentile(0.95),
+                    "healthy": stats.healthy(now),
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def _timed(self, name: str, func: Callable[..., T], *args: Any) -> T:
+        start = time.monotonic()
+        try:
+            result = func(*args)
+        except Exception as e:
+            self.record(name, error=e)
+            raise
+        self.record(name, time.monotonic() - start)
+        return result
+
+    def call(self, funcs: Mapping[str, Callable[..., T]], *args: Any) -> T:
+        """按路由顺序调用 funcs[服务名](*args)，返回最先成功的结果"""
+        order = [name for name in self.ranked() if name in funcs]
+        errors: dict[str, BaseException] = {}
+        pending: dict[Future, str] = {}
+        next_index = 0
+        hedged = False
+
+        def launch() -> None:
+            nonlocal next_index
+            name = order[next_index]
+            next_index += 1
+            pending[self._pool.submit(self._timed, name, funcs[name], *args)] = name
+
+        if order:
+            launch()
+        started = time.monotonic()
+        while pending:
+            timeout = None
+            if not hedged and len(pending) == 1 and next_index < len(order):
+                delay = self.hedge_delay(next(iter(pending.values())))
+                if delay is not None:
+                    timeout = max(0.0, started + delay - time.monotonic())
+            done, _ = wait(pending, timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                logger.info(f"Hedging LLM request to {order[next_index]}")
+                launch()
+                continue
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    # 输掉的请求继续在线程中执行完，只用于记录延迟
+                    return future.result()
+                except Exception as e:
+                    errors[name] = e
+                    logger.warning(f"LLM provider {name} failed: {e!r}")
+            if not pending and next_index < len(order):
+                started = time.monotonic()
+                launch()
+        raise LLMUnavailableError(errors)
+
+    async def _atimed(
+        self, name: str, func: Callable[..., Awaitable[T]], *args: Any
+    ) -> T:
+        start = time.monotonic()
+        try:
+            result = await func(*args)
+        except Exception as e:  # 对冲中输掉而被取消的请求（CancelledError）不计入统计
+            self.record(name, error=e)
+            raise
+        self.record(name, time.monotonic() - start)
+        return result
+
+    async def acall(
+        self, funcs: Mapping[str, Callable[..., Awaitable[T]]], *args: Any
+    ) -> T:
+        """call 的异步版本，胜出后取消其余的请求"""
+        order = [name for name in self.ranked() if name in funcs]
+        errors: dict[str, BaseException] = {}
+        pending: dict[asyncio.Task, str] = {}
+        next_index = 0
+        hedged = False
+
+        def launch() -> None:
+            nonlocal next_index
+            name = order[next_index]
+            next_index += 1
+            task = asyncio.ensure_future(self._atimed(name, funcs[name], *args))
+            pending[task] = name
+
+        if order:
+            launch()
+        started = time.monotonic()
+        try:
+            while pending:
+                timeout = None
+                if not hedged and len(pending) == 1 and next_index < len(order):
+                    delay = self.hedge_delay(next(iter(pending.values())))
+                    if delay is not None:
+                        timeout = max(0.0, started + delay - time.monotonic())
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    logger.info(f"Hedging LLM request to {order[next_index]}")
+                    launch()
+                    continue
+                for task in done:
+                    name = pending.pop(task)
+                    try:
+                        return task.result()
+                    except Exception as e:
+                        errors[name] = e
+                        logger.warning(f"LLM provider {name} failed: {e!r}")
+                if not pending and next_index < len(order):
+                    started = time.monotonic()
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise LLMUnavailableError(errors)
@@ -0,0 +1,37 @@
+import re
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+CREATE_TABLE_SQL = Path(__file__).parents[1] / "sql" / "create_table.sql"
+
+
+@pytest.fixture
+def schema_path() -> str:
+    """sql/create_table.sql 的路径，用于需要自己建表的存储（如分片存储）"""
+    return str(CREATE_TABLE_SQL)
+
+
+@pytest.fixture
+def create_db():
+    """
+    按 sql/create_table.sql 建库，返回数据库路径。
+    with_unique_index 为 False 时模拟没有唯一索引的旧库；
+    drop_columns 中的列不建（不能是最后一列），模拟缺少后来新增的列的旧库。
+    """
+
+    def create(
+        path: Path, with_unique_index: bool = True, drop_columns: tuple[str, ...] = ()
+    ) -> str:
+        sql = CREATE_TABLE_SQL.read_text(encoding="utf-8")
+        if not with_unique_index:
+            sql = sql.replace("CREATE UNIQUE INDEX", "-- CREATE UNIQUE INDEX")
+        for column in drop_columns:
+            sql = re.sub(rf"^\s*{column}\s[^\n]*\n", "", sql, flags=re.M)
+        conn = sqlite3.connect(path)
+        conn.executescript(sql)
+        conn.close()
+        return str(path)
+
+    return create
@@ -2,7 +2,6 @@ import json
 
 from work_show import Item
 
-
 # def test_transform_with_jsonpath():
 #     """测试原始数据转化是否正常"""
 #     # 1. 原始数据 (Raw Data)
@@ -51,3 +50,166 @@ from work_show import Item
 #     assert res.job_id == 23566, "job_id映射错误"
 #     assert res.title == "直播运营实习生", "title映射错误"
 #     assert res.extra_info["recruitProjectCode"] == "socialr", "extra_info映射错误"
+
+
+def test_compiled_schema():
+    """编译后的映射表与逐条解析 jsonpath 的结果一致"""
+    from jsonpath_ng import parse
+
+    from unittest import mock
+
+    from work_show.core.schema import compile_path, compile_schema
+
+    data = {
+        "id": 1,
+        "name": "直播运营实习生",
+        "city_info": {"name": "北京", "code": None},
+        "city_list": [{"name": "北京"}, {"name": "上海"}],
+        "where": 3,
+        "flag": False,
+    }
+    for expr in [
+        "$.id",
+        "$.city_info.name",
+        "$.city_info.code",
+        "$.city_info.missing.name",
+        "$.name.length",
+        "$.city_list[1].name",
+        "$.city_list[*].name",
+        "$.flag",
+        "$",
+    ]:
+        match = parse(expr).find(data)
+        expected = match[0].value if match else None
+        assert compile_path(expr)(data) == expected, f"{expr} 提取结果不一致"
+
+    schema = {
+        "job_id": "$.id",
+        "title": "$.name",
+        "company_name": "快手",
+        "city": ["$.city_info.name"],
+        "extra_info": {"second_city": "$.city_list[1].name", "count": 0},
+    }
+    compiled = compile_schema(schema)
+    assert compile_schema(dict(schema)) is compiled, "内容相同的映射表应复用编译结果"
+    with mock.patch("work_show.core.schema.json.dumps", side_effect=AssertionError):
+        assert compile_schema(schema) is compiled, "同一个映射表对象应按身份命中缓存"
+    res = Item.transform_with_jsonpath(compiled, data)
+    assert res.job_id == 1 and res.company_name == "快手", "固定值映射错误"
+    assert res.city == ["北京"], "列表映射错误"
+    assert res.extra_info == {"second_city": "上海", "count": 0}, "嵌套映射错误"
+    # 每次调用都返回新的容器，修改结果不会影响下一条数据
+    res.extra_info["count"] = 1
+    assert Item.transform_with_jsonpath(schema, data).extra_info["count"] == 0
+
+
+def test_transform_batch():
+    """整页转换：映射、码表、单位换算、默认值和模板"""
+    from work_show.core.transform import FieldRule, TransformSpec, transform_batch
+
+    spec = TransformSpec(
+        schema={
+            "job_id": "$.id",
+            "city": "$.city",
+            "category": "$.cat",
+            "publish_date": "$.ts",
+            "job_url": None,
+            "extra_info": {"cities": "$.cities"},
+        },
+        rules={
+            "job_id": FieldRule(cast=str),
+            "city": FieldRule(source="extra_info.cities", pluck="name", as_list=True),
+            "category": FieldRule(lookup={"J1": "技术类"}, lookup_default="未知"),
+            "publish_date": FieldRule(divide=1000),
+            "work_type": FieldRule(default="实习"),
+            "job_url": FieldRule(template="https://example.com/{page}/{job_id}"),
+        },
+        constants={"source_platform": "测试平台"},
+    )
+    records = [
+        {"id": 1, "city": "北京", "cat": "J1", "ts": 1700000000123},
+        {"id": 2, "cities": [{"name": "上海"}, {"name": "深圳"}], "cat": "X"},
+    ]
+    first, second = transform_batch(records, spec, {"page": "social"})
+    assert first.job_id == "1" and first.city == ["北京"], "类型转换或列表包装错误"
+    assert first.category == "技术类" and second.category == "未知", "码表映射错误"
+    assert first.publish_date == 1700000000, "毫秒时间戳应转换为秒"
+    assert second.city == ["上海", "深圳"], "应优先使用 source 指定的城市列表"
+    assert first.job_url == "https://example.com/social/1", "模板生成错误"
+    assert second.work_type == "实习" and second.source_platform == "测试平台"
+    assert first.crawl_date is not None and first.crawl_date == second.crawl_date
+    assert transform_batch(None, spec) == [], "空页面应返回空列表"
+
+    dates = TransformSpec(
+        schema={"job_id": "$.id", "publish_date": "$.date"},
+        rules={"publish_date": FieldRule(parse_date="%Y年%m月%d日")},
+    )
+    ok, bad = transform_batch(
+        [{"id": "1", "date": "2025年01月02日"}, {"id": "2", "date": "昨天"}], dates
+    )
+    assert isinstance(ok.publish_date, int)
+    assert bad.publish_date is None, "日期解析失败时不应把原始字符串留在时间戳字段"
+
+
+def batch_types(batch, name: str) -> list[list[type]]:
+    return [[type(v) for v in x.values()] for x in batch.column(name)]
+
+
+def test_item_batch():
+    """按列保存的 ItemBatch 取出的 Item 与原来一致"""
+    from work_show import ItemBatch
+
+    items = [
+        Item(
+            job_id=str(i),
+            company_name="快手",
+            city=["北京", "上海"],
+            salary_min=None if i % 2 else 1000.5,
+            publish_date=1700000000 + i,
+            description="负责直播平台活动的日常管理、维护和更新" * 5,
+            extra_info={"workLocationsCode": ["Beijing"], "applyNum": i},
+        )
+        for i in range(10)
+    ]
+    items.append(Item(job_id="bad", publish_date="2025-07-07"))
+    for compress_text in (False, True):
+        batch = ItemBatch(items, compress_text=compress_text)
+        assert len(batch) == 11 and list(batch) == items, "ItemBatch 取出的数据不一致"
+        assert batch[-1].publish_date == "2025-07-07", "非数值的时间戳应原样保留"
+        assert batch.column("salary_min")[:2] == [1000.5, None], "列读取错误"
+    # 取出的 Item 可以独立修改
+    first = batch[0]
+    first.extra_info["workLocationsCode"].append("Shanghai")
+    assert batch[0].extra_info["workLocationsCode"] == ["Beijing"]
+
+    # 相等但类型不同的值、不同字段中相同的元组不能被合并
+    mixed = [
+        Item(job_id="1", extra_info={"北京": 1, "applyNum": False}),
+        Item(job_id="2", city=["北京"], extra_info={"applyNum": 0}),
+        Item(job_id="3", extra_info={"applyNum": 1.0, "tags": [True]}),
+        Item(job_id="4", extra_info={"applyNum": 1, "tags": [1]}),
+    ]
+    assert list(ItemBatch(mixed)) == mixed
+    assert batch_types(ItemBatch(mixed), "extra_info") == [
+        [int, bool],
+        [int],
+        [float, list],
+        [int, list],
+    ], "extra_info 的值类型应保持不变"
+    assert ItemBatch(mixed)[1].city == ["北京"], "city 不应与 extra_info 的 key 共享"
+    assert ItemBatch(mixed)[3].extra_info["tags"] == [1]
+
+    # 整数薪资保持为 int，与浮点数混合时退化为 list 并保留各自的类型
+    salaries = [Item(job_id="1"), Item(job_id="2", salary_min=15000)]
+    assert [type(x) for x in ItemBatch(salaries).column("salary_min")] == [
+        type(None),
+        int,
+    ]
+    salaries.append(Item(job_id="3", salary_min=15000.5))
+    assert ItemBatch(salaries).column("salary_min") == [None, 15000, 15000.5]
+    assert type(ItemBatch(salaries)[1].salary_min) is int
+
+    assert not hasattr(items[0], "__dict__"), "Item 应使用 __slots__"
+    a = Item(job_id="1", company_name="".join(["快", "手"])).compact()
+    b = Item(job_id="2", company_name="".join(["快", "手"])).compact()
+    assert a.company_name is b.company_name, "compact 后相同的字符串应共享"
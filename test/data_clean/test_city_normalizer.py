@@ -0,0 +1,23 @@
+from work_show.data_clean.city_normalizer import CityNormalizer
+
+
+def test_city_normalizer():
+    """各种写法统一为标准名称，并带上省份和坐标"""
+    normalizer = CityNormalizer(registry=None)
+    raws = ["北京", "Beijing", "110000", "北京市海淀区", " beijing ", "bj"]
+    assert {x.name for x in normalizer.resolve_batch(raws)} == {"北京"}
+
+    shenzhen = normalizer.resolve("广东省深圳市南山区")
+    assert (
+        shenzhen.name == "深圳" and shenzhen.province == "广东"
+    ), "省市同时出现时取城市"
+    assert shenzhen.coordinates is not None
+    assert normalizer.resolve("深圳总部").name == "深圳", "应能识别带后缀的写法"
+    assert normalizer.resolve("江苏省").level == "province"
+    assert normalizer.resolve("Xi'an").name == "西安"
+    assert normalizer.resolve("Los Angeles").country == "美国"
+    assert normalizer.resolve("未知") is None
+
+    assert normalizer.normalize("北京/上海市") == ["北京", "上海"], "应拆分多个城市"
+    assert normalizer.normalize(["上海", "Shanghai", "火星"]) == ["上海", "火星"]
+    assert normalizer.normalize(None) == []
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from work_show.data_clean.code_dict import CodeDictRegistry
+from work_show.data_clean.mapping_table import CityStandardizer
+
+
+def test_code_dict_registry(tmp_path):
+    """内置字典 -> 接口刷新 -> 磁盘缓存，过期前不重复请求，请求失败时沿用原快照"""
+    builtins = {"demo": {"city": {"Beijing": "北京"}, "category": {"J1": "技术类"}}}
+    calls = []
+
+    def fetcher():
+        calls.append(1)
+        return {"city": {"Beijing": "北京", "Wuxi": "无锡"}}
+
+    registry = CodeDictRegistry(cache_dir=str(tmp_path), ttl=3600, builtins=builtins)
+    assert registry.get("demo").origin == "builtin"
+    assert registry.get("demo") is registry.get("demo"), "快照只应加载一次"
+    with pytest.raises(TypeError):
+        registry.get("demo").table("city")["Wuxi"] = "无锡"
+
+    registry.register_fetcher("demo", fetcher)
+    codes = registry.refresh("demo")
+    assert codes.lookup("city", "Wuxi") == "无锡", "应使用接口返回的字典"
+    assert (
+        codes.lookup("category", "J1") == "技术类"
+    ), "接口没有返回的种类应沿用原来的字典"
+    registry.refresh("demo")
+    assert len(calls) == 1, "快照未过期时不应重复请求接口"
+
+    # 新的注册表从磁盘缓存加载
+    reloaded = CodeDictRegistry(cache_dir=str(tmp_path), ttl=3600, builtins=builtins)
+    assert reloaded.get("demo").origin == "cache"
+    assert reloaded.get("demo").lookup("city", "Wuxi") == "无锡"
+
+    # 过期后刷新失败，继续使用缓存中的字典
+    expired = CodeDictRegistry(cache_dir=str(tmp_path), ttl=0, builtins=builtins)
+    expired.register_fetcher("demo", lambda: 1 / 0)
+    time.sleep(0.01)
+    assert expired.refresh("demo").lookup("city", "Wuxi") == "无锡"
+
+    with pytest.raises(KeyError):
+        registry.get("unknown")
+
+
+def test_city_standardizer_uses_registry(tmp_path):
+    """城市标准化可以识别平台城市字典中的代码"""
+    registry = CodeDictRegistry(
+        cache_dir=None, builtins={"demo": {"city": {"Wuxi": "无锡"}}}
+    )
+    standardizer = CityStandardizer(registry)
+    assert standardizer.convert("wuxi") == "无锡"
+    assert standardizer.convert("beijing") == "北京"
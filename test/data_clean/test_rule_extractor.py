@@ -0,0 +1,44 @@
+from work_show.data_clean.rule_extractor import RuleExtractor
+
+
+def test_rule_extractor():
+    """常见写法由规则直接得出且置信度高，来源给出的值不被覆盖，模糊的写法交给 LLM"""
+    extractor = RuleExtractor()
+    result = extractor.extract(
+        "负责推荐系统的后端开发，使用 Go 和 Kafka 构建高并发服务",
+        "1. 本科及以上学历，硕士优先；2. 3年以上后端开发经验；3. 熟悉 MySQL、Redis、C/C++",
+    )
+    assert result.experience_req == "3-5年"
+    assert result.education_req == "本科", "加分项中的学历不应作为要求"
+    assert result.requirement_keywords == ["MySQL", "Redis", "C", "C++"]
+    assert result.description_keywords == ["推荐系统", "Go", "Kafka", "高并发"]
+    assert result.uncertain_fields(0.75) == [], "规则已经确定时不需要请求 LLM"
+
+    assert extractor.extract_experience("五年以上工作经验") == ("5-10年", 0.95)
+    assert extractor.extract_experience("2026届应届毕业生")[0] == "应届毕业生"
+    assert extractor.extract_education("学历不限，经验不限")[0] == "不限"
+
+    supplied = extractor.extract(
+        "", "本科", experience_req="1年以下", education_req="未知"
+    )
+    assert supplied.experience_req == "1年以下", "来源给出的经验要求应保留"
+    assert supplied.confidence["experience_req"] == 1.0
+    assert "education_req" in supplied.uncertain_fields(
+        0.75
+    ), "没有限定词的学历应交给 LLM"
+
+    vague = extractor.extract("资深工程师，负责团队管理", "")
+    assert set(vague.uncertain_fields(0.75)) == {
+        "experience_req",
+        "description_keywords",
+    }
+
+    # 单字母和 CV 的常见误判
+    assert extractor.extract_keywords("负责C端产品设计，参与R&D流程，CV投递") == []
+    assert extractor.extract_keywords("面向B/C端用户") == []
+    assert extractor.extract_keywords("熟悉C语言和R语言，掌握Go和TS") == [
+        "C",
+        "R",
+        "Go",
+        "TypeScript",
+    ]
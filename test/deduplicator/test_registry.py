@@ -0,0 +1,55 @@
+import threading
+
+from work_show import Item
+from work_show.core.protocols import DedupAction
+from work_show.deduplicator.registry import DeduplicatorRegistry
+
+
+def test_partitions_by_platform():
+    """已见过的 job_id 按平台共享，连续重复计数属于各个数据源"""
+    registry = DeduplicatorRegistry(max_consecutive_duplicates=3)
+    a = registry.new_deduplicator()
+    b = registry.new_deduplicator()
+
+    assert (
+        a.check_status(Item(job_id="1", source_platform="P")).action == DedupAction.SAVE
+    )
+    assert (
+        b.check_status(Item(job_id="1", source_platform="P")).action == DedupAction.SKIP
+    )
+    assert (
+        b.check_status(Item(job_id="1", source_platform="Q")).action == DedupAction.SAVE
+    )
+    assert a.consecutive_dup == 0, "连续重复计数不应该跨数据源共享"
+
+    # 载入的指纹在首次遇到某个平台时并入它的分区，不影响其他数据源
+    a.merge_set({"9"})
+    assert a.is_seen(Item(job_id="9", source_platform="R"))
+    assert (
+        a.check_status(Item(job_id="9", source_platform="R")).action == DedupAction.SKIP
+    )
+    assert (
+        b.check_status(Item(job_id="9", source_platform="S")).action == DedupAction.SAVE
+    )
+
+
+def test_concurrent_check_status():
+    """多个数据源并发写入同一平台的分区时不丢数据，也不重复保存"""
+    registry = DeduplicatorRegistry(max_consecutive_duplicates=10**9)
+    saved = []
+
+    def worker(start):
+        dedup = registry.new_deduplicator()
+        for i in range(start, start + 1000):
+            # 相邻的数据源有一半 job_id 重叠
+            item = Item(job_id=str(i), source_platform="A")
+            if dedup.check_status(item).action == DedupAction.SAVE:
+                saved.append(item.job_id)
+
+    threads = [threading.Thread(target=worker, args=(i * 500,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(registry.partition("A").st) == 4500
+    assert len(saved) == 4500, "同一平台的 job_id 只应保存一次"
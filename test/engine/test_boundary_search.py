@@ -0,0 +1,26 @@
+from work_show.engine.boundary_search import find_boundary_page
+
+
+def _make_probe(boundary: int, calls: list):
+    def has_unseen(n: int) -> bool:
+        calls.append(n)
+        return n <= boundary
+
+    return has_unseen
+
+
+def test_find_boundary_page():
+    """边界查找应该找到最后一个含新数据的页，且请求次数为对数级"""
+    for boundary in [0, 1, 2, 3, 7, 8, 100, 1000]:
+        calls = []
+        res = find_boundary_page(_make_probe(boundary, calls), max_page=1024)
+        assert res == boundary, f"边界查找错误: {boundary} -> {res}"
+        assert len(calls) <= 2 * 11 + 1, f"探测次数过多: {len(calls)}"
+
+
+def test_find_boundary_page_start_and_max():
+    """起始页和最大页的边界情况"""
+    assert find_boundary_page(_make_probe(10, []), start_page=5) == 10
+    assert find_boundary_page(_make_probe(3, []), start_page=5) == 4
+    assert find_boundary_page(_make_probe(5000, []), max_page=100) == 100
+    assert find_boundary_page(_make_probe(90, []), max_page=100) == 90
@@ -0,0 +1,32 @@
+import gzip
+import json
+
+from work_show.engine.bulk_import import BulkJsonlImporter
+from work_show.storage.sql_storage import SqliteStorage
+
+
+def _line(job_id: int) -> str:
+    record = {"id": str(job_id), "channelCode": "测试平台", "name": f"职位{job_id}"}
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def test_bulk_import(tmp_path, create_db):
+    """支持 glob 和 gzip，坏行被跳过，进程池和单进程结果一致，重复导入只更新"""
+    (tmp_path / "a.jsonl").write_text(
+        "".join(_line(i) for i in range(10)) + "not json\n\n", encoding="utf-8"
+    )
+    with gzip.open(tmp_path / "b.jsonl.gz", "wt", encoding="utf-8") as f:
+        f.writelines(_line(i) for i in range(10, 25))
+
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(sqlite_path=db, table_name="jobs", upsert=True)
+
+    pattern = str(tmp_path / "*.jsonl*")
+    stats = BulkJsonlImporter(storage, workers=2, chunk_lines=4, batch_size=7).run(
+        [pattern]
+    )
+    assert (stats.files, stats.lines, stats.inserted, stats.errors) == (2, 26, 25, 1)
+
+    stats = BulkJsonlImporter(storage, workers=1).run([pattern])
+    assert (stats.inserted, stats.updated) == (0, 25)
+    assert len(storage.fetch_all_fingerprints()) == 25
@@ -0,0 +1,79 @@
+from work_show import Item
+from work_show.deduplicator.set_deduplicator import SetDeduplicator
+from work_show.engine.crawler import CrawlerEngine
+
+
+class _Source:
+    """按页产出职位的假数据源，记录读取过的页"""
+
+    def __init__(self, pages: list[list[str]]):
+        self.pages = pages
+        self.fetched: list[int] = []
+        self.extracted: list[str] = []
+
+    def fetch_items(self):
+        for n, ids in enumerate(self.pages, start=1):
+            self.fetched.append(n)
+            for job_id in ids:
+                yield Item(job_id=job_id, source_platform="测试平台", title="后端开发")
+
+    def skip_pages(self, n: int) -> None:
+        pass
+
+    def fetch_all_fingerprints(self, storage, filters=None) -> set:
+        return set()
+
+    def extract_by_llm(self, item: Item) -> Item:
+        self.extracted.append(item.job_id)
+        return item
+
+
+class _Storage:
+    def __init__(self):
+        self.saved: list[str] = []
+
+    def save(self, item: Item) -> None:
+        self.saved.append(item.job_id)
+
+    def save_batch(self, items: list[Item]) -> None:
+        for item in items:
+            self.save(item)
+
+    def fetch_all_fingerprints(self, filters=None) -> set:
+        return set()
+
+    def close(self) -> None:
+        pass
+
+
+def test_prefetch_after_dedup(monkeypatch):
+    """只为判定为新职位的条目批量预取，STOP 在第一页生效时不会再读取第二页"""
+    prefetched: list[list[str]] = []
+    storage = _Storage()
+    source = _Source([["1", "2", "3", "4", "5"], ["6", "7"]])
+    engine = CrawlerEngine(
+        source,
+        storage,
+        {"llm_prefetch": 16, "boundary_search": False},
+        SetDeduplicator({"2", "3", "4", "5"}, max_consecutive_duplicates=3),
+    )
+    engine._prefetch_json_data = lambda jobs: prefetched.append([x[0] for x in jobs])
+    engine.run()
+    assert source.fetched == [1], "STOP 之后不应再读取下一页"
+    assert prefetched == [["1"]], "只应预取判定为 SAVE 的职位"
+    assert storage.saved == ["1"] and source.extracted == ["1"]
+
+    # 没有 STOP 时攒够 llm_prefetch 个新职位预取一次，剩下的在结束时预取并保存
+    prefetched.clear()
+    storage = _Storage()
+    source = _Source([["1", "2", "3"], ["4", "5"]])
+    engine = CrawlerEngine(
+        source,
+        storage,
+        {"llm_prefetch": 2, "boundary_search": False},
+        SetDeduplicator(set(), max_consecutive_duplicates=3),
+    )
+    engine._prefetch_json_data = lambda jobs: prefetched.append([x[0] for x in jobs])
+    engine.run()
+    assert prefetched == [["1", "2"], ["3", "4"], ["5"]]
+    assert storage.saved == ["1", "2", "3", "4", "5"], "保存顺序应与读取顺序一致"
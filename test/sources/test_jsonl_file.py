@@ -0,0 +1,76 @@
+import json
+
+from work_show.sources.jsonl_file import FileJsonlSource
+from work_show.sources.jsonl_index import byte_ranges
+
+
+def _line(job_id: int) -> str:
+    return (
+        json.dumps({"id": str(job_id), "channelCode": "测试平台", "name": "职位"})
+        + "\n"
+    )
+
+
+def _ids(source: FileJsonlSource) -> list[str]:
+    return [item.job_id for item in source.fetch_items()]
+
+
+def test_resume_and_skip(tmp_path):
+    """续读时再次运行只读取追加的行，未写完的最后一行留到下次；跳页通过偏移索引直接定位"""
+    path = tmp_path / "jobs.jsonl"
+    path.write_text("".join(_line(i) for i in range(25)), encoding="utf-8")
+    assert len(_ids(FileJsonlSource(str(path), resume=True, index_stride=4))) == 25
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(_line(25) + '{"id": "26"')
+    assert _ids(FileJsonlSource(str(path), resume=True, index_stride=4)) == ["25"]
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(', "channelCode": "测试平台", "name": "职位"}\n')
+    assert _ids(FileJsonlSource(str(path), resume=True, index_stride=4)) == ["26"]
+
+    source = FileJsonlSource(str(path), resume=False, index_stride=4)
+    items = source.fetch_items()
+    assert next(items).job_id == "0"
+    source.skip_pages(10)
+    assert next(items).job_id == "11"
+    items.close()
+    assert (
+        _ids(FileJsonlSource(str(path), resume=True, index_stride=4)) == []
+    ), "从头读取不应改变续读位置"
+
+
+def test_resume_after_consumer_error(tmp_path):
+    """默认不续读也不写索引文件；续读时调用方处理某一条出错，下次从这一条重新开始"""
+    path = tmp_path / "jobs.jsonl"
+    path.write_text("".join(_line(i) for i in range(10)), encoding="utf-8")
+    assert len(_ids(FileJsonlSource(str(path), index_stride=4))) == 10
+    assert not (tmp_path / "jobs.jsonl.offsets.json").exists()
+
+    def consume():
+        for item in FileJsonlSource(
+            str(path), resume=True, index_stride=4
+        ).fetch_items():
+            if item.job_id == "5":
+                raise RuntimeError("保存失败")
+
+    try:
+        consume()
+    except RuntimeError:
+        pass
+    assert _ids(FileJsonlSource(str(path), resume=True, index_stride=4)) == [
+        str(i) for i in range(5, 10)
+    ], "出错的那一条不应被当作已经处理"
+
+
+def test_byte_ranges(tmp_path):
+    """按行边界切分的字节区间不重不漏"""
+    path = tmp_path / "jobs.jsonl"
+    path.write_text("".join(_line(i) for i in range(100)), encoding="utf-8")
+    ranges = byte_ranges(str(path), 3)
+    assert len(ranges) == 3
+    ids = [
+        job_id
+        for byte_range in ranges
+        for job_id in _ids(FileJsonlSource(str(path), byte_range=byte_range))
+    ]
+    assert ids == [str(i) for i in range(100)]
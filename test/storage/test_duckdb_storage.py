@@ -0,0 +1,52 @@
+import threading
+
+import pytest
+
+from work_show import Item
+
+pytest.importorskip("duckdb")
+
+from work_show.storage.duckdb_storage import DuckDbStorage
+
+
+def test_duckdb_storage(tmp_path):
+    """DuckDB 存储支持 UPSERT、指纹加载和列表列上的聚合"""
+    storage = DuckDbStorage(
+        duckdb_path=str(tmp_path / "jobs.duckdb"), table_name="jobs"
+    )
+    items = [
+        Item(
+            job_id="1", source_platform="A", city=["北京", "上海"], extra_info={"k": 1}
+        ),
+        Item(job_id="2", source_platform="A", city=["北京"]),
+        Item(job_id="1", source_platform="B", city=None),
+    ]
+    res = storage.save_batch(items)
+    assert (res.inserted, res.updated) == (3, 0)
+    res = storage.save(Item(job_id="2", source_platform="A", city=["杭州"]))
+    assert (res.inserted, res.updated) == (0, 1)
+
+    assert storage.fetch_all_fingerprints({"source_platform": "A"}) == {"1", "2"}
+    df = storage.query(
+        "SELECT city, COUNT(*) AS n FROM (SELECT unnest(city) AS city FROM jobs) "
+        "GROUP BY city"
+    )
+    assert dict(zip(df["city"], df["n"])) == {"上海": 1, "北京": 1, "杭州": 1}
+    storage.close()
+
+
+def test_duckdb_close_releases_file(tmp_path):
+    """close 关闭所有线程的连接和底层连接，同一个文件可以立即重新打开"""
+    path = str(tmp_path / "jobs.duckdb")
+    storage = DuckDbStorage(duckdb_path=path, table_name="jobs")
+    storage.save(Item(job_id="1", source_platform="A", city=["北京"]))
+    worker = threading.Thread(target=storage.fetch_all_fingerprints)
+    worker.start()
+    worker.join()
+    storage.close()
+
+    reopened = DuckDbStorage(duckdb_path=path, table_name="jobs")
+    assert reopened.query_rows("SELECT job_id, city FROM jobs") == [("1", ["北京"])]
+    reopened.close()
+    with pytest.raises(RuntimeError):
+        storage.query_rows("SELECT 1")
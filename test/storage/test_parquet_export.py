@@ -0,0 +1,58 @@
+import pytest
+
+from work_show import Item
+from work_show.storage.sql_storage import SqliteStorage
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from work_show.storage.parquet_export import ParquetExporter  # noqa: E402
+
+
+def _item(job_id: str, crawl_date: int, publish_date: int | None) -> Item:
+    return Item(
+        job_id=job_id,
+        source_platform="测试平台",
+        company_name="测试公司",
+        title="后端开发",
+        city=["北京", "上海"],
+        description_keywords=["Python"],
+        publish_date=publish_date,
+        crawl_date=crawl_date,
+    )
+
+
+def test_incremental_export(tmp_path, create_db):
+    """按平台和发布月份分区导出，第二次只导出新爬取的行"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(sqlite_path=db, table_name="jobs", upsert=True)
+    out = tmp_path / "parquet"
+    exporter = ParquetExporter(storage, str(out))
+
+    # 1735689600 = 2025-01-01，1738368000 = 2025-02-01
+    storage.save_batch([_item("1", 100, 1735689600), _item("2", 100, None)])
+    assert exporter.export() == 2
+    assert exporter.export() == 0, "没有新数据时不应重复导出"
+    storage.save_batch([_item("3", 200, 1738368000)])
+    assert exporter.export() == 1
+
+    table = pq.read_table(out)
+    assert sorted(table.column("job_id").to_pylist()) == ["1", "2", "3"]
+    assert table.column("city").to_pylist()[0] == ["北京", "上海"]
+    months = {p.parent.name for p in out.glob("source_platform=*/*/*.parquet")}
+    assert months == {
+        "publish_month=2025-01",
+        "publish_month=2025-02",
+        "publish_month=unknown",
+    }
+    storage.save_batch([_item("4", 200, 1738368000)])
+    assert exporter.export() == 1, "与上次导出同一秒写入的行也要导出"
+    assert exporter.export() == 0
+
+    assert exporter.export(full=True) == 4
+    table = pq.read_table(out)
+    assert sorted(table.column("job_id").to_pylist()) == [
+        "1",
+        "2",
+        "3",
+        "4",
+    ], "全量导出应替换旧文件而不是追加"
@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+
+from work_show import Item
+from work_show.storage.change_log import advance_cursor
+from work_show.storage.sharded_storage import ShardedSqliteStorage
+
+
+def _item(job_id: str, platform: str) -> Item:
+    return Item(job_id=job_id, source_platform=platform, title="后端开发")
+
+
+def test_sharded_storage(tmp_path, schema_path):
+    """每个平台写入独立的文件，读取通过联合视图，损坏的分片导致联合读取失败而不是返回空结果"""
+    storage = ShardedSqliteStorage(
+        shard_dir=str(tmp_path / "shards"),
+        table_name="jobs",
+        schema_path=schema_path,
+        shard_options={"upsert": True},
+    )
+    res = storage.save_batch(
+        [_item("1", "字节官网"), _item("2", "字节官网"), _item("1", "腾讯官网")]
+    )
+    assert (res.inserted, res.updated) == (3, 0)
+    assert sorted(p.name for p in (tmp_path / "shards").glob("*.sqlite")) == [
+        "字节官网.sqlite",
+        "腾讯官网.sqlite",
+    ]
+
+    assert storage.fetch_all_fingerprints({"source_platform": "字节官网"}) == {"1", "2"}
+    assert storage.fetch_all_fingerprints({"source_platform": "阿里官网"}) == set()
+    rows = storage.federated_query(
+        "SELECT source_platform, COUNT(*) FROM jobs GROUP BY 1 ORDER BY 1"
+    )
+    assert rows == [("字节官网", 2), ("腾讯官网", 1)]
+
+    (tmp_path / "shards" / "损坏.sqlite").write_bytes(b"not a database" * 100)
+    with pytest.raises(sqlite3.DatabaseError):
+        storage.fetch_all_fingerprints()
+    with pytest.raises(sqlite3.DatabaseError):
+        storage.federated_query("SELECT job_id FROM jobs")
+    assert storage.fetch_all_fingerprints({"source_platform": "腾讯官网"}) == {"1"}
+    assert sum(len(chunk) for chunk in storage.iter_items()) == 3
+
+
+def test_federated_query_over_attach_limit(tmp_path, schema_path):
+    """分片数超过 ATTACH 上限时按组查询再拼接，只接受逐行的查询，各分片的生成列不同也能联合查询"""
+    storage = ShardedSqliteStorage(
+        shard_dir=str(tmp_path / "shards"),
+        table_name="job_info",
+        schema_path=schema_path,
+        shard_options={"upsert": True, "stats": True},
+    )
+    storage.save_batch([_item("1", f"平台{i:02d}") for i in range(19)])
+    assert len(storage.federated_query("SELECT job_id FROM job_info")) == 19
+    rows = storage.federated_query("SELECT job_count FROM job_stats")
+    assert sum(n for n, in rows) == 19, "job_stats 也应能跨分片联合查询"
+    assert len(storage.fetch_all_fingerprints()) == 1
+    with pytest.raises(ValueError):
+        storage.federated_query("SELECT COUNT(*) FROM job_info")
+
+    # 只有一个分片有 extra_code 生成列，其他分片补 NULL
+    extra = ShardedSqliteStorage(
+        shard_dir=str(tmp_path / "shards"),
+        table_name="job_info",
+        schema_path=schema_path,
+        shard_options={"upsert": True, "extra_info_keys": ["code"]},
+    )
+    extra.save(
+        Item(
+            job_id="2", source_platform="平台18", title="测试", extra_info={"code": "A"}
+        )
+    )
+    rows = storage.federated_query(
+        "SELECT job_id, extra_code FROM job_info WHERE extra_code IS NOT NULL"
+    )
+    assert rows == [("2", "A")], "只在第二组分片中存在的生成列也应能查询"
+    # 不超过上限时整体执行，聚合查询的结果与单库一致
+    paths = storage._shard_paths()
+    storage._shard_paths = lambda: paths[-10:]
+    rows = storage.federated_query("SELECT COUNT(*), COUNT(extra_code) FROM job_info")
+    assert rows == [(11, 1)]
+    assert sum(len(chunk) for chunk in extra.iter_items()) == 20
+
+
+def test_sharded_changes(tmp_path, schema_path):
+    """分片存储的变更日志按 {分片: seq} 的复合游标分批读取，不重复也不遗漏"""
+    storage = ShardedSqliteStorage(
+        shard_dir=str(tmp_path / "shards"),
+        table_name="jobs",
+        schema_path=schema_path,
+        shard_options={"upsert": True, "change_log": True},
+    )
+    storage.save_batch([_item(str(i), "字节官网") for i in range(3)])
+    storage.save_batch([_item(str(i), "腾讯官网") for i in range(2)])
+
+    cursor, seen = 0, []
+    while batch := storage.read_changes(cursor, limit=2):
+        seen.extend((x.shard, x.job_id, x.op) for x in batch)
+        cursor = advance_cursor(cursor, batch)
+    assert sorted(seen) == sorted(
+        [("字节官网", str(i), "insert") for i in range(3)]
+        + [("腾讯官网", str(i), "insert") for i in range(2)]
+    )
+    assert cursor == {"字节官网": 3, "腾讯官网": 2}
+    assert storage.read_changes(cursor) == []
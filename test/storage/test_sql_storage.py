@@ -0,0 +1,282 @@
+import sqlite3
+
+from work_show import Item
+from work_show.storage.sql_storage import SqliteStorage
+
+
+def _item(job_id: str, title: str = "后端开发") -> Item:
+    return Item(job_id=job_id, source_platform="测试平台", title=title, city=["北京"])
+
+
+def test_upsert_counts(tmp_path, create_db):
+    """UPSERT 模式下区分插入和更新的行数"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(sqlite_path=db, table_name="jobs", upsert=True)
+
+    res = storage.save_batch([_item("1"), _item("2")])
+    assert (res.inserted, res.updated) == (2, 0)
+    res = storage.save_batch([_item("2", "算法工程师"), _item("3")])
+    assert (res.inserted, res.updated) == (1, 1)
+
+    conn = sqlite3.connect(db)
+    rows = conn.execute("SELECT job_id, title FROM jobs ORDER BY job_id").fetchall()
+    assert rows == [("1", "后端开发"), ("2", "算法工程师"), ("3", "后端开发")]
+    assert storage.fetch_all_fingerprints({"source_platform": "测试平台"}) == {
+        "1",
+        "2",
+        "3",
+    }
+
+
+def test_migration_removes_duplicates(tmp_path, create_db):
+    """旧数据库中的重复行在建立唯一索引时被清理，保留最后写入的一行"""
+    db = create_db(tmp_path / "jobs.sqlite", with_unique_index=False)
+    SqliteStorage(sqlite_path=db, table_name="jobs").save_batch(
+        [_item("1", "旧标题"), _item("1", "新标题"), _item("2")]
+    )
+    SqliteStorage(sqlite_path=db, table_name="jobs", upsert=True)
+
+    conn = sqlite3.connect(db)
+    rows = conn.execute("SELECT job_id, title FROM jobs ORDER BY job_id").fetchall()
+    assert rows == [("1", "新标题"), ("2", "后端开发")]
+
+
+def test_side_tables(tmp_path, create_db):
+    """副表随主表一起写入，重复写入时替换旧值，并且可以从主表回填"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(
+        sqlite_path=db, table_name="jobs", upsert=True, side_tables=True
+    )
+    a = _item("1")
+    a.requirement_keywords = ["Rust", "Kubernetes"]
+    b = _item("2")
+    b.city = ["杭州", "上海"]
+    storage.save_batch([a, b])
+    assert storage.find_job_keys(cities=["杭州"]) == {("测试平台", "2")}
+    assert storage.find_job_keys(cities=["北京", "杭州"], keywords=["Rust"]) == {
+        ("测试平台", "1")
+    }
+
+    b.city = ["北京"]
+    storage.save(b)
+    assert storage.find_job_keys(cities=["杭州"]) == set()
+    assert storage.find_job_keys(cities=["北京"]) == {
+        ("测试平台", "1"),
+        ("测试平台", "2"),
+    }
+
+    conn = sqlite3.connect(db)
+    conn.execute("DELETE FROM job_city")
+    conn.commit()
+    assert storage.rebuild_side_tables() == 2
+    assert len(storage.find_job_keys(cities=["北京"])) == 2
+
+
+def test_full_text_search(tmp_path, create_db):
+    """全文检索支持中英文混合，多个词之间为 AND"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(
+        sqlite_path=db, table_name="jobs", upsert=True, full_text=True
+    )
+    a = _item("1", "后端开发工程师")
+    a.requirement = "熟悉 Rust 和 Kubernetes"
+    b = _item("2", "算法工程师")
+    b.description = "负责推荐系统的排序算法"
+    storage.save_batch([a, b])
+
+    assert [x.job_id for x in storage.search("rust kubernetes")] == ["1"]
+    assert {x.job_id for x in storage.search("工程师")} == {"1", "2"}
+    assert [x.job_id for x in storage.search("排序 算法")] == ["2"]
+    assert storage.search("Rust 算法") == []
+
+    b.description = "负责广告投放"
+    storage.save(b)
+    assert storage.search("排序") == []
+    assert storage.rebuild_fts() == 2
+    assert [x.job_id for x in storage.search("广告")] == ["2"]
+
+
+def test_extra_info_generated_columns(tmp_path, create_db):
+    """旧表自动补 extra_info 列，热点 key 可以通过生成列查询"""
+    path = tmp_path / "jobs.sqlite"
+    create_db(path, drop_columns=("extra_info",))
+
+    storage = SqliteStorage(
+        sqlite_path=str(path),
+        table_name="jobs",
+        extra_info_keys=["recruitProjectCode"],
+    )
+    item = _item("1")
+    item.extra_info = {"recruitProjectCode": "socialr", "applyNum": 3}
+    storage.save(item)
+
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        "SELECT job_id FROM jobs WHERE extra_recruitProjectCode = 'socialr'"
+    ).fetchall()
+    assert rows == [("1",)]
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT job_id FROM jobs "
+        "WHERE extra_recruitProjectCode = 'socialr'"
+    ).fetchall()
+    assert "idx_jobs_extra_recruitProjectCode" in str(plan), "生成列应该走索引"
+
+
+def test_compressed_texts(tmp_path, create_db):
+    """压缩存储模式下相同文本只存一份，读取时透明解压"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    plain = SqliteStorage(sqlite_path=db, table_name="jobs", upsert=True)
+    old = _item("0")
+    old.description = "历史数据中的明文描述"
+    plain.save(old)
+
+    storage = SqliteStorage(
+        sqlite_path=db,
+        table_name="jobs",
+        upsert=True,
+        full_text=True,
+        compress_text=True,
+    )
+    items = []
+    for i in range(1, 4):
+        item = _item(str(i))
+        item.company_name = "测试公司"
+        item.description = "我们是一家重视技术的公司。" * 20
+        item.requirement = f"熟悉 Rust，第 {i} 个职位"
+        items.append(item)
+    storage.save_batch(items)
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("SELECT COUNT(*) FROM job_text").fetchone()[0] == 4
+    assert (
+        conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE description IS NOT NULL"
+        ).fetchone()[0]
+        == 1
+    ), "只有历史数据保留明文"
+
+    found = storage.search("Rust 第 2 个")
+    assert [x.job_id for x in found] == ["2"]
+    assert found[0].description == items[1].description
+
+    assert storage.compact_texts() == 1
+    assert (
+        conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE description IS NOT NULL"
+        ).fetchone()[0]
+        == 0
+    )
+    assert storage.rebuild_fts() == 4
+    assert storage.search("明文描述")[0].description == old.description
+
+
+def test_job_lifecycle(tmp_path, create_db):
+    """再次看到的职位刷新 last_seen，完整遍历中没有看到的职位被标记为关闭"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(sqlite_path=db, table_name="jobs", upsert=True)
+    storage.save_batch([_item("1"), _item("2"), _item("3")])
+
+    assert storage.touch([("测试平台", "1"), ("测试平台", "2")], seen_at=200) == 2
+    filters = {"source_platform": "测试平台", "work_type": None}
+    assert storage.mark_closed({"1", "2"}, filters, closed_at=300) == 1
+    assert storage.fetch_open_fingerprints({"source_platform": "测试平台"}) == {
+        "1",
+        "2",
+    }
+    open_ids = {x.job_id for chunk in storage.iter_items(open_only=True) for x in chunk}
+    assert open_ids == {"1", "2"}
+
+    # 已关闭的职位重新出现后恢复为在招
+    storage.touch([("测试平台", "3")], seen_at=400)
+    conn = sqlite3.connect(db)
+    rows = conn.execute(
+        "SELECT job_id, last_seen, closed_at FROM jobs ORDER BY job_id"
+    ).fetchall()
+    assert rows[0][1:] == (200, None)
+    assert rows[2][1:] == (400, None)
+    assert conn.execute("SELECT COUNT(*) FROM open_jobs").fetchone()[0] == 3
+
+
+def test_stats_follow_upserts(tmp_path, create_db):
+    """统计表随写入增量更新，结果与从主表重建一致"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(sqlite_path=db, table_name="jobs", upsert=True, stats=True)
+
+    def read_stats():
+        conn = sqlite3.connect(db)
+        rows = conn.execute(
+            "SELECT source_platform, city, category, publish_week, job_count, "
+            "city_count, salary_sum, salary_n FROM job_stats ORDER BY 1, 2, 3, 4"
+        ).fetchall()
+        conn.close()
+        return rows
+
+    first = _item("1")
+    first.city, first.category = ["北京", "上海"], "研发"
+    first.salary_min, first.salary_max = 20000.0, 30000.0
+    first.publish_date = 1735689600  # 2025-01-01，周三
+    storage.save_batch([first, _item("2")])
+    # 职位 1 的城市和分类发生变化，旧的贡献应当被减掉
+    changed = _item("1")
+    changed.city, changed.category = ["上海"], "产品"
+    storage.save_batch([changed, _item("3")])
+
+    incremental = read_stats()
+    assert incremental == [
+        ("测试平台", "上海", "产品", "", 1, 1, 0.0, 0),
+        ("测试平台", "北京", "", "", 2, 2, 0.0, 0),
+    ]
+    storage.rebuild_stats()
+    assert read_stats() == incremental, "增量维护的结果应与重建一致"
+    assert storage.save_batch([first]).updated == 1
+    assert ("测试平台", "北京", "研发", "2024-12-30", 1, 1, 25000.0, 1) in read_stats()
+
+
+def test_change_log(tmp_path, create_db):
+    """插入、内容更新、关闭和重新出现都会记录变更，只刷新爬取时间的重复写入不记录"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(
+        sqlite_path=db, table_name="jobs", upsert=True, change_log=True
+    )
+    storage.save_batch([_item("1"), _item("2")])
+    recrawled = _item("1")
+    recrawled.crawl_date = 12345
+    storage.save_batch([recrawled, _item("2", "算法工程师")])
+    storage.mark_closed({"2"}, {"source_platform": "测试平台"})
+    storage.touch([("测试平台", "1")])
+    storage.save(_item("1"))
+
+    changes = storage.read_changes()
+    assert [(x.op, x.job_id) for x in changes] == [
+        ("insert", "1"),
+        ("insert", "2"),
+        ("update", "2"),
+        ("close", "1"),
+        ("reopen", "1"),
+    ]
+    assert [x.seq for x in storage.read_changes(since=changes[1].seq, limit=2)] == [
+        changes[2].seq,
+        changes[3].seq,
+    ]
+
+    # 把明文迁移到 job_text 只改变存储方式，不应产生 update
+    described = _item("1")
+    described.description = "负责推荐系统的后端开发"
+    storage.save(described)
+    last = storage.read_changes()[-1].seq
+    assert storage.compact_texts() == 1
+    assert storage.read_changes(since=last) == [], "迁移文本不应记录变更"
+    storage.save(_item("2", "数据工程师"))
+    assert [x.op for x in storage.read_changes(since=last)] == ["update"]
+
+
+def test_resave_with_default_options(tmp_path, create_db):
+    """建表脚本带有唯一索引时，默认配置下重复写入同一职位不应违反唯一约束"""
+    db = create_db(tmp_path / "jobs.sqlite")
+    storage = SqliteStorage(sqlite_path=db, table_name="jobs")
+    storage.save(_item("1", "旧标题"))
+    storage.save(_item("1", "新标题"))
+
+    conn = sqlite3.connect(db)
+    rows = conn.execute("SELECT job_id, title FROM jobs").fetchall()
+    assert rows == [("1", "新标题")]
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 
 from work_show.utils import call_llm
+from work_show.utils.llm_router import LLMRouter
 
 
 def test_get_json_res():
@@ -15,3 +16,196 @@ def test_get_json_res():
     )
     assert isinstance(a.keywords, list), f"{call_llm.__name__} 模型返回有问题"
     assert isinstance(a.description, str), f"{call_llm.__name__} 模型返回有问题"
+
+
+def test_prefetch_json_data(monkeypatch, tmp_path):
+    """批量请求中被漏掉或写错的职位单独重试，之后逐个提取时直接命中缓存"""
+    from work_show.utils.llm_cache import LLMCache
+
+    monkeypatch.setattr(call_llm, "llm_cache", LLMCache(str(tmp_path / "llm.sqlite")))
+    requests = []
+
+    def fake_model(cls, system_prompt, user_prompt):
+        requests.append(cls)
+        if cls is call_llm.BatchResult:
+            entries = [
+                {"job_id": "j0", "experience_req": "3-5年"},
+                {"job_id": "j1", "experience_req": "三年以上"},  # 不在取值范围内
+            ]  # j2 被漏掉
+            return cls.model_validate(
+                {
+                    "results": [
+                        {
+                            **x,
+                            "education_req": "本科",
+                            "description_keywords": ["团队管理"],
+                            "requirement_keywords": [],
+                        }
+                        for x in entries
+                    ]
+                }
+            )
+        return cls(
+            experience_req="5-10年",
+            education_req="硕士",
+            description_keywords=["架构设计"],
+            requirement_keywords=[],
+        )
+
+    monkeypatch.setitem(call_llm._model2func, call_llm.model, fake_model)
+    monkeypatch.setattr(call_llm, "router", LLMRouter([call_llm.model]))
+    jobs = [(f"j{i}", f"资深工程师，负责团队{i}", "", None, None) for i in range(3)]
+    assert call_llm.prefetch_json_data(jobs) == 3
+    assert requests == [
+        call_llm.BatchResult,
+        call_llm.DescriptionKeyboard,
+        call_llm.DescriptionKeyboard,
+    ], "应只对漏掉和写错的职位单独重试"
+
+    requests.clear()
+    assert call_llm.get_json_data("资深工程师，负责团队0", "")[0] == "3-5年"
+    assert call_llm.get_json_data("资深工程师，负责团队2", "")[0] == "5-10年"
+    assert requests == [], "预取之后不应再请求 LLM"
+
+
+def test_invalid_cache_entry(monkeypatch, tmp_path):
+    """缓存中不符合响应结构的条目按未命中处理，重新请求 LLM 并覆盖"""
+    from work_show.utils.llm_cache import LLMCache, cache_key
+
+    monkeypatch.setattr(call_llm, "llm_cache", LLMCache(str(tmp_path / "llm.sqlite")))
+    description = "资深工程师，负责团队管理"
+    key = cache_key(call_llm.PROMPT_VERSION, description, "")
+    call_llm.llm_cache.put(key, {"experience_req": "5-10年"})
+
+    def fake_model(cls, system_prompt, user_prompt):
+        return cls(
+            experience_req="5-10年",
+            education_req="硕士",
+            description_keywords=["团队管理"],
+            requirement_keywords=[],
+        )
+
+    monkeypatch.setitem(call_llm._model2func, call_llm.model, fake_model)
+    monkeypatch.setattr(call_llm, "router", LLMRouter([call_llm.model]))
+    assert call_llm.get_json_data(description, "")[0] == "5-10年"
+    assert call_llm.llm_cache.get(key)["education_req"] == "硕士", "应写回有效的响应"
+
+
+def test_async_client_layer(monkeypatch, tmp_path):
+    """每个模型服务使用自己的客户端，429 和 5xx 按退避重试，其他错误直接抛出"""
+    import asyncio
+    import time
+
+    import httpx
+    import openai
+    import pytest
+
+    from dataclasses import replace
+
+    from work_show.utils.llm_cache import LLMCache
+
+    monkeypatch.setattr(call_llm, "_clients", {})
+    for name in ("gemini", "deepseek"):
+        provider = replace(call_llm.PROVIDERS[name], api_key="test")
+        monkeypatch.setitem(call_llm.PROVIDERS, name, provider)
+    assert call_llm._get_client("deepseek") is call_llm._get_client("deepseek")
+    assert str(call_llm._get_client("gemini").base_url) != str(
+        call_llm._get_client("deepseek").base_url
+    ), "不同的模型服务不应共用客户端"
+
+    monkeypatch.setattr(call_llm, "_backoff_delay", lambda attempt, error=None: 0)
+    monkeypatch.setattr(call_llm, "router", LLMRouter(["deepseek"]))
+    request = httpx.Request("POST", "https://example.com")
+
+    def status_error(code):
+        return openai.APIStatusError(
+            "error", response=httpx.Response(code, request=request), body=None
+        )
+
+    async def run(errors):
+        attempts = []
+
+        async def send():
+            attempts.append(1)
+            if len(attempts) <= len(errors):
+                raise errors[len(attempts) - 1]
+            return "ok"
+
+        try:
+            return await call_llm._with_retries("deepseek", send), len(attempts)
+        except openai.APIStatusError:
+            return None, len(attempts)
+
+    assert asyncio.run(run([status_error(429), status_error(503)])) == ("ok", 3)
+    assert asyncio.run(run([status_error(400)])) == (None, 1), "4xx 不应重试"
+
+    # 同步路径同样由 _with_retries_sync 重试，单次尝试超过 total_timeout 时放弃并重试
+    assert call_llm._get_client("deepseek").max_retries == 0, "SDK 不应再自行重试"
+    monkeypatch.setattr(call_llm, "total_timeout", 0.05)
+    attempts = []
+
+    def slow_send():
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(0.5)
+        return "ok"
+
+    assert call_llm._with_retries_sync("deepseek", slow_send) == "ok"
+    assert len(attempts) == 2
+
+    monkeypatch.setattr(call_llm, "llm_cache", LLMCache(str(tmp_path / "llm.sqlite")))
+
+    async def fake_model(cls, system_prompt, user_prompt):
+        await asyncio.sleep(0.01)
+        return cls(
+            experience_req="5-10年",
+            education_req="硕士",
+            description_keywords=["架构设计"],
+            requirement_keywords=[],
+        )
+
+    monkeypatch.setitem(call_llm._amodel2func, call_llm.model, fake_model)
+    monkeypatch.setattr(call_llm, "router", LLMRouter([call_llm.model]))
+
+    async def extract_many():
+        return await asyncio.gather(
+            *(
+                call_llm.aget_json_data(f"资深工程师，负责团队{i}", "")
+                for i in range(50)
+            )
+        )
+
+    results = asyncio.run(extract_many())
+    assert all(x[0] == "5-10年" for x in results)
+    assert call_llm.llm_cache.stats().entries == 50
+
+
+def test_failover_without_backoff(monkeypatch):
+    """路由中有多个服务时，主服务出错后立即换下一个服务，不等待重试退避"""
+    import time
+
+    import httpx
+    import openai
+
+    monkeypatch.setattr(call_llm, "_backoff_delay", lambda attempt, error=None: 10)
+    monkeypatch.setattr(call_llm, "router", LLMRouter(["primary", "secondary"]))
+    request = httpx.Request("POST", "https://example.com")
+    attempts = []
+
+    def primary(x):
+        def send():
+            attempts.append("primary")
+            raise openai.APIStatusError(
+                "error", response=httpx.Response(503, request=request), body=None
+            )
+
+        return call_llm._with_retries_sync("primary", send)
+
+    def secondary(x):
+        attempts.append("secondary")
+        return call_llm._with_retries_sync("secondary", lambda: x)
+
+    start = time.monotonic()
+    assert call_llm.router.call({"primary": primary, "secondary": secondary}, 1) == 1
+    assert time.monotonic() - start < 5, "不应在主服务上等待重试退避"
+    assert attempts == ["primary", "secondary"]
@@ -0,0 +1,32 @@
+from work_show.utils.llm_cache import LLMCache, cache_key
+
+
+def test_llm_cache(tmp_path):
+    """只有空白不同的文本命中同一条缓存，提示词版本不同则不命中，超过大小上限时淘汰最久未访问的条目"""
+    path = str(tmp_path / "llm.sqlite")
+    cache = LLMCache(path, max_bytes=1000)
+    key = cache_key("1", "负责  推荐系统\n", "本科")
+    assert key == cache_key("1", "负责 推荐系统", "本科 ")
+    assert key != cache_key("2", "负责 推荐系统", "本科")
+    assert cache.get(key) is None
+
+    cache.put(key, {"education_req": "本科", "requirement_keywords": ["Go"]})
+    assert cache.get(key) == {"education_req": "本科", "requirement_keywords": ["Go"]}
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    for i in range(20):
+        cache.put(f"k{i}", "x" * 100)
+    stats = cache.stats()
+    assert stats.size_bytes <= 1000, "总大小不应超过上限"
+    assert stats.evictions > 0
+    assert cache.get("k19") is not None, "最近写入的条目应保留"
+    cache._conn.execute("UPDATE llm_cache SET value = '{' WHERE key = 'k19'")
+    assert cache.get("k19") is None, "损坏的条目应按未命中处理"
+    assert not cache.contains("k19"), "损坏的条目应被删除"
+    stats = cache.stats()
+    cache.close()
+
+    reopened = LLMCache(path, max_bytes=1000)
+    assert reopened.stats().entries == stats.entries, "重新打开后应读取到已有的缓存"
+    assert LLMCache(None).get(key) is None
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+
+from work_show.core.exceptions import LLMUnavailableError
+from work_show.utils.llm_router import LLMRouter
+
+
+def test_llm_router_failover_and_hedging():
+    """出错时换下一个服务，慢于延迟分位数时向第二个服务发出对冲请求，全部失败时抛出异常"""
+    router = LLMRouter(["a", "b"], min_samples=5, failure_threshold=2, cooldown=60)
+    calls = []
+
+    def fast(name, delay):
+        def call(x):
+            calls.append(name)
+            time.sleep(delay)
+            return f"{name}:{x}"
+
+        return call
+
+    def broken(x):
+        calls.append("a")
+        raise ConnectionError("down")
+
+    assert router.call({"a": broken, "b": fast("b", 0)}, 1) == "b:1", "出错时应换服务"
+    assert router.call({"a": broken, "b": fast("b", 0)}, 2) == "b:2"
+    assert router.ranked() == ["b", "a"], "连续失败的服务应排到最后"
+    assert not router.snapshot()["a"]["healthy"]
+
+    # b 的延迟样本约为 10ms，这次 b 变慢时 a 的对冲请求先返回
+    for i in range(5):
+        router.call({"a": broken, "b": fast("b", 0.01)}, i)
+    calls.clear()
+    start = time.monotonic()
+    assert router.call({"a": fast("a", 0), "b": fast("b", 0.5)}, 3) == "a:3"
+    assert time.monotonic() - start < 0.3, "对冲请求应在 b 返回之前胜出"
+    assert calls == ["b", "a"]
+
+    with pytest.raises(LLMUnavailableError) as exc_info:
+        router.call({"a": broken, "b": broken}, 4)
+    assert set(exc_info.value.errors) == {"a", "b"}
+
+
+def test_llm_router_async_hedge_cancels_loser():
+    """异步路由中对冲胜出后取消仍在进行的请求，被取消的请求不计入错误"""
+    router = LLMRouter(["a", "b"], min_samples=3)
+
+    def after(name, delay):
+        async def call(x):
+            await asyncio.sleep(delay)
+            return name
+
+        return call
+
+    for _ in range(3):
+        router.record("a", 0.01)
+        router.record("b", 0.02)
+
+    async def main():
+        return await router.acall({"a": after("a", 5), "b": after("b", 0)}, 0)
+
+    start = time.monotonic()
+    assert asyncio.run(main()) == "b"
+    assert time.monotonic() - start < 1, "胜出后不应等待被取消的请求"
+    assert router.snapshot()["a"]["errors"] == 0